@@ -1,23 +1,32 @@
 # ==============================================================================
-# API ROUTER - Combines all route files into one router
+# API ROUTER - Connects all route files to the app
 # ==============================================================================
-# This file imports all individual route files and combines them
+# This file imports all individual route files and adds their routes to the app
 # Think of this as the "index" that connects all your API endpoints
 # ==============================================================================
 
-from fastapi import APIRouter
+from typing import List, Tuple
+
+from fastapi import APIRouter, FastAPI
 from app.api.routes import standings  # Import the standings routes file
 from app.api.routes import events    # Import the events routes file
+from app.api.routes import search    # Import the search routes file
 
 # STUB: Import more route files here as you create them
 # from app.api.routes import drivers, teams, races, etc.
 
 
 # ==============================================================================
-# CREATE MAIN API ROUTER
+# ROUTE MODULES - (router, URL prefix, docs tags)
 # ==============================================================================
 
-api_router = APIRouter()
+ROUTE_MODULES: List[Tuple[APIRouter, str, List[str]]] = [
+    (standings.router, "/standings", ["standings"]),  # /api/v1/standings/
+    (events.router, "/events", ["events"]),           # /api/v1/events/
+    (search.router, "/search", ["search"]),           # /api/v1/search
+    # STUB: Add more routers here
+    # (drivers.router, "/drivers", ["drivers"]),
+]
 
 
 # ==============================================================================
@@ -27,46 +36,34 @@ api_router = APIRouter()
 # The prefix is added to all routes in that module
 # Tags help organize the API documentation
 
-# Add standings routes: /api/v1/standings/
-api_router.include_router(
-    standings.router,           # The router from standings.py
-    prefix="/standings",        # All routes will start with /standings
-    tags=["standings"]          # Groups these routes in API docs
-)
-
-# Add events routes: /api/v1/events/
-api_router.include_router(
-    events.router,              # The router from events.py
-    prefix="/events",           # All routes will start with /events
-    tags=["events"]             # Groups these routes in API docs
-)
-
-# STUB: Add more routers here
-# Example: Teams routes
-# api_router.include_router(
-#     teams.router,
-#     prefix="/teams",
-#     tags=["teams"]
-# )
+def include_api_routes(app: FastAPI, prefix: str) -> None:
+    """
+    Add every route module's endpoints to `app` under `prefix`
 
-# Example: Drivers routes
-# api_router.include_router(
-#     drivers.router,
-#     prefix="/drivers",
-#     tags=["drivers"]
-# )
+    Routes go straight onto the app. (Including them into an intermediate
+    APIRouter first would build every route twice - include_router copies
+    each route it is given - which is wasted startup time.)
+    """
+    for router, module_prefix, tags in ROUTE_MODULES:
+        app.include_router(router, prefix=prefix + module_prefix, tags=tags)
+
+
+def __getattr__(name: str):
+    """`from app.api.routes import api_router` still works - built on first use"""
+    if name != "api_router":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    api_router = APIRouter()
+    for router, module_prefix, tags in ROUTE_MODULES:
+        api_router.include_router(router, prefix=module_prefix, tags=tags)
+    globals()["api_router"] = api_router
+    return api_router
 
-# Example: Races routes
-# api_router.include_router(
-#     races.router,
-#     prefix="/races",
-#     tags=["races"]
-# )
 
+# STUB: Routes that need extra dependencies can get their own include
 # Example: Admin routes (with authentication)
-# api_router.include_router(
+# app.include_router(
 #     admin.router,
-#     prefix="/admin",
+#     prefix=prefix + "/admin",
 #     tags=["admin"],
 #     dependencies=[Depends(verify_admin)]  # Only admins can access
 # )
@@ -82,10 +79,10 @@ api_router.include_router(
 # 2. Each file creates its own router with related endpoints
 #    Example: standings.router has /standings/ routes
 # 
-# 3. This file (routes/__init__.py) combines them all
-#    api_router includes all the individual routers
+# 3. This file (routes/__init__.py) lists them all in ROUTE_MODULES
 # 
-# 4. main.py includes api_router with /api/v1 prefix
+# 4. main.py calls include_api_routes(app, "/api/v1"), which adds each
+#    file's routes to the app
 #    Final URLs: /api/v1/standings/, /api/v1/teams/, etc.
 # 
 # URL Structure Example:
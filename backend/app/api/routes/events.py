@@ -5,8 +5,20 @@
 # Think of routes as the "pages" of your API
 # ==============================================================================
 
-from fastapi import APIRouter, HTTPException, Query  # FastAPI tools
-from typing import List                             # For type hints
+import asyncio
+import json
+import logging
+from fastapi import (                               # FastAPI tools
+    APIRouter, Body, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status,
+)
+from typing import List, Optional                   # For type hints
+from app.core.config import settings
+from app.core.database import DatabaseBusyError, get_database  # Pooled async database
+from app.core.micro_batch import MicroBatcher        # Groups live results into batches
+from app.core.responses import json_response         # Skips jsonable_encoder
+from app.models.events import (                     # Indexed in-memory events
+    EVENT_FIELDS, decode_cursor, encode_cursor, get_event_store,
+)
 
 # ==============================================================================
 # CREATE ROUTER - Like a mini-app for this specific feature
@@ -15,6 +27,7 @@ from typing import List                             # For type hints
 # It groups related routes together
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # ==============================================================================
 # ROUTE 1: GET ALL EVENTS
@@ -23,38 +36,132 @@ router = APIRouter()
 # HTTP Method: GET
 # Returns: List of all race events
 
+# ISO date, e.g. 2024-09-29
+ISO_DATE = r"^\d{4}-\d{2}-\d{2}$"
+
+
 @router.get("/")
-async def get_events():
+async def get_events(
+    limit: int = Query(
+        settings.EVENTS_PAGE_SIZE, ge=1, le=settings.EVENTS_PAGE_SIZE_MAX,
+        description="Events per page",
+    ),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    date_from: Optional[str] = Query(None, pattern=ISO_DATE, description="Earliest date (inclusive)"),
+    date_to: Optional[str] = Query(None, pattern=ISO_DATE, description="Latest date (inclusive)"),
+    series: Optional[str] = Query(None, description="Only events from this series"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields, e.g. id,date"),
+):
     """
-    Get all race events
+    Get race events, newest first, one page at a time
     
-    Returns a list of all events created in the system.
+    Pass the returned next_cursor back as ?cursor= to get the next page;
+    next_cursor is null on the last page.
+
+    Example:
+        GET /api/v1/events/?limit=2&series=Rallycross&fields=id,date
 
     Example response:
     {
         "events": [
-            {"id": 1, "name": "Grand Prix 1", "date": "2024-07-01"},
-            {"id": 2, "name": "Grand Prix 2", "date": "2024-07-15"}
-        ]
+            {"id": 1, "date": "2024-11-24"},
+            {"id": 2, "date": "2024-11-03"}
+        ],
+        "next_cursor": "MjAyNC0xMS0wM3wy"
     }
     """
 
-    events_data = [
-        {"id": 1, "name": "Rallycross #73, points event #6", "date": "2024-11-24"},
-        {"id": 2, "name": "Rallycross #72, points event #5", "date": "2024-11-03"},
-        {"id": 3, "name": "Rallycross #71, points event #4", "date": "2024-09-29"},
-        {"id": 4, "name": "Rallycross #70, points event #3", "date": "2024-06-30"},
-        {"id": 5, "name": "Rallycross #69, points event #2", "date": "2024-06-09"},
-        {"id": 6, "name": "Rallycross #68, points event #1", "date": "2024-02-25"},
+    # ------------------------------------------------------------------
+    # VALIDATE cursor and fields
+    # ------------------------------------------------------------------
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    wanted = None
+    if fields:
+        wanted = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = set(wanted) - set(EVENT_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
 
-    ]
+    # ------------------------------------------------------------------
+    # KEYSET PAGE - Binary search into the sorted index: O(log n + limit)
+    # ------------------------------------------------------------------
+    events, next_key = get_event_store().page(
+        limit, after=after, date_from=date_from, date_to=date_to, series=series,
+    )
+    if wanted:
+        events = [{f: e[f] for f in wanted} for e in events]
 
-    # Placeholder for actual data retrieval logic
-    return { "events": events_data }
+    return json_response({
+        "events": events,
+        "next_cursor": encode_cursor(next_key) if next_key else None,
+    })
 
 
 # ==============================================================================
-# ROUTE 2: GET EVENT BY DATE
+# ROUTE 2: GET SEVERAL EVENTS BY DATE
+# ==============================================================================
+# This creates a route at: /api/v1/events/batch
+# HTTP Method: POST
+# Body: {"dates": ["2024-09-29", ...]} (at most BATCH_MAX_KEYS dates)
+# Returns: Every event found, plus the dates that matched no event
+#
+# NOTE: This must be declared BEFORE /{event_date}, next to it "batch"
+# reads like a date.
+# ==============================================================================
+
+@router.post("/batch")
+async def get_events_batch(
+    dates: List[str] = Body(..., embed=True, description="ISO dates, e.g. 2024-09-29"),
+):
+    """
+    Get the details of several events in one request
+
+    Replaces one GET /events/{event_date} per round. Events come back in
+    the order asked for (duplicates once); dates without an event are
+    listed in "missing" instead of failing the batch.
+
+    Example:
+        POST /api/v1/events/batch
+        {"dates": ["2024-07-01", "1999-01-01"]}
+
+    Example response:
+    {
+        "events": [
+            {"id": 1, "name": "Grand Prix 1", "date": "2024-07-01", "location": "Location 1"}
+        ],
+        "missing": ["1999-01-01"]
+    }
+    """
+    dates = list(dict.fromkeys(dates))         # Drop repeats, keep the order
+    if not dates:
+        raise HTTPException(status_code=400, detail="Pass at least one date")
+    if len(dates) > settings.BATCH_MAX_KEYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BATCH_MAX_KEYS} dates per request",
+        )
+
+    # ------------------------------------------------------------------
+    # INDEXED LOOKUP - one O(1) hash lookup per date, one encoded body
+    # ------------------------------------------------------------------
+    found = get_event_store().get_many_by_date(dates)
+    return json_response({
+        "events": [event for event in found if event],
+        "missing": [d for d, event in zip(dates, found) if not event],
+    })
+
+
+# ==============================================================================
+# ROUTE 3: GET EVENT BY DATE
 # ==============================================================================
 # This creates a route at: /api/v1/events/{event_date}
 # HTTP Method: GET
@@ -74,30 +181,186 @@ async def get_event_by_date(event_date: str):
     """
     
     # ------------------------------------------------------------------
-    # MOCK DATA - Replace this with database query
+    # INDEXED LOOKUP - O(1) hash lookup by ISO date
     # ------------------------------------------------------------------
-    # Currently returning fake data for demonstration
-    # STUB: Replace with actual database query
-    # Example with database:
-    # from app.models import Event
-    # event = await Event.get_by_date(event_date)
-    # if not event:
-    #     raise HTTPException(status_code=404, detail="Event not found")
-    # return {"event": event}
+    event = get_event_store().get_by_date(event_date)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
     
-    # Use the same events_data as in get_events
-    events_data = [
-        {"id": 1, "name": "Rallycross #73, points event #6", "date": "2024-11-24"},
-        {"id": 2, "name": "Rallycross #72, points event #5", "date": "2024-11-03"},
-        {"id": 3, "name": "Rallycross #71, points event #4", "date": "2024-09-29"},
-        {"id": 4, "name": "Rallycross #70, points event #3", "date": "2024-06-30"},
-        {"id": 5, "name": "Rallycross #69, points event #2", "date": "2024-06-09"},
-        {"id": 6, "name": "Rallycross #68, points event #1", "date": "2024-02-25"},
-    ]
-
-    # Find event by date
-    event = next((e for e in events_data if e["date"] == event_date), None)
+    return json_response({"event": event})
+
+
+# ==============================================================================
+# ROUTE 4: UPLOAD EVENT RESULTS
+# ==============================================================================
+# This creates a route at: /api/v1/events/{event_date}/results
+# HTTP Method: POST
+# Body: CSV (with a header line) or NDJSON (one JSON object per line)
+# Returns: How many rows were stored
+# ==============================================================================
+
+# Content-Type → parser name, used when ?format= isn't given
+CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+@router.post("/{event_date}/results")
+async def upload_event_results(
+    event_date: str,
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="csv or ndjson"),
+):
+    """
+    Upload (or replace) all results for one event
+    
+    The body is read in chunks as it arrives, validated in batches and
+    written in a single transaction - a bad row anywhere means nothing is
+    saved. Standings are updated once, after the upload is committed.
+    
+    Example (CSV):
+        curl -X POST --data-binary @results.csv \
+             -H "Content-Type: text/csv" \
+             http://localhost:8000/api/v1/events/2024-11-24/results
+        
+        driver_id,driver,class,position,points
+        12,Jane Doe,SS,1,25
+        
+    Example response:
+        {"event_id": 1, "rows": 312, "drivers": 298}
+    """
+    event = get_event_store().get_by_date(event_date)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    return {"event": event}
\ No newline at end of file
+    if format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        format = CONTENT_TYPE_FORMATS.get(content_type)
+        if format is None:
+            raise HTTPException(
+                status_code=415,
+                detail="Send text/csv or application/x-ndjson, or pass ?format=",
+            )
+    
+    # Imported on first upload: the row model is only needed here, so
+    # reading events doesn't pay for building it at startup
+    from app.models.results import PARSERS, IngestError, ingest_results
+
+    rows = PARSERS[format](request.stream())
+    try:
+        summary = await ingest_results(
+            get_database(),
+            event["id"],
+            rows,
+            batch_size=settings.INGEST_BATCH_SIZE,
+            max_rows=settings.INGEST_MAX_ROWS,
+        )
+    except IngestError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    
+    return json_response(summary)
+
+
+# ==============================================================================
+# ROUTE 5: LIVE TIMING (WebSocket)
+# ==============================================================================
+# This creates a WebSocket at: /api/v1/events/{event_date}/live
+# Messages in:  one result object, or a list of them (a heat), as JSON text
+# Messages out: {"type": "applied", ...} per stored batch,
+#               {"type": "error", ...} for a message that was rejected
+# ==============================================================================
+
+@router.websocket("/{event_date}/live")
+async def live_event_results(websocket: WebSocket, event_date: str):
+    """
+    Stream results into an event while it is running
+
+    Each result adds or updates one driver/class finish (same keys as an
+    upload row); everything else the event has is kept. Results are
+    grouped for up to LIVE_BATCH_INTERVAL seconds (or LIVE_BATCH_MAX_ROWS
+    results) and each group is stored and applied to the standings in one
+    step - readers never see half a group.
+
+    If the server falls LIVE_MAX_PENDING results behind it stops reading
+    until it catches up, which slows the sender down (TCP backpressure).
+
+    Example (browser / Node):
+        const ws = new WebSocket("ws://localhost:8000/api/v1/events/2024-11-24/live")
+        ws.send(JSON.stringify([
+            {"driver_id": 12, "driver": "Jane Doe", "class": "SS", "position": 1, "points": 25}
+        ]))
+        // ← {"type": "applied", "received": 1, "event_id": 1, "rows": 1, "drivers": 1}
+    """
+    event = get_event_store().get_by_date(event_date)
+    if not event:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Event not found")
+        return
+    await websocket.accept()
+
+    # Imported on first use, like the upload route
+    from app.models.results import IngestError, ingest_live_results, validate_batch
+
+    batcher = MicroBatcher(
+        max_items=settings.LIVE_BATCH_MAX_ROWS,
+        interval=settings.LIVE_BATCH_INTERVAL,
+        max_pending=settings.LIVE_MAX_PENDING,
+    )
+    connected = True
+
+    async def reply(message: dict) -> None:
+        # Batches still pending at disconnect are stored without a reply
+        nonlocal connected
+        if not connected:
+            return
+        try:
+            await websocket.send_json(message)
+        except (WebSocketDisconnect, RuntimeError):
+            connected = False
+
+    async def apply_batches() -> None:
+        # ------------------------------------------------------------------
+        # ONE transaction + ONE standings update per micro-batch
+        # ------------------------------------------------------------------
+        async for batch in batcher.batches():
+            try:
+                summary = await ingest_live_results(get_database(), event["id"], batch)
+            except DatabaseBusyError:
+                logger.warning("Live batch for event %s: database busy", event["id"])
+                await reply({"type": "error", "detail": f"database busy - resend {len(batch)} results"})
+                continue
+            except Exception:
+                logger.exception("Live batch for event %s failed", event["id"])
+                await reply({"type": "error", "detail": f"{len(batch)} results not stored"})
+                continue
+            await reply({"type": "applied", "received": len(batch), **summary})
+
+    applier = asyncio.create_task(apply_batches())
+    message_no = 0
+    try:
+        async for text in websocket.iter_text():
+            message_no += 1
+            try:
+                payload = json.loads(text)
+            except json.JSONDecodeError as exc:
+                await reply({"type": "error", "message": message_no, "detail": f"invalid JSON ({exc.msg})"})
+                continue
+            rows = payload if isinstance(payload, list) else [payload]
+            if not all(isinstance(row, dict) for row in rows):
+                await reply({"type": "error", "message": message_no, "detail": "expected JSON objects"})
+                continue
+            try:
+                validated = validate_batch([(message_no, row) for row in rows])
+            except IngestError as exc:
+                await reply({"type": "error", "message": message_no, "detail": exc.reason})
+                continue
+            for row in validated:
+                await batcher.put(row)          # Waits here when too far behind
+    except WebSocketDisconnect:
+        pass
+    finally:
+        connected = False
+        batcher.close()                         # Store what was already received
+        await applier
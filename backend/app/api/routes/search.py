@@ -0,0 +1,65 @@
+# ==============================================================================
+# SEARCH ROUTES - Typeahead search over drivers and events
+# ==============================================================================
+# This file defines the route that finds drivers and events by name, so the
+# frontend can offer suggestions while the user types
+# ==============================================================================
+
+from fastapi import APIRouter, Query                # FastAPI tools
+from typing import Optional                         # For type hints
+from app.core.config import settings
+from app.core.responses import json_response         # Skips jsonable_encoder
+from app.models.search import get_search_index       # In-memory name index
+
+# ==============================================================================
+# CREATE ROUTER
+# ==============================================================================
+
+router = APIRouter()
+
+
+# ==============================================================================
+# ROUTE 1: SEARCH DRIVERS AND EVENTS
+# ==============================================================================
+# This creates a route at: /api/v1/search
+# HTTP Method: GET
+# Query Parameters: q (what was typed), limit, type (driver or event)
+# Returns: Matching drivers and events, best match first
+
+@router.get("")
+async def search(
+    q: str = Query(..., min_length=1, max_length=100, description="Text typed so far"),
+    limit: int = Query(
+        settings.SEARCH_LIMIT, ge=1, le=settings.SEARCH_LIMIT_MAX,
+        description="Most results to return",
+    ),
+    type: Optional[str] = Query(None, pattern="^(driver|event)$", description="driver or event"),
+):
+    """
+    Find drivers and events by name
+
+    Any word of the name can be typed partially ("jan do" finds
+    "Jane Doe"); the middle of a word and small typos ("ralycross")
+    are matched too, ranked after exact prefix matches.
+
+    Example:
+        GET /api/v1/search?q=rallycross 71
+
+    Example response:
+    {
+        "query": "rallycross 71",
+        "results": [
+            {"type": "event", "id": 3, "name": "Rallycross #71, points event #4",
+             "date": "2024-09-29"}
+        ]
+    }
+
+    Use the id with /standings/{driver_id}, or the date with
+    /events/{event_date}.
+    """
+
+    # ------------------------------------------------------------------
+    # PREFIX TRIE + TRIGRAM INDEX - no scan over all names
+    # ------------------------------------------------------------------
+    results = get_search_index().search(q, limit=limit, kind=type)
+    return json_response({"query": q, "results": results})
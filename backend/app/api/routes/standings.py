@@ -6,7 +6,14 @@
 # ==============================================================================
 
 from fastapi import APIRouter, HTTPException, Query  # FastAPI tools
-from typing import List                             # For type hints
+from fastapi.responses import StreamingResponse     # For long-lived SSE streams
+from typing import List, Optional                   # For type hints
+from app.core.broadcast import StandingsBroadcaster  # Live delta fan-out
+from app.core.config import settings
+from app.core.responses import json_response         # Skips jsonable_encoder
+from app.models.export import export_chunks          # Chunked CSV / NDJSON
+from app.models.history import get_driver_history    # Prefix sums + pair cache
+from app.models.standings import get_standings_engine, get_standings_partitions
 
 
 # ==============================================================================
@@ -23,50 +30,279 @@ router = APIRouter()
 # ==============================================================================
 # This creates a route at: /api/v1/standings/
 # HTTP Method: GET
+# Query Parameters: series, class (optional - standings for just that
+#                   series and/or class)
 # Returns: List of all driver standings
 
 @router.get("/")
-async def get_standings():
+async def get_standings(
+    series: Optional[str] = Query(None, max_length=100, description="e.g. Rallycross"),
+    class_name: Optional[str] = Query(None, alias="class", max_length=50, description="e.g. Stock"),
+):
     """
     Get race standings
     
-    Returns all drivers and their current standings
+    Returns all drivers and their current standings. With ?series= and/or
+    ?class= only results from that series/class count, e.g.
+    /api/v1/standings/?series=Rallycross&class=Stock
     
     Example response:
     {
         "standings": [
-            {"position": 1, "driver": "Driver 1", "points": 100},
-            {"position": 2, "driver": "Driver 2", "points": 85}
+            {"position": 1, "driver_id": 1, "driver": "Driver 1", "points": 100, "wins": 1},
+            {"position": 2, "driver_id": 2, "driver": "Driver 2", "points": 85, "wins": 0}
         ]
     }
     """
     
     # ------------------------------------------------------------------
-    # MOCK DATA - Replace this with database query
+    # STANDINGS ENGINE - Positions are maintained as results are posted
     # ------------------------------------------------------------------
-    # Currently returning fake data for demonstration
-    # STUB: Replace with actual database query
-    # Example with database:
-    # from app.models import Standing
-    # standings = await Standing.get_all()
-    # return {"standings": standings}
+    # Filtered tables are kept up to date as results arrive (one engine per
+    # series/class), so a filter is a dict lookup - nothing is filtered here
+    if series is None and class_name is None:
+        engine = get_standings_engine()
+    else:
+        engine = get_standings_partitions().get(series, class_name)
+        if engine is None:
+            return json_response({"standings": []})     # No results there yet
     
-    standings_data = [
-        {"position": 1, "driver": "Placeholder Driver 1", "points": 100},
-        {"position": 2, "driver": "Placeholder Driver 2", "points": 85},
-        {"position": 3, "driver": "Placeholder Driver 3", "points": 70},
-        {"position": 4, "driver": "Placeholder Driver 4", "points": 60},
-        {"position": 5, "driver": "Placeholder Driver 5", "points": 50},
-    ]
+    # The sort happens once per standings change; the engine stores typed
+    # columns, and row dicts are only built here, to be serialized
+    standings_data = engine.ranked()
     
-    return {"standings": standings_data}
+    # Plain dicts of ints/strings - encode directly, no jsonable_encoder pass
+    return json_response({"standings": standings_data})
     
     # STUB: Add filtering, sorting, pagination
     # Example: ?sort=points&order=desc&page=1&limit=10
 
 
 # ==============================================================================
-# ROUTE 2: GET SPECIFIC DRIVER STANDING
+# ROUTE 2: LIVE STANDINGS STREAM (Server-Sent Events)
+# ==============================================================================
+# This creates a route at: /api/v1/standings/stream
+# HTTP Method: GET (kept open - the server keeps pushing messages)
+# Returns: a "snapshot" message, then a "delta" message per standings change
+#
+# NOTE: This must be declared BEFORE /{driver_id}, otherwise FastAPI would
+# try to read "stream" as a driver id.
+# ==============================================================================
+
+# One broadcaster per process: it diffs the table once per change and hands
+# the same encoded frame to every connected client (see app/core/broadcast.py)
+broadcaster = StandingsBroadcaster(
+    snapshot_fn=lambda: get_standings_engine().ranked(),
+    version_fn=lambda: get_standings_engine().version,
+    max_queue=settings.SSE_CLIENT_QUEUE_SIZE,
+)
+get_standings_engine().add_listener(broadcaster.notify)
+
+
+@router.get("/stream")
+async def stream_standings():
+    """
+    Stream standings changes as Server-Sent Events
+    
+    Browser usage:
+        const source = new EventSource("/api/v1/standings/stream")
+        source.addEventListener("snapshot", e => setTable(JSON.parse(e.data)))
+        source.addEventListener("delta", e => applyChanges(JSON.parse(e.data)))
+    
+    Example delta message:
+        event: delta
+        data: {"version": 12, "changed": [{"position": 1, "driver_id": 5, ...}]}
+    """
+    return StreamingResponse(
+        broadcaster.stream(keepalive=settings.SSE_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",      # Tell nginx not to buffer the stream
+        },
+    )
+
+
+# ==============================================================================
+# ROUTE 3: BATCH DRIVER STANDINGS
+# ==============================================================================
+# This creates a route at: /api/v1/standings/batch?ids=1,2,3
+# HTTP Method: GET
+# Query Parameters: ids (comma-separated driver ids, at most BATCH_MAX_KEYS)
+# Returns: The standing of every known driver, plus the ids that weren't found
+#
+# NOTE: Like /stream, this must be declared BEFORE /{driver_id}.
+# ==============================================================================
+
+@router.get("/batch")
+async def get_driver_standings_batch(
+    ids: str = Query(..., max_length=20 * settings.BATCH_MAX_KEYS, description="e.g. 1,2,3"),
+):
+    """
+    Get the standings of several drivers in one request
+
+    Replaces one GET /standings/{driver_id} per driver on a grid page.
+    Standings come back in the order asked for (duplicates once);
+    unknown drivers are listed in "missing" instead of failing the batch.
+
+    Example:
+        GET /api/v1/standings/batch?ids=1,2,99
+
+    Example response:
+    {
+        "standings": [
+            {"driver_id": 1, "position": 1, "points": 100},
+            {"driver_id": 2, "position": 2, "points": 85}
+        ],
+        "missing": [99]
+    }
+    """
+    try:
+        # dict.fromkeys drops repeated ids but keeps the order they came in
+        driver_ids = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if not driver_ids:
+        raise HTTPException(status_code=400, detail="Pass at least one driver id")
+    if len(driver_ids) > settings.BATCH_MAX_KEYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BATCH_MAX_KEYS} driver ids per request",
+        )
+
+    # ------------------------------------------------------------------
+    # STANDINGS ENGINE - one pass, O(log n) per driver, one encoded body
+    # ------------------------------------------------------------------
+    found = get_standings_engine().get_many(driver_ids)
+    return json_response({
+        "standings": [standing for standing in found if standing],
+        "missing": [d for d, standing in zip(driver_ids, found) if not standing],
+    })
+
+
+# ==============================================================================
+# ROUTE 4: EXPORT THE SEASON
+# ==============================================================================
+# This creates a route at: /api/v1/standings/export
+# HTTP Method: GET
+# Query Parameters: format (csv or ndjson), table (standings or results),
+#                   series, class (optional - standings table to export)
+# Returns: A file download, streamed in EXPORT_CHUNK_SIZE chunks
+#
+# NOTE: Like /stream, this must be declared BEFORE /{driver_id}.
+# ==============================================================================
+
+@router.get("/export")
+async def export_season(
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    table: str = Query("standings", pattern="^(standings|results)$", description="standings or results"),
+    series: Optional[str] = Query(None, max_length=100, description="e.g. Rallycross"),
+    class_name: Optional[str] = Query(None, alias="class", max_length=50, description="e.g. Stock"),
+):
+    """
+    Download the full standings table or every result
+
+    Rows are written straight from the in-memory stores into the response
+    as it is sent, so the download costs the same memory for any season
+    size. The standings are the table as of the start of the download.
+
+    Example:
+        curl -o standings.csv "http://localhost:8000/api/v1/standings/export?format=csv"
+
+        position,driver_id,driver,points,wins
+        1,1,Driver 1,100,1
+        2,2,Driver 2,85,0
+
+    With table=results: event_id,event,date,driver_id,driver,class,
+    position,points - one line per result, oldest event first.
+    """
+    engine = None
+    if table == "standings" and (series is not None or class_name is not None):
+        engine = get_standings_partitions().get(series, class_name)
+        if engine is None:
+            raise HTTPException(status_code=404, detail="No standings for that series/class")
+
+    # ------------------------------------------------------------------
+    # GENERATOR → StreamingResponse: one chunk in memory at a time
+    # ------------------------------------------------------------------
+    chunks, media_type = export_chunks(table, format, settings.EXPORT_CHUNK_SIZE, engine)
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{table}.{format}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+# ==============================================================================
+# ROUTE 5: HEAD-TO-HEAD COMPARISON
+# ==============================================================================
+# This creates a route at: /api/v1/standings/compare?a=1&b=2
+# HTTP Method: GET
+# Query Parameters: a, b (the two driver ids)
+# Returns: Both drivers' season summaries and their head-to-head record
+#
+# NOTE: Like /stream, this must be declared BEFORE /{driver_id}.
+# ==============================================================================
+
+def _driver_summary(driver_id: int) -> dict:
+    """Standing + name + season summary, or 404 if the driver is unknown"""
+    engine = get_standings_engine()
+    standing = engine.get(driver_id)
+    if not standing:
+        raise HTTPException(status_code=404, detail=f"Driver {driver_id} not found")
+    stats = get_driver_history().summary(driver_id)
+    return {
+        **standing,                                 # Season points as standings count them
+        "driver": engine.name(driver_id),
+        "starts": stats["starts"],
+        "best_finish": stats["best_finish"],
+        "average_finish": stats["average_finish"],
+    }
+
+
+@router.get("/compare")
+async def compare_drivers(
+    a: int = Query(..., description="First driver id"),
+    b: int = Query(..., description="Second driver id"),
+):
+    """
+    Compare two drivers
+
+    "head_to_head" only counts events where both drivers finished in the
+    same class; "a_ahead"/"b_ahead" say who finished higher there.
+
+    Example:
+        GET /api/v1/standings/compare?a=1&b=2
+
+    Example response:
+    {
+        "a": {"driver_id": 1, "position": 1, "points": 100, "driver": "Driver 1",
+              "starts": 1, "best_finish": 1, "average_finish": 1.0},
+        "b": {"driver_id": 2, "position": 2, "points": 85, "driver": "Driver 2",
+              "starts": 1, "best_finish": 2, "average_finish": 2.0},
+        "head_to_head": {"meetings": 1, "a_ahead": 1, "b_ahead": 0,
+                         "a_points": 100, "b_points": 85}
+    }
+    """
+    if a == b:
+        raise HTTPException(status_code=400, detail="Pick two different drivers")
+
+    # ------------------------------------------------------------------
+    # PREFIX SUMS for each driver + CACHED pair aggregate - no result scan
+    # ------------------------------------------------------------------
+    summary_a, summary_b = _driver_summary(a), _driver_summary(b)
+    return json_response({
+        "a": summary_a,
+        "b": summary_b,
+        "head_to_head": get_driver_history().head_to_head(a, b),
+    })
+
+
+# ==============================================================================
+# ROUTE 6: GET SPECIFIC DRIVER STANDING
 # ==============================================================================
 # This creates a route at: /api/v1/standings/{driver_id}
 # HTTP Method: GET
@@ -91,21 +327,67 @@ async def get_driver_standing(driver_id: int):
     """
     
     # ------------------------------------------------------------------
-    # MOCK DATA - Replace with database lookup
+    # STANDINGS ENGINE - O(log n) position lookup
     # ------------------------------------------------------------------
-    # STUB: Replace with database query
-    # from app.models import Standing
-    # standing = await Standing.get_by_id(driver_id)
-    # if not standing:
-    #     raise HTTPException(status_code=404, detail="Driver not found")
-    # return standing
+    standing = get_standings_engine().get(driver_id)
+    if not standing:
+        raise HTTPException(status_code=404, detail="Driver not found")
     
-    # For now, just return mock data
-    return {
-        "driver_id": driver_id,
-        "position": 1,
-        "points": 100
+    return json_response(standing)
+
+
+# ==============================================================================
+# ROUTE 7: DRIVER HISTORY
+# ==============================================================================
+# This creates a route at: /api/v1/standings/{driver_id}/history
+# HTTP Method: GET
+# Query Parameters: date_from, date_to (optional - only rounds in that range)
+# Returns: Every round the driver scored in, with the running points total
+# ==============================================================================
+
+# ISO date, e.g. 2024-09-29
+ISO_DATE = r"^\d{4}-\d{2}-\d{2}$"
+
+
+@router.get("/{driver_id}/history")
+async def get_driver_history_route(
+    driver_id: int,
+    date_from: Optional[str] = Query(None, pattern=ISO_DATE, description="Earliest date (inclusive)"),
+    date_to: Optional[str] = Query(None, pattern=ISO_DATE, description="Latest date (inclusive)"),
+):
+    """
+    Get a driver's points progression, best finish and average finish
+
+    One row per result (a driver entered in two classes at one event has
+    two rows); "cumulative_points" counts from the first row returned.
+
+    Example:
+        GET /api/v1/standings/1/history?date_from=2024-01-01
+
+    Example response:
+    {
+        "driver_id": 1, "driver": "Driver 1",
+        "starts": 1, "points": 100, "best_finish": 1, "average_finish": 1.0,
+        "rounds": [
+            {"event_id": 1, "event": "Rallycross #1", "date": "2024-11-24",
+             "class": "", "position": 1, "points": 100, "cumulative_points": 100}
+        ]
     }
+    """
+    engine = get_standings_engine()
+    if driver_id not in engine:
+        raise HTTPException(status_code=404, detail="Driver not found")
+
+    # ------------------------------------------------------------------
+    # PREFIX SUMS - totals for any date range are two lookups each
+    # ------------------------------------------------------------------
+    history = get_driver_history()
+    return json_response({
+        "driver_id": driver_id,
+        "driver": engine.name(driver_id),
+        **history.summary(driver_id, date_from, date_to),
+        "rounds": history.rounds(driver_id, date_from, date_to),
+    })
 
 
 # ==============================================================================
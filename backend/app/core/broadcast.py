@@ -0,0 +1,195 @@
+# ==============================================================================
+# BROADCAST - Fan-out of live standings changes to Server-Sent Events clients
+# ==============================================================================
+# Instead of every browser polling GET /standings/ for the full table, clients
+# open ONE long-lived connection (/standings/stream) and receive only what
+# changed.
+#
+# How it works:
+# - The standings engine calls notify() after every change
+# - The broadcaster diffs the new table against the last one it saw - ONCE,
+#   no matter how many clients are connected
+# - That delta is encoded into a single SSE frame (bytes) and the same bytes
+#   object is queued for every subscriber
+# - Each subscriber has a small bounded queue. If a client is too slow to keep
+#   up, its backlog is thrown away and it gets a full "snapshot" frame instead,
+#   so one slow phone on 3G can never hold up everyone else
+# ==============================================================================
+
+import asyncio
+import json
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+
+# ==============================================================================
+# SSE FRAME ENCODING
+# ==============================================================================
+
+def encode_frame(event: str, data: dict, event_id: Optional[int] = None) -> bytes:
+    """Encode one Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, separators=(",", ":")))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+# Comment line - keeps proxies from closing an idle connection
+KEEPALIVE_FRAME = b": keepalive\n\n"
+
+
+# ==============================================================================
+# SUBSCRIBER - One connected client
+# ==============================================================================
+
+class Subscriber:
+    """A client's bounded frame queue plus a 'needs resync' flag"""
+
+    def __init__(self, max_queue: int):
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=max_queue)
+        self.resync = False
+
+    def offer(self, frame: bytes) -> bool:
+        """Queue a frame without waiting; False if the client is too far behind"""
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+
+# ==============================================================================
+# STANDINGS BROADCASTER
+# ==============================================================================
+
+class StandingsBroadcaster:
+    """
+    Computes one delta per standings change and fans it out
+
+    Args:
+        snapshot_fn: returns the current ranked standings rows
+        version_fn:  returns the current standings version
+        max_queue:   frames buffered per client before it is resynced
+    """
+
+    def __init__(
+        self,
+        snapshot_fn: Callable[[], List[dict]],
+        version_fn: Callable[[], int],
+        max_queue: int = 32,
+    ):
+        self._snapshot_fn = snapshot_fn
+        self._version_fn = version_fn
+        self.max_queue = max_queue
+        self._subscribers: Set[Subscriber] = set()
+        self._last: Dict[int, Tuple[int, int]] = {}   # driver_id → (position, points)
+        self._last_version = -1
+        self.resyncs = 0                              # Slow-client counter
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    # ------------------------------------------------------------------
+    # FRAMES
+    # ------------------------------------------------------------------
+
+    def _remember(self, rows: List[dict]) -> None:
+        self._last = {r["driver_id"]: (r["position"], r["points"]) for r in rows}
+        self._last_version = self._version_fn()
+
+    def snapshot_frame(self) -> bytes:
+        """Full table - sent on connect and to clients that fell behind"""
+        rows = self._snapshot_fn()
+        version = self._version_fn()
+        return encode_frame("snapshot", {"version": version, "standings": rows}, version)
+
+    def _delta_frame(self) -> Optional[bytes]:
+        """Only the drivers whose position or points moved since last time"""
+        rows = self._snapshot_fn()
+        last = self._last
+        changed = [
+            r for r in rows
+            if last.get(r["driver_id"]) != (r["position"], r["points"])
+        ]
+        current_ids = {r["driver_id"] for r in rows}
+        removed = [driver_id for driver_id in last if driver_id not in current_ids]
+        self._remember(rows)
+        if not changed and not removed:
+            return None
+        data = {"version": self._last_version, "changed": changed}
+        if removed:
+            data["removed"] = removed
+        return encode_frame("delta", data, self._last_version)
+
+    # ------------------------------------------------------------------
+    # PUBLISH - Called by the standings engine after each change
+    # ------------------------------------------------------------------
+
+    def notify(self) -> None:
+        """Diff once, then hand the same frame to every subscriber"""
+        if self._version_fn() == self._last_version:
+            return
+        if not self._subscribers:
+            # Nobody listening: skip the diff, the next subscriber gets a snapshot
+            self._last_version = -1
+            return
+        frame = self._delta_frame()
+        if frame is None:
+            return
+        for subscriber in self._subscribers:
+            if subscriber.resync:
+                continue
+            if not subscriber.offer(frame):
+                self._mark_resync(subscriber)
+
+    def _mark_resync(self, subscriber: Subscriber) -> None:
+        """Drop a slow client's backlog; it gets a fresh snapshot next"""
+        self.resyncs += 1
+        subscriber.resync = True
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        # Wake the client's stream loop so it notices the resync
+        subscriber.queue.put_nowait(b"")
+
+    # ------------------------------------------------------------------
+    # SUBSCRIBE - Used by the SSE route
+    # ------------------------------------------------------------------
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(self.max_queue)
+        if not self._subscribers:
+            # First listener: start diffing from the current table
+            self._remember(self._snapshot_fn())
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    async def stream(self, keepalive: float = 15.0):
+        """
+        Async generator of SSE frames for one client
+
+        Starts with a snapshot, then yields deltas as they are published.
+        The client is subscribed only once the response starts iterating,
+        in the same scope that unsubscribes it - a response that is never
+        sent (client gone first) can't leave a subscriber behind.
+        """
+        subscriber = self.subscribe()
+        try:
+            yield self.snapshot_frame()
+            while True:
+                try:
+                    frame = await asyncio.wait_for(subscriber.queue.get(), keepalive)
+                except asyncio.TimeoutError:
+                    yield KEEPALIVE_FRAME
+                    continue
+                if subscriber.resync:
+                    subscriber.resync = False
+                    yield self.snapshot_frame()
+                    continue
+                yield frame
+        finally:
+            self.unsubscribe(subscriber)
@@ -0,0 +1,259 @@
+# ==============================================================================
+# CACHE TIERS - In-process LRU plus an optional cache shared between processes
+# ==============================================================================
+# Tier 1: LRUCache
+#   A dict in this worker. Bounded by entry count AND by bytes, with an
+#   optional time-to-live. Lookups are a dict hit, no I/O.
+#
+# Tier 2: SharedCache (interface)
+#   Bytes in, bytes out, reachable from every worker - so what one worker
+#   built, the others (and the next run) can reuse instead of rebuilding.
+#   SQLiteSharedCache is the stand-in: one SQLite file on local disk. A
+#   network cache (Redis, memcached) would implement the same two methods.
+#
+# Neither tier knows about invalidation: callers put the version of the data
+# into the key, so a write simply makes new keys and old entries age out
+# (LRU / size / TTL). Every tier counts hits, misses and evictions
+# (exported at /metrics, see app/core/metrics.py).
+#
+# A cache must never break a request: SharedCache errors count as misses.
+# ==============================================================================
+
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+# ==============================================================================
+# COUNTERS
+# ==============================================================================
+
+class CacheStats:
+    """Hit/miss/eviction counters of one tier (plain ints: one event loop per worker)"""
+
+    __slots__ = ("hits", "misses", "evictions", "errors")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits, "misses": self.misses,
+            "evictions": self.evictions, "errors": self.errors,
+        }
+
+
+# ==============================================================================
+# TIER 1 - In-process LRU with size and TTL bounds
+# ==============================================================================
+
+class LRUCache(Generic[V]):
+    """
+    Least-recently-used cache bounded by entries and by total size
+
+    `size_of(value)` gives an entry's size in bytes; call resize(key) if a
+    value grows after it was stored. ttl=0 keeps entries until evicted.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl: float = 0.0,
+        size_of: Callable[[V], int] = len,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size_of = size_of
+        self.stats = CacheStats()
+        self.bytes = 0
+        # key → (value, size, expires at; 0 = never)
+        self._entries: "OrderedDict[Hashable, Tuple[V, int, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        item = self._entries.get(key)
+        if item is None:
+            self.stats.misses += 1
+            return None
+        if item[2] and item[2] < time.monotonic():
+            self._drop(key)                     # Expired: counts as an eviction
+            self.stats.evictions += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return item[0]
+
+    def put(self, key: Hashable, value: V) -> None:
+        """Store a value, evicting least recently used entries past the bounds"""
+        if key in self._entries:
+            self._drop(key)
+        size = self.size_of(value)
+        expires = time.monotonic() + self.ttl if self.ttl > 0 else 0.0
+        self._entries[key] = (value, size, expires)
+        self.bytes += size
+        self._evict()
+
+    def resize(self, key: Hashable) -> None:
+        """Re-measure an entry whose value grew (e.g. a compressed copy was added)"""
+        item = self._entries.get(key)
+        if item is None:
+            return
+        size = self.size_of(item[0])
+        self.bytes += size - item[1]
+        self._entries[key] = (item[0], size, item[2])
+        self._evict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+    def _drop(self, key: Hashable) -> None:
+        self.bytes -= self._entries.pop(key)[1]
+
+    def _evict(self) -> None:
+        entries = self._entries
+        # Always keep the newest entry, even if it alone is over max_bytes
+        while len(entries) > 1 and (len(entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, (_, size, _) = entries.popitem(last=False)
+            self.bytes -= size
+            self.stats.evictions += 1
+
+
+# ==============================================================================
+# TIER 2 - Shared between processes
+# ==============================================================================
+
+class SharedCache(ABC):
+    """Bytes cache reachable from every worker; implementations count into `stats`"""
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """The stored bytes, or None (missing, expired or unreachable)"""
+
+    @abstractmethod
+    async def put(self, key: str, value: bytes) -> None:
+        """Store bytes; failures are counted, never raised"""
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteSharedCache(SharedCache):
+    """
+    SharedCache in one SQLite file - for the workers of one host
+
+    WAL mode lets every worker read while one writes. Entries are evicted
+    oldest-stored first once the file holds more than `max_bytes` of
+    values, and skipped (then deleted) once older than `ttl` seconds.
+    Calls run in a worker thread so the event loop never waits on disk.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS cache ("
+        " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+        " size INTEGER NOT NULL, stored REAL NOT NULL)"
+    )
+
+    def __init__(self, path: str, max_bytes: int, ttl: float = 0.0):
+        super().__init__()
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()           # One sqlite3 connection, many threads
+        self._conn: Optional[sqlite3.Connection] = None
+        self._bytes: Optional[int] = None       # Estimate, re-read before evicting
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=0.05, isolation_level=None, check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")      # A cache can lose entries
+            conn.execute(self.SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value, stored FROM cache WHERE key = ?", (key,),
+            ).fetchone()
+            if row is not None and self.ttl > 0 and row[1] < time.time() - self.ttl:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self.stats.evictions += 1
+                row = None
+        return None if row is None else row[0]
+
+    def _put(self, key: str, value: bytes) -> None:
+        with self._lock:
+            conn = self._connect()
+            # A refreshed key replaces its old value: only the difference counts
+            replaced = conn.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, stored) VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time()),
+            )
+            if self._bytes is None:
+                self._bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+            else:
+                self._bytes += len(value) - (replaced[0] if replaced else 0)
+            if self._bytes > self.max_bytes:
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # Other workers write too: re-read the total, then drop the oldest
+        # entries until a tenth of the budget is free again
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        target = self.max_bytes * 0.9
+        freed = 0
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM cache ORDER BY stored"):
+            if total - freed <= target:
+                break
+            doomed.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM cache WHERE key = ?", doomed)
+        self.stats.evictions += len(doomed)
+        self._bytes = total - freed
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            value = await asyncio.to_thread(self._get, key)
+        except sqlite3.Error:
+            self.stats.errors += 1
+            value = None
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def put(self, key: str, value: bytes) -> None:
+        try:
+            await asyncio.to_thread(self._put, key, value)
+        except sqlite3.Error:
+            self.stats.errors += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
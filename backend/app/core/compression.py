@@ -0,0 +1,233 @@
+# ==============================================================================
+# COMPRESSION - gzip / brotli for API responses
+# ==============================================================================
+# Standings and event lists repeat the same keys and similar values on every
+# row, so they shrink 5-10x when compressed - much less to send to phones on
+# trackside mobile data.
+#
+# How it works:
+# - The client says what it can decode in the Accept-Encoding header
+# - We pick brotli ("br", if the `brotli` package is installed) or gzip
+#   (standard library, always available)
+# - Bodies smaller than COMPRESSION_MIN_SIZE are sent as-is: below ~1 KB the
+#   saving doesn't pay for the CPU
+#
+# Two places use this:
+# - ResponseCacheMiddleware compresses each cached body once per encoding and
+#   data version, then sends the same compressed bytes to everyone
+# - CompressionMiddleware compresses everything else on the fly
+# ==============================================================================
+
+import gzip
+import zlib
+from typing import Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import brotli                                  # Optional, better ratio than gzip
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Compress bigger bodies in a worker thread (zlib/brotli release the GIL),
+# so one large response doesn't stall every other request on the event loop
+THREAD_THRESHOLD = 256 * 1024
+
+
+def parse_accept_encoding(header: Optional[bytes]) -> Dict[str, float]:
+    """b'gzip, br;q=0.8' → {'gzip': 1.0, 'br': 0.8}"""
+    accepted: Dict[str, float] = {}
+    if not header:
+        return accepted
+    for part in header.decode("latin-1").split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    return accepted
+
+
+# ==============================================================================
+# COMPRESSOR - Negotiation + compression with fixed settings
+# ==============================================================================
+
+class Compressor:
+    """
+    Picks an encoding for a request and compresses bodies with it
+
+    Args:
+        minimum_size:   bodies smaller than this are never compressed
+        gzip_level:     1 (fast) .. 9 (small)
+        brotli_quality: 0 (fast) .. 11 (small)
+    """
+
+    def __init__(self, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5):
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        # Server preference order when the client accepts several equally
+        self.encodings: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def negotiate(self, accept_encoding: Optional[bytes]) -> Optional[str]:
+        """Best encoding this client accepts, or None for uncompressed"""
+        accepted = parse_accept_encoding(accept_encoding)
+        best, best_quality = None, 0.0
+        for encoding in self.encodings:
+            quality = accepted.get(encoding, accepted.get("*", 0.0))
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        # mtime=0 keeps the output identical for identical input
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def compress_async(self, body: bytes, encoding: str) -> bytes:
+        if len(body) >= THREAD_THRESHOLD:
+            return await run_in_threadpool(self.compress, body, encoding)
+        return self.compress(body, encoding)
+
+    def stream(self, encoding: str) -> "StreamCompressor":
+        return StreamCompressor(encoding, self)
+
+
+class StreamCompressor:
+    """Compresses a response body that arrives in several chunks"""
+
+    def __init__(self, encoding: str, compressor: Compressor):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=compressor.brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(compressor.gzip_level, zlib.DEFLATED, 31)  # 31 = gzip
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress and flush, so each chunk reaches the client promptly"""
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def _header(headers, name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key == name:
+            return value
+    return None
+
+
+def _with_vary(headers: list) -> list:
+    """Add Accept-Encoding to the Vary header (shared caches must key on it)"""
+    vary = _header(headers, b"vary")
+    if vary is None:
+        return headers + [(b"vary", b"Accept-Encoding")]
+    if b"accept-encoding" in vary.lower():
+        return headers
+    return [(k, v) for k, v in headers if k != b"vary"] + [(b"vary", vary + b", Accept-Encoding")]
+
+
+# ==============================================================================
+# MIDDLEWARE - On-the-fly compression for responses that aren't cached
+# ==============================================================================
+
+class CompressionMiddleware:
+    """
+    Compresses responses the client can decode
+
+    Skipped: responses already encoded (e.g. precompressed cache hits),
+    Server-Sent Events streams, and single-body responses below the size
+    threshold. Streamed bodies are compressed chunk by chunk.
+    """
+
+    def __init__(self, app, compressor: Compressor):
+        self.app = app
+        self.compressor = compressor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self.compressor.negotiate(_header(scope["headers"], b"accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        streamer: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start_message, streamer, passthrough
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                content_type = _header(headers, b"content-type") or b""
+                passthrough = (
+                    _header(headers, b"content-encoding") is not None
+                    or content_type.startswith(b"text/event-stream")
+                    or message["status"] in (204, 304)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start_message = message             # Held until we see the body
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None and not more_body:
+                # Whole body in one message - compress it in one go
+                headers = start_message.get("headers", [])
+                if len(body) < self.compressor.minimum_size:
+                    await send(start_message)
+                    await send(message)
+                else:
+                    compressed = await self.compressor.compress_async(body, encoding)
+                    await send(_encoded_start(start_message, encoding, len(compressed)))
+                    await send({"type": "http.response.body", "body": compressed})
+                start_message = None
+                return
+
+            if start_message is not None:
+                # First of several chunks - switch to streaming compression
+                streamer = self.compressor.stream(encoding)
+                await send(_encoded_start(start_message, encoding, None))
+                start_message = None
+            data = streamer.chunk(body) if body else b""
+            if not more_body:
+                data += streamer.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, compressing_send)
+
+
+def _encoded_start(start_message: dict, encoding: str, length: Optional[int]) -> dict:
+    """Copy of a response start message, re-headed for a compressed body"""
+    headers = [
+        (k, v) for k, v in start_message.get("headers", [])
+        if k != b"content-length"
+    ]
+    etag = _header(headers, b"etag")
+    if etag is not None and etag.endswith(b'"'):
+        # A different representation needs a different strong ETag
+        headers = [(k, v) for k, v in headers if k != b"etag"]
+        headers.append((b"etag", etag[:-1] + b"-" + encoding.encode() + b'"'))
+    headers.append((b"content-encoding", encoding.encode()))
+    if length is not None:
+        headers.append((b"content-length", str(length).encode("latin-1")))
+    return {**start_message, "headers": _with_vary(headers)}
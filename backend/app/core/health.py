@@ -0,0 +1,223 @@
+# ==============================================================================
+# HEALTH - What /health/live and /health/ready report
+# ==============================================================================
+# An orchestrator (Docker, Kubernetes, a load balancer) polls these often,
+# so a probe must answer in microseconds and must never wait on the thing
+# it reports - a probe that queries the database hangs exactly when the
+# database does. So the probes only READ numbers that are kept up to date
+# elsewhere:
+#
+# - event loop lag     a background ticker sleeps `tick_interval` and notes
+#                      how late it woke up. A busy or blocked loop wakes it
+#                      late - the best single sign of an overloaded worker
+# - database latency   a background task runs `SELECT 1` every
+#                      `ping_interval` and keeps the time it took (or the
+#                      error). Pool size/idle connections are plain counters
+# - in-flight requests, cache counters, data version: already maintained by
+#                      MetricsMiddleware, the caches and the stores
+#
+# Liveness ("restart me?") only fails if the ticker itself died. Readiness
+# ("send me traffic?") fails while the stores aren't loaded, the database is
+# unreachable, or the worker is overloaded (HEALTH_MAX_* limits) - so the
+# load balancer routes around a busy worker instead of piling on.
+#
+# All numbers are per worker: with several uvicorn workers, each probe
+# describes the worker that happened to answer it.
+# ==============================================================================
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.database import Database
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Background measurements for the health probes, plus the reports built from them"""
+
+    def __init__(
+        self,
+        database: Optional[Database],
+        tick_interval: float = 0.1,
+        window: float = 5.0,
+        ping_interval: float = 5.0,
+        max_loop_lag: float = 0.5,
+        max_in_flight: int = 0,
+    ):
+        self.database = database
+        self.tick_interval = tick_interval
+        self.ping_interval = ping_interval
+        self.max_loop_lag = max_loop_lag            # 0 = lag never fails readiness
+        self.max_in_flight = max_in_flight          # 0 = no limit
+        # Set by the lifespan once the stores are loaded, cleared at shutdown
+        self.ready = False
+        self.started_at = time.time()
+
+        # Loop lag: the last `window` seconds of samples
+        self.lag = 0.0
+        self._lags: Deque[float] = deque(maxlen=max(1, round(window / tick_interval)))
+        self._last_tick: Optional[float] = None     # loop.time() of the last wake-up
+
+        # Database: result of the last ping
+        self.db_latency: Optional[float] = None
+        self.db_error: Optional[str] = None
+        self.db_checked_at: Optional[float] = None
+        self._ping_started: Optional[float] = None  # Set while a ping is running
+
+        self._tasks: List[asyncio.Task] = []
+
+    # ------------------------------------------------------------------
+    # BACKGROUND TASKS - Started/stopped by the app lifespan
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        self._tasks.append(asyncio.create_task(self._tick_forever()))
+        if self.database is not None and self.ping_interval > 0:
+            self._tasks.append(asyncio.create_task(self._ping_forever()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _tick_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + self.tick_interval
+            await asyncio.sleep(self.tick_interval)
+            now = loop.time()
+            self._last_tick = now
+            self.lag = max(0.0, now - due)
+            self._lags.append(self.lag)
+
+    async def _ping_forever(self) -> None:
+        while True:
+            start = time.perf_counter()
+            self._ping_started = start
+            failed_before = self.db_error is not None
+            try:
+                # Bounded by DB_POOL_TIMEOUT / DB_COMMAND_TIMEOUT like any query
+                await self.database.fetch_all("SELECT 1")
+                self.db_latency, self.db_error = time.perf_counter() - start, None
+                if failed_before:
+                    logger.info("Health check database ping works again")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.db_latency, self.db_error = None, f"{type(exc).__name__}: {exc}"
+                if not failed_before:                   # Log the change, not every ping
+                    logger.warning("Health check database ping failed: %s", self.db_error)
+            self._ping_started = None
+            self.db_checked_at = time.time()
+            await asyncio.sleep(self.ping_interval)
+
+    # ------------------------------------------------------------------
+    # READINGS - Plain attribute reads, safe to call from a probe
+    # ------------------------------------------------------------------
+
+    @property
+    def ticking(self) -> bool:
+        """False once the lag ticker has stopped (cancelled or crashed)"""
+        return bool(self._tasks) and not self._tasks[0].done()
+
+    def loop_lag(self) -> Dict[str, float]:
+        """Seconds: last sample, mean and max over the window"""
+        current = self.lag
+        if self._last_tick is not None:
+            # The ticker is overdue if the loop was blocked until just now
+            # (this probe may run before the ticker catches up)
+            overdue = asyncio.get_running_loop().time() - self._last_tick - self.tick_interval
+            current = max(current, overdue)
+        lags = self._lags
+        mean = (sum(lags) + current) / (len(lags) + 1)
+        return {
+            "current": round(current, 6),
+            "mean": round(mean, 6),
+            "max": round(max(max(lags, default=0.0), current), 6),
+        }
+
+    @staticmethod
+    def in_flight() -> int:
+        """Requests being handled right now, not counting the probe asking"""
+        return max(0, metrics.in_flight - 1)
+
+    def database_status(self) -> Dict[str, Any]:
+        db = self.database
+        if db is None:
+            return {"connected": False}
+        status: Dict[str, Any] = {
+            "connected": db.is_connected,
+            "pool_size": db.pool_size,
+            "pool_available": db.pool_available,
+            "ping_seconds": None if self.db_latency is None else round(self.db_latency, 6),
+            "ping_error": self.db_error,
+            "checked_seconds_ago": (
+                None if self.db_checked_at is None else round(time.time() - self.db_checked_at, 3)
+            ),
+        }
+        if self._ping_started is not None:
+            # A ping stuck waiting for a connection or an answer shows here
+            status["ping_pending_seconds"] = round(time.perf_counter() - self._ping_started, 6)
+        return status
+
+    # ------------------------------------------------------------------
+    # REPORTS - What the probe routes return
+    # ------------------------------------------------------------------
+
+    def live(self) -> Dict[str, Any]:
+        return {
+            "status": "alive" if self.ticking else "stalled",
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+            "loop_lag_seconds": self.loop_lag(),
+            "in_flight": self.in_flight(),
+        }
+
+    def ready_report(self, caches: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Full readiness report; report["status"] is "ready" or "not ready"
+
+        `caches` ({cache: {tier: counters}}, as register_cache() takes
+        them) gets a hit ratio per tier; `data` (which data version the
+        stores hold, and since when) is included as given.
+        """
+        lag = self.loop_lag()
+        in_flight = self.in_flight()
+        database = self.database_status()
+
+        problems = []
+        if not self.ready:
+            problems.append("data not loaded")
+        if not database["connected"]:
+            problems.append("database not connected")
+        elif database["ping_error"] is not None:
+            problems.append("database ping failed")
+        if self.max_loop_lag > 0 and lag["mean"] > self.max_loop_lag:
+            problems.append(f"event loop lag {lag['mean']:.3f}s over {self.max_loop_lag}s")
+        if self.max_in_flight > 0 and in_flight > self.max_in_flight:
+            problems.append(f"{in_flight} requests in flight, limit {self.max_in_flight}")
+
+        return {
+            "status": "not ready" if problems else "ready",
+            "problems": problems,
+            "loop_lag_seconds": lag,
+            "in_flight": in_flight,
+            "database": database,
+            "caches": {
+                name: {tier: _with_hit_ratio(counters) for tier, counters in tiers.items()}
+                for name, tiers in caches.items()
+            },
+            "data": data,
+        }
+
+
+def _with_hit_ratio(counters: Dict[str, int]) -> Dict[str, Any]:
+    """Counters plus hits / lookups since start (None before the first lookup)"""
+    lookups = counters.get("hits", 0) + counters.get("misses", 0)
+    ratio = round(counters.get("hits", 0) / lookups, 4) if lookups else None
+    return {**counters, "hit_ratio": ratio}
@@ -0,0 +1,359 @@
+# ==============================================================================
+# METRICS - Request timing and hot-path instrumentation (Prometheus format)
+# ==============================================================================
+# Answers "where does the time go?" for every request:
+#
+# - http_requests_total              how many requests, by route and status
+# - http_request_duration_seconds    latency histogram per route
+# - http_response_size_bytes         body size histogram per route
+# - http_requests_in_flight          requests being handled right now
+# - app_timer_seconds                optional fine-grained timers around
+#                                    serialization and database access
+#                                    (METRICS_DETAILED_TIMERS=true)
+# - app_cache_*                      hits/misses/evictions/errors and size
+#                                    per cache tier (register_cache())
+#
+# Everything is exposed at GET /metrics in Prometheus text format.
+#
+# Counters are plain Python ints owned by one worker process. Each worker
+# runs a single event loop thread, so updates need no locks at all. With
+# several uvicorn workers, set METRICS_MULTIPROC_DIR: every worker then
+# writes its numbers to its own file there, and /metrics (whichever worker
+# answers it) adds all the files together.
+# ==============================================================================
+
+import json
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+
+# Bucket upper bounds (the last, implicit bucket is +Inf)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+# Methods labelled as themselves - any other is "other", so clients can't
+# create series by inventing methods
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+# ==============================================================================
+# HISTOGRAM
+# ==============================================================================
+
+class Histogram:
+    """Fixed-bucket histogram: per-bucket counts plus running sum/count"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)      # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, counts: List[int], total: float, count: int) -> None:
+        for i, c in enumerate(counts):
+            self.counts[i] += c
+        self.sum += total
+        self.count += count
+
+
+# ==============================================================================
+# REGISTRY - All metrics for this worker process
+# ==============================================================================
+
+Labels = Tuple[str, ...]
+
+
+class MetricsRegistry:
+    """Per-worker metric storage, plus Prometheus text rendering"""
+
+    def __init__(self):
+        self.requests: Dict[Labels, int] = {}                 # (method, route, status)
+        self.latency: Dict[Labels, Histogram] = {}            # (method, route)
+        self.sizes: Dict[Labels, Histogram] = {}              # (method, route)
+        self.timers: Dict[Labels, Histogram] = {}             # (name,)
+        self.caches: Dict[Labels, int] = {}                   # (cache, tier, field)
+        self.in_flight = 0
+
+    # ------------------------------------------------------------------
+    # RECORDING
+    # ------------------------------------------------------------------
+
+    def record_request(self, method: str, route: str, status: int, seconds: float, size: int) -> None:
+        key = (method, route)
+        status_key = (method, route, str(status))
+        self.requests[status_key] = self.requests.get(status_key, 0) + 1
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+        histogram = self.sizes.get(key)
+        if histogram is None:
+            histogram = self.sizes[key] = Histogram(SIZE_BUCKETS)
+        histogram.observe(size)
+
+    def observe_timer(self, name: str, seconds: float) -> None:
+        histogram = self.timers.get((name,))
+        if histogram is None:
+            histogram = self.timers[(name,)] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+
+    def collect_caches(self) -> None:
+        """Copy the current counters of every register_cache() source"""
+        self.caches = {
+            (name, tier, field): value
+            for name, stats_fn in _cache_sources.items()
+            for tier, fields in stats_fn().items()
+            for field, value in fields.items()
+        }
+
+    # ------------------------------------------------------------------
+    # MULTI-WORKER - Snapshot to / merge from plain JSON
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> dict:
+        def histograms(table):
+            return [[list(k), h.counts, h.sum, h.count] for k, h in table.items()]
+        return {
+            "pid": os.getpid(),
+            "in_flight": self.in_flight,
+            "requests": [[list(k), v] for k, v in self.requests.items()],
+            "latency": histograms(self.latency),
+            "sizes": histograms(self.sizes),
+            "timers": histograms(self.timers),
+            "caches": [[list(k), v] for k, v in self.caches.items()],
+        }
+
+    def merge(self, data: dict, include_gauges: bool = True) -> None:
+        if include_gauges:
+            self.in_flight += data["in_flight"]
+        for key, value in data["requests"]:
+            key = tuple(key)
+            self.requests[key] = self.requests.get(key, 0) + value
+        for key, value in data.get("caches", []):
+            key = tuple(key)
+            if key[2] in CACHE_GAUGES and not include_gauges:
+                continue
+            self.caches[key] = self.caches.get(key, 0) + value
+        for name, buckets in (("latency", LATENCY_BUCKETS), ("sizes", SIZE_BUCKETS), ("timers", LATENCY_BUCKETS)):
+            table = getattr(self, name)
+            for key, counts, total, count in data[name]:
+                key = tuple(key)
+                if key not in table:
+                    table[key] = Histogram(buckets)
+                table[key].merge(counts, total, count)
+
+    # ------------------------------------------------------------------
+    # PROMETHEUS TEXT FORMAT
+    # ------------------------------------------------------------------
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        lines.append("# HELP http_requests_total Total HTTP requests.")
+        lines.append("# TYPE http_requests_total counter")
+        for (method, route, status), value in sorted(self.requests.items()):
+            labels = _labels(method=method, route=route, status=status)
+            lines.append(f"http_requests_total{{{labels}}} {value}")
+
+        lines.append("# HELP http_requests_in_flight Requests currently being handled.")
+        lines.append("# TYPE http_requests_in_flight gauge")
+        lines.append(f"http_requests_in_flight {self.in_flight}")
+
+        _render_histograms(
+            lines, "http_request_duration_seconds", "Request latency in seconds.",
+            self.latency, ("method", "route"),
+        )
+        _render_histograms(
+            lines, "http_response_size_bytes", "Response body size in bytes.",
+            self.sizes, ("method", "route"),
+        )
+        _render_histograms(
+            lines, "app_timer_seconds", "Fine-grained hot-path timers in seconds.",
+            self.timers, ("name",),
+        )
+
+        for field in sorted({key[2] for key in self.caches}):
+            gauge = field in CACHE_GAUGES
+            name = f"app_cache_{field}" if gauge else f"app_cache_{field}_total"
+            lines.append(f"# HELP {name} Cache {field} per cache and tier.")
+            lines.append(f"# TYPE {name} {'gauge' if gauge else 'counter'}")
+            for (cache, tier, key_field), value in sorted(self.caches.items()):
+                if key_field == field:
+                    lines.append(f"{name}{{{_labels(cache=cache, tier=tier)}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+
+def _render_histograms(lines, name, help_text, table, label_names) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, histogram in sorted(table.items()):
+        base = _labels(**dict(zip(label_names, key)))
+        cumulative = 0
+        bounds = [repr(float(b)) for b in histogram.buckets] + ["+Inf"]
+        for bound, count in zip(bounds, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{base},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{base}}} {histogram.sum}")
+        lines.append(f"{name}_count{{{base}}} {histogram.count}")
+
+
+# ==============================================================================
+# SHARED REGISTRY AND HELPERS
+# ==============================================================================
+
+metrics = MetricsRegistry()
+
+# Cache counters: name → function returning {tier: {field: value}}
+_cache_sources: Dict[str, Callable[[], Dict[str, Dict[str, int]]]] = {}
+CACHE_GAUGES = ("entries", "bytes")        # Sizes, not running totals
+
+
+def register_cache(name: str, stats_fn: Callable[[], Dict[str, Dict[str, int]]]) -> None:
+    """Export a cache's per-tier counters as app_cache_* metrics"""
+    _cache_sources[name] = stats_fn
+
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    """
+    Time a block into app_timer_seconds{name=...}
+
+    Does nothing unless METRICS_DETAILED_TIMERS is on, so it is safe to
+    leave around hot code.
+    """
+    if not settings.METRICS_DETAILED_TIMERS:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe_timer(name, time.perf_counter() - start)
+
+
+def _worker_file(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"metrics-{pid}.json")
+
+
+def flush_to_directory(directory: Optional[str] = None) -> None:
+    """Write this worker's numbers where the other workers can read them"""
+    directory = directory or settings.METRICS_MULTIPROC_DIR
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    path = _worker_file(directory, os.getpid())
+    tmp = path + ".tmp"
+    metrics.collect_caches()
+    with open(tmp, "w") as f:
+        json.dump(metrics.snapshot(), f)
+    os.replace(tmp, path)                           # Atomic: readers never see half a file
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def render_metrics() -> str:
+    """
+    Prometheus text for this worker, or for all workers in multi-process mode
+
+    Counters from workers that have exited are kept (so totals never go
+    backwards); their in-flight gauge is ignored.
+    """
+    directory = settings.METRICS_MULTIPROC_DIR
+    if not directory:
+        metrics.collect_caches()
+        return metrics.render()
+
+    flush_to_directory(directory)
+    combined = MetricsRegistry()
+    for name in os.listdir(directory):
+        if not (name.startswith("metrics-") and name.endswith(".json")):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue                                # Being replaced right now
+        combined.merge(data, include_gauges=_pid_alive(data["pid"]))
+    return combined.render()
+
+
+# ==============================================================================
+# MIDDLEWARE - Times every HTTP request
+# ==============================================================================
+
+class MetricsMiddleware:
+    """
+    Records latency, status and response size for every HTTP request
+
+    Requests are labelled by route template (/standings/{driver_id}), not
+    the raw URL, so label counts stay bounded. Responses served before
+    routing are labelled by path only if it is one of a fixed set
+    (`cached_path`, e.g. ResponseCache.is_registered - cache hits never
+    reach the router) and as "unmatched" otherwise, so random URLs can't
+    create new series, whatever their status. Likewise unknown methods
+    are labelled "other".
+    """
+
+    def __init__(self, app, cached_path: Optional[Callable[[str], bool]] = None):
+        self.app = app
+        self.cached_path = cached_path or (lambda path: False)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        size = 0
+
+        async def measure(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, measure)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.in_flight -= 1
+            route = scope.get("route")
+            if route is not None:
+                label = route.path
+            elif status in (200, 304) and self.cached_path(scope["path"]):
+                label = scope["path"]
+            else:
+                label = "unmatched"
+            method = scope["method"] if scope["method"] in KNOWN_METHODS else "other"
+            metrics.record_request(method, label, status, elapsed, size)
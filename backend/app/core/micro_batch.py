@@ -0,0 +1,85 @@
+# ==============================================================================
+# MICRO-BATCHING - Group a stream of small writes into few bigger ones
+# ==============================================================================
+# Live timing sends one result every few seconds per heat. Writing each one
+# on its own would mean a transaction plus a standings update per result;
+# grouping them costs at most `interval` of extra latency and turns N
+# updates into one.
+#
+# How it works:
+# - The producer (e.g. a WebSocket reader) calls put() per item
+# - The consumer iterates batches(): a batch is handed out as soon as
+#   `max_items` are waiting, or `interval` seconds after its first item
+# - While the consumer is busy, items keep queuing - up to `max_pending`.
+#   Beyond that put() waits, the reader stops reading the socket and TCP
+#   flow control slows the sender down (backpressure) instead of this
+#   process buffering without limit
+# ==============================================================================
+
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Deque, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class MicroBatcher(Generic[T]):
+    """Bounded buffer between one producer and one consumer, read in batches"""
+
+    def __init__(self, max_items: int, interval: float, max_pending: int):
+        self.max_items = max_items
+        self.interval = interval
+        self.max_pending = max(max_pending, max_items)
+        self._items: Deque[T] = deque()
+        self._arrived = asyncio.Event()     # Set when an item (or close) arrives
+        self._drained = asyncio.Event()     # Set when the consumer takes a batch
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def put(self, item: T) -> None:
+        """Queue one item, waiting while `max_pending` are already queued"""
+        while len(self._items) >= self.max_pending:
+            self._drained.clear()
+            await self._drained.wait()
+        self._items.append(item)
+        self._arrived.set()
+
+    def close(self) -> None:
+        """No more items: batches() ends once everything queued was handed out"""
+        self._closed = True
+        self._arrived.set()
+
+    async def _wait_for_item(self, timeout: Optional[float] = None) -> None:
+        self._arrived.clear()
+        if timeout is None:
+            await self._arrived.wait()
+        else:
+            # Only waits on the event - nothing is lost if the timeout wins
+            await asyncio.wait_for(self._arrived.wait(), timeout)
+
+    async def batches(self) -> AsyncIterator[List[T]]:
+        """Yield lists of at most `max_items`, oldest first"""
+        loop = asyncio.get_running_loop()
+        items = self._items
+        while True:
+            while not items and not self._closed:
+                await self._wait_for_item()
+            if not items:
+                return                          # Closed and drained
+
+            # Give the batch up to `interval` (from its first item) to fill
+            deadline = loop.time() + self.interval
+            while len(items) < self.max_items and not self._closed:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    await self._wait_for_item(remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [items.popleft() for _ in range(min(self.max_items, len(items)))]
+            self._drained.set()
+            yield batch
@@ -0,0 +1,151 @@
+# ==============================================================================
+# RATE LIMIT - Per-client token buckets, in process
+# ==============================================================================
+# Stops one client (a runaway polling loop, a scraper) from using up the
+# server for everyone else. Each client gets a "bucket" of tokens:
+#
+# - The bucket holds at most RATE_LIMIT_BURST tokens and starts full
+# - It refills continuously at RATE_LIMIT_PER_MINUTE tokens per minute
+# - Every request takes one token; with none left the client gets a
+#   429 Too Many Requests and a Retry-After header saying when to retry
+#
+# So a client can burst briefly (page load: standings + events + driver)
+# but can't keep up more than the per-minute rate.
+#
+# Clients are told apart by IP address. Behind nginx/Traefik the
+# connection comes from the proxy, so set one of:
+#
+# - FORWARDED_ALLOW_IPS: the proxy's address(es). app.serve passes it to
+#   uvicorn, which then takes the client address from X-Forwarded-For -
+#   but only for connections from those addresses (default: 127.0.0.1)
+# - RATE_LIMIT_CLIENT_HEADER: a header the proxy sets (e.g. X-Real-IP),
+#   used as the client key as-is
+#
+# Without either, every user behind the proxy shares one bucket - which is
+# why the limiter is off (RATE_LIMIT_PER_MINUTE=0) by default.
+#
+# The buckets live in this process only. With several workers each one
+# limits independently, which still caps a client at workers × the rate.
+# ==============================================================================
+
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Sequence, Tuple
+
+
+# ==============================================================================
+# TOKEN BUCKETS
+# ==============================================================================
+
+class TokenBucketLimiter:
+    """
+    One token bucket per client key
+
+    Args:
+        rate_per_minute: tokens added to each bucket per minute
+        burst:           bucket size (requests allowed back to back)
+        max_clients:     buckets kept; the least recently seen client is
+                         forgotten first (it simply starts full again)
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        burst: int,
+        max_clients: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate_per_minute / 60.0          # Tokens per second
+        self.burst = float(max(burst, 1))
+        self.max_clients = max_clients
+        self.clock = clock
+        # client → (tokens left, time they were counted)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def acquire(self, client: str) -> float:
+        """
+        Take one token for `client`
+
+        Returns 0.0 if the request may go ahead, otherwise the seconds until
+        a token will be available.
+        """
+        now = self.clock()
+        tokens, stamp = self._buckets.pop(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - stamp) * self.rate)
+
+        if tokens >= 1.0:
+            wait, tokens = 0.0, tokens - 1.0
+        else:
+            wait = (1.0 - tokens) / self.rate if self.rate > 0 else math.inf
+
+        self._buckets[client] = (tokens, now)        # Re-insert = most recent
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+# ==============================================================================
+# MIDDLEWARE - Answers 429 before the request reaches anything else
+# ==============================================================================
+
+class RateLimitMiddleware:
+    """
+    Applies a TokenBucketLimiter to every HTTP request
+
+    Paths in `exempt_paths` (and anything below them, e.g. /health/...)
+    are never limited, so monitoring keeps working under load.
+    """
+
+    def __init__(
+        self,
+        app,
+        limiter: TokenBucketLimiter,
+        exempt_paths: Sequence[str] = (),
+        client_header: str = "",
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.exempt_paths = tuple(exempt_paths)
+        # ASGI header names are lowercase bytes
+        self.client_header = client_header.lower().encode("latin-1")
+
+    def _exempt(self, path: str) -> bool:
+        return any(path == p or path.startswith(p.rstrip("/") + "/") for p in self.exempt_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._exempt(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        wait = self.limiter.acquire(_client_key(scope, self.client_header))
+        if wait == 0.0:
+            await self.app(scope, receive, send)
+            return
+
+        body = b'{"detail":"Too many requests"}'
+        retry_after = str(math.ceil(wait)) if math.isfinite(wait) else "3600"
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", retry_after.encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def _client_key(scope: dict, header: bytes = b"") -> str:
+    if header:
+        for name, value in scope["headers"]:
+            if name == header:
+                # Entries before the last one came from the client and can
+                # be made up; the last was added by our own proxy
+                return value.decode("latin-1").rsplit(",", 1)[-1].strip() or "unknown"
+    client: Optional[Tuple[str, int]] = scope.get("client")
+    return client[0] if client else "unknown"
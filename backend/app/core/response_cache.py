@@ -0,0 +1,363 @@
+# ==============================================================================
+# RESPONSE CACHE - Pre-encoded JSON bodies with ETag / If-None-Match support
+# ==============================================================================
+# Hot read endpoints like /standings/ and /events/ return the same data to
+# thousands of polling clients until a result is posted. Instead of building,
+# validating and JSON-encoding the same payload every time, this middleware:
+#
+# 1. Runs the route ONCE per data version and keeps the encoded bytes
+# 2. Tags them with an ETag (a hash of the bytes)
+# 3. Serves the stored bytes to everyone else, or a bodyless 304 when the
+#    client already has them (sent If-None-Match with the same ETag)
+#
+# Entries are keyed by (path, query string) and remember the data version
+# they were built from. When the version changes, the next request rebuilds.
+#
+# Clients that accept gzip/brotli get a compressed copy of the body. It is
+# made the first time someone asks for that encoding and kept with the entry,
+# so each representation is compressed once per data version, not per request
+# (see app/core/compression.py).
+#
+# Tiers (app/core/cache.py): entries live in a per-worker LRU bounded by
+# RESPONSE_CACHE_MAX_ENTRIES / _MAX_BYTES (compressed copies included) and
+# RESPONSE_CACHE_TTL. With RESPONSE_CACHE_SHARED_PATH set, bodies are also
+# kept in a cache shared by all workers, so a payload one worker built is
+# reused by the others instead of rebuilt. Per-worker data versions mean
+# nothing to another process, so shared keys use the database data_version
+# the stores were computed from (state_label_fn; None = don't share).
+#
+# Single flight: when a result lands, hundreds of clients miss the cache in
+# the same instant. Only the first of them runs the route; the others wait
+# for that one build and are answered from it, so the payload is built and
+# encoded once, not once per waiting client.
+# ==============================================================================
+
+import asyncio
+import hashlib                                     # Content hash for ETags
+import json
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.core.cache import LRUCache, SharedCache
+from app.core.compression import Compressor
+
+
+# ==============================================================================
+# CACHE ENTRY - One encoded response for one data version
+# ==============================================================================
+
+class CachedResponse:
+    """Encoded body plus the headers needed to replay it"""
+
+    __slots__ = ("version", "body", "etag", "headers", "variants")
+
+    def __init__(self, version: Hashable, body: bytes, headers: List[Tuple[bytes, bytes]]):
+        self.version = version
+        self.body = body
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self.headers = headers
+        self.variants: Dict[str, bytes] = {}       # encoding → compressed body
+
+    async def representation(
+        self, encoding: Optional[str], compressor: Optional[Compressor],
+    ) -> Tuple[bytes, str]:
+        """(body, etag) for an encoding (None = uncompressed), compressing once"""
+        if encoding is None:
+            return self.body, self.etag
+        compressed = self.variants.get(encoding)
+        if compressed is None:
+            compressed = await compressor.compress_async(self.body, encoding)
+            self.variants[encoding] = compressed
+        return compressed, self.etag[:-1] + "-" + encoding + '"'
+
+    def size(self) -> int:
+        """Bytes held, compressed copies included (what the LRU is bounded by)"""
+        return (len(self.body) + sum(len(v) for v in self.variants.values())
+                + sum(len(k) + len(v) for k, v in self.headers) + 200)
+
+    def encode(self) -> bytes:
+        """Headers + body as bytes for the shared tier (compressed copies stay local)"""
+        headers = json.dumps([[k.decode("latin-1"), v.decode("latin-1")] for k, v in self.headers])
+        encoded = headers.encode("latin-1")
+        return len(encoded).to_bytes(4, "little") + encoded + self.body
+
+    @classmethod
+    def decode(cls, version: Hashable, data: bytes) -> "CachedResponse":
+        length = int.from_bytes(data[:4], "little")
+        headers = [
+            (k.encode("latin-1"), v.encode("latin-1"))
+            for k, v in json.loads(data[4:4 + length].decode("latin-1"))
+        ]
+        return cls(version, data[4 + length:], headers)
+
+
+# ==============================================================================
+# RESPONSE CACHE - Registered resources and their cached bodies
+# ==============================================================================
+
+class ResponseCache:
+    """
+    Versioned store of encoded responses
+
+    register(path, version_fn) marks a GET path as cacheable. version_fn()
+    must be cheap (it runs on every request) and return a value that
+    changes whenever the data behind that path changes. Entries are keyed
+    by (path, query string, version), so a new version simply misses and
+    the old entries age out of the LRU.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 0.0,
+        shared: Optional[SharedCache] = None,
+        state_label_fn: Optional[Callable[[], Optional[str]]] = None,
+    ):
+        self._resources: Dict[str, Callable[[], Hashable]] = {}
+        self.memory: LRUCache = LRUCache(max_entries, max_bytes, ttl, size_of=CachedResponse.size)
+        self.shared = shared
+        self._state_label_fn = state_label_fn
+        # path → (local version, state label it was first seen under)
+        self._labels: Dict[str, Tuple[Hashable, Optional[str]]] = {}
+
+    def register(self, path: str, version_fn: Callable[[], Hashable]) -> None:
+        """Cache GET responses for `path`, invalidated by `version_fn()`"""
+        self._resources[path] = version_fn
+
+    def is_registered(self, path: str) -> bool:
+        """True if GET responses for `path` are cached"""
+        return path in self._resources
+
+    def version_for(self, path: str) -> Optional[Hashable]:
+        """Current data version for a registered path (None = not cacheable)"""
+        version_fn = self._resources.get(path)
+        return version_fn() if version_fn else None
+
+    def get(self, key: Tuple[str, bytes], version: Hashable) -> Optional[CachedResponse]:
+        """Cached response for key, only if it was built from `version`"""
+        return self.memory.get((key, version))
+
+    def put(self, key: Tuple[str, bytes], entry: CachedResponse) -> None:
+        """Store an entry, dropping least recently used ones past the bounds"""
+        self.memory.put((key, entry.version), entry)
+
+    def resized(self, key: Tuple[str, bytes], entry: CachedResponse) -> None:
+        """An entry gained a compressed copy - count it against the byte bound"""
+        self.memory.resize((key, entry.version))
+
+    # ------------------------------------------------------------------
+    # SHARED TIER
+    # ------------------------------------------------------------------
+
+    def shared_key(self, key: Tuple[str, bytes], version: Hashable) -> Optional[str]:
+        """
+        Key naming this response in the shared tier, or None to skip it
+
+        A path's data last changed no later than the first time this
+        worker saw its current version, so the state label taken then
+        names the same bytes in every process.
+        """
+        if self.shared is None or self._state_label_fn is None:
+            return None
+        path = key[0]
+        label = self._labels.get(path)
+        if label is None or label[0] != version:
+            label = self._labels[path] = (version, self._state_label_fn())
+        if label[1] is None:
+            return None
+        return f"{label[1]}|{path}?{key[1].decode('latin-1')}"
+
+    async def get_shared(self, shared_key: str, version: Hashable) -> Optional[CachedResponse]:
+        data = await self.shared.get(shared_key)
+        return None if data is None else CachedResponse.decode(version, data)
+
+    async def put_shared(self, shared_key: str, entry: CachedResponse) -> None:
+        await self.shared.put(shared_key, entry.encode())
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Counters per tier, plus current size of the in-process tier"""
+        tiers = {"memory": {
+            **self.memory.stats.as_dict(), "entries": len(self.memory), "bytes": self.memory.bytes,
+        }}
+        if self.shared is not None:
+            tiers["shared"] = self.shared.stats.as_dict()
+        return tiers
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self._labels.clear()
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+def _etag_matches(if_none_match: Optional[bytes], etag: str) -> bool:
+    """True if the If-None-Match header lists this ETag (or is *)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.decode("latin-1").split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag or candidate == "*":
+            return True
+    return False
+
+
+def _header(scope: dict, name: bytes) -> Optional[bytes]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+# ==============================================================================
+# MIDDLEWARE - Serves cached bodies before the route function ever runs
+# ==============================================================================
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware in front of the API
+
+    Only GET requests to registered paths are touched; everything
+    else passes straight through. With a `compressor`, clients that accept
+    gzip/brotli get the entry's precompressed body.
+    """
+
+    def __init__(self, app, cache: ResponseCache, compressor: Optional[Compressor] = None):
+        self.app = app
+        self.cache = cache
+        self.compressor = compressor
+        # (key, version) → the build in progress; resolves to its entry,
+        # or to None if the route didn't return a cacheable 200
+        self._inflight: Dict[Tuple[Tuple[str, bytes], Hashable], "asyncio.Future"] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        version = self.cache.version_for(path)
+        if version is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = (path, scope.get("query_string", b""))
+        if_none_match = _header(scope, b"if-none-match")
+        encoding = (
+            self.compressor.negotiate(_header(scope, b"accept-encoding"))
+            if self.compressor is not None else None
+        )
+
+        # ------------------------------------------------------------------
+        # HIT - Reply from the cache, the route function is never called
+        # ------------------------------------------------------------------
+        entry = self.cache.get(key, version)
+        if entry is not None:
+            await self._send_entry(send, key, entry, if_none_match, encoding)
+            return
+
+        # ------------------------------------------------------------------
+        # MISS, ALREADY BEING BUILT - Wait for that build instead of our own
+        # ------------------------------------------------------------------
+        flight = (key, version)
+        pending = self._inflight.get(flight)
+        if pending is not None:
+            # shield: one waiter disconnecting must not cancel the build
+            entry = await asyncio.shield(pending)
+            if entry is not None:
+                await self._send_entry(send, key, entry, if_none_match, encoding)
+                return
+            # The build wasn't cacheable (e.g. an error) - run our own below
+
+        # ------------------------------------------------------------------
+        # MISS - Run the route once, capture the encoded body, store it
+        # ------------------------------------------------------------------
+        leader = flight not in self._inflight
+        if leader:
+            self._inflight[flight] = asyncio.get_running_loop().create_future()
+        shared_key = self.cache.shared_key(key, version) if leader else None
+        start_message = None
+        passthrough = False
+        chunks = []
+
+        async def capture(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                passthrough = message["status"] != 200
+                if passthrough:
+                    # Errors are never cached - forward as-is
+                    await send(message)
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            headers = [
+                (k, v) for k, v in start_message["headers"]
+                if k not in (b"content-length", b"etag", b"cache-control")
+            ]
+            entry = CachedResponse(version, b"".join(chunks), headers)
+            self.cache.put(key, entry)
+            if leader:
+                self._finish_flight(flight, entry)  # Release waiters first
+            await self._send_entry(send, key, entry, if_none_match, encoding)
+            if shared_key is not None:
+                await self.cache.put_shared(shared_key, entry)  # After the client has it
+
+        try:
+            # ------------------------------------------------------------------
+            # SHARED TIER - Another worker may have built this already
+            # ------------------------------------------------------------------
+            if shared_key is not None:
+                entry = await self.cache.get_shared(shared_key, version)
+                if entry is not None:
+                    self.cache.put(key, entry)
+                    self._finish_flight(flight, entry)
+                    await self._send_entry(send, key, entry, if_none_match, encoding)
+                    return
+            await self.app(scope, receive, capture)
+        finally:
+            if leader:
+                self._finish_flight(flight, None)   # No-op if already released
+
+    def _finish_flight(self, flight, entry: Optional[CachedResponse]) -> None:
+        future = self._inflight.pop(flight, None)
+        if future is not None and not future.done():
+            future.set_result(entry)
+
+    async def _send_entry(
+        self, send, key, entry: CachedResponse, if_none_match, encoding: Optional[str],
+    ) -> None:
+        if encoding is not None and len(entry.body) < self.compressor.minimum_size:
+            encoding = None                         # Too small to be worth it
+        grew = encoding is not None and encoding not in entry.variants
+        body, etag = await entry.representation(encoding, self.compressor)
+        if grew:
+            self.cache.resized(key, entry)          # Compressed copy counts too
+
+        validators = [
+            (b"etag", etag.encode("latin-1")),
+            (b"cache-control", b"no-cache"),        # Always revalidate, cheaply
+        ]
+        if self.compressor is not None:
+            validators.append((b"vary", b"Accept-Encoding"))
+        if _etag_matches(if_none_match, etag):
+            await send({"type": "http.response.start", "status": 304, "headers": validators})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        headers = entry.headers + validators + [
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ]
+        if encoding is not None:
+            headers.append((b"content-encoding", encoding.encode("latin-1")))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,102 @@
+# ==============================================================================
+# RESPONSES - Fast JSON response classes
+# ==============================================================================
+# By default FastAPI turns whatever a route returns into JSON in two steps:
+#   1. jsonable_encoder() walks the whole payload, copying it into "safe" types
+#   2. json.dumps() from the standard library encodes the copy
+#
+# For a big standings table step 1 alone costs more than the handler. Our data
+# is already plain dicts/lists/ints/strings, so routes can skip it by returning
+# json_response(...) - a ready-made Response that FastAPI sends untouched.
+#
+# The encoder itself is picked by settings.JSON_RESPONSE_CLASS:
+# - "orjson": Rust-backed encoder, several times faster (needs `orjson`)
+# - "stdlib": the built-in json module, always available
+# If orjson is requested but not installed we fall back to stdlib.
+# ==============================================================================
+
+import json                                        # Standard library encoder
+import logging
+from typing import Any, Dict, Optional, Type
+
+from fastapi.responses import JSONResponse         # Base class we extend
+
+from app.core.config import settings
+from app.core.metrics import timer                 # Optional serialization timer
+
+try:
+    import orjson                                  # Optional fast encoder
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# RESPONSE CLASSES
+# ==============================================================================
+
+class StdlibJSONResponse(JSONResponse):
+    """Compact stdlib JSON (no spaces), used when orjson isn't available"""
+
+    def render(self, content: Any) -> bytes:
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON encoded with orjson - same output, much less CPU"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+RESPONSE_CLASSES: Dict[str, Type[JSONResponse]] = {
+    "stdlib": StdlibJSONResponse,
+    "orjson": ORJSONResponse,
+}
+
+
+def get_response_class(name: str) -> Type[JSONResponse]:
+    """
+    Look up a response class by its settings name
+
+    Falls back to stdlib (with a warning) if the requested encoder can't
+    be used, so a missing optional package never stops the API starting.
+    """
+    if name not in RESPONSE_CLASSES:
+        raise ValueError(
+            f"Unknown JSON_RESPONSE_CLASS {name!r}, "
+            f"expected one of: {', '.join(RESPONSE_CLASSES)}"
+        )
+    if name == "orjson" and orjson is None:
+        logger.warning("orjson is not installed, falling back to stdlib JSON")
+        return StdlibJSONResponse
+    return RESPONSE_CLASSES[name]
+
+
+# The class used for every API response (see main.py)
+JSONResponseClass = get_response_class(settings.JSON_RESPONSE_CLASS)
+
+
+# ==============================================================================
+# HELPER - Return pre-typed data without jsonable_encoder
+# ==============================================================================
+
+def json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> JSONResponse:
+    """
+    Encode `content` straight to a response
+
+    Only use this for payloads that are already JSON-native (dict, list,
+    str, int, float, bool, None) - nothing is converted for you.
+    """
+    with timer("serialization"):
+        return JSONResponseClass(content, status_code=status_code, headers=headers)
@@ -0,0 +1,464 @@
+# ==============================================================================
+# SNAPSHOT - Compact binary standings/events snapshot shared between workers
+# ==============================================================================
+# In production several uvicorn worker processes serve requests. Rather than
+# each worker loading and recomputing everything from the database, ONE writer
+# process (see app/serve.py) does the work and publishes the result as a
+# compact binary file in shared memory (/dev/shm). Workers memory-map it
+# read-only and DECODE it into their own in-memory stores (standings,
+# partitions, events, driver history, search index):
+#
+#   - the mapped file itself is shared (one copy in RAM for all workers)
+#   - the decoded stores are NOT - each worker holds its own copy, several
+#     times the snapshot's size (e.g. a 5 MiB snapshot of 80,000 results
+#     becomes ~32 MiB of stores per worker)
+#
+# Workers don't serve reads straight from the mapped bytes because their
+# stores aren't read-only: a worker applies its own uploads and live
+# results at once (see app/models/results.py) and keeps serving them until
+# the writer's next snapshot catches up.
+#
+# Files in the snapshot directory:
+#   control                   16 bytes: the current snapshot version number
+#   snapshot-<version>.bin    one immutable snapshot per version
+#
+# The writer writes a new snapshot file, then bumps the number in `control`.
+# Workers keep `control` mapped and compare one integer per request (and
+# every SNAPSHOT_WATCH_INTERVAL while idle) - no syscalls, no IPC. Only
+# when the number changes do they map the new file, build fresh in-memory
+# stores from it in a thread and swap them in.
+#
+# The same format is also saved to disk for warm starts (see
+# app/models/repository.py): write_snapshot_file() / read_snapshot_file().
+#
+# Snapshot file layout (little-endian):
+#   header   magic, version, created_at, counts, string table offset/length,
+#            CRC32 of everything after the header, the database data_version
+#            the contents reflect, and a fingerprint of the settings they
+#            were computed with (e.g. the scoring table)
+#   events   fixed-size records: id + (offset, length) of name/date/series
+#   drivers  fixed-size records: id, points, wins, seconds, tiebreak +
+#            (offset, length) of name
+#   partitions  per series/class table: a record with the (series, class)
+#            key and its driver count, followed by that many driver records
+#   results  fixed-size records: event id, driver id, position, points +
+#            (offset, length) of class - what the driver history is built from
+#   strings  all text, UTF-8, back to back
+# ==============================================================================
+
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+from typing import Iterable, List, Optional, Tuple
+
+MAGIC = b"RSSNAP07"
+
+HEADER = struct.Struct("<8sQdIIQQIIIQI")   # magic, version, created_at, n_events,
+                                           # n_drivers, strings_offset, strings_len, crc32,
+                                           # n_partitions, n_results, data_version,
+                                           # fingerprint
+EVENT = struct.Struct("<qIIIIII")          # id, name off/len, date off/len, series off/len
+DRIVER = struct.Struct("<qqIIIII")         # id, points, wins, seconds, tiebreak,
+                                           # name off/len
+PARTITION = struct.Struct("<IIIIII")       # series off/len, class off/len,
+                                           # flags (1 = has series, 2 = has class), n_drivers
+RESULT = struct.Struct("<qqqIII")          # event_id, driver_id, points, position,
+                                           # class off/len
+CONTROL = struct.Struct("<Q8x")            # current version (+ padding)
+
+# (driver_id, name, points, wins, seconds, tiebreak) - StandingsEngine.rows()
+DriverRow = Tuple[int, str, int, int, int, int]
+# ((series, class), rows) - None in the key means "all"
+PartitionRows = Tuple[Tuple[Optional[str], Optional[str]], Iterable[DriverRow]]
+# (event_id, driver_id, class, position, points) - DriverHistory.rows()
+ResultRow = Tuple[int, int, str, int, int]
+# What decode_snapshot returns: (header, events, drivers, partitions, results)
+Decoded = Tuple[dict, List[dict], List[DriverRow], List[PartitionRows], List[ResultRow]]
+
+logger = logging.getLogger(__name__)
+
+CONTROL_FILE = "control"
+KEEP_FILES = 3                             # Old snapshots kept for slow readers
+
+
+class SnapshotError(ValueError):
+    """The buffer is not a valid snapshot (bad magic, truncated, bad checksum)"""
+
+
+# ==============================================================================
+# ENCODING / DECODING
+# ==============================================================================
+
+class _StringTable:
+    """Collects text and hands out (offset, length) pairs, reusing repeats"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self._seen = {}
+
+    def add(self, text: str) -> Tuple[int, int]:
+        found = self._seen.get(text)
+        if found is None:
+            raw = text.encode("utf-8")
+            found = self._seen[text] = (len(self.data), len(raw))
+            self.data += raw
+        return found
+
+
+def encode_snapshot(
+    version: int,
+    events: Iterable[dict],
+    drivers: Iterable[DriverRow],
+    partitions: Iterable[PartitionRows] = (),
+    results: Iterable[ResultRow] = (),
+    data_version: int = 0,
+    fingerprint: int = 0,
+) -> bytes:
+    """Pack events, StandingsEngine.rows(), partition rows and results into one buffer"""
+    strings = _StringTable()
+    body = bytearray()
+
+    n_events = 0
+    for e in events:
+        body += EVENT.pack(
+            e["id"], *strings.add(e["name"]), *strings.add(e["date"]),
+            *strings.add(e.get("series", "")),
+        )
+        n_events += 1
+
+    def pack_drivers(rows: Iterable[DriverRow]) -> int:
+        count = 0
+        for driver_id, name, points, wins, seconds, tiebreak in rows:
+            body.extend(DRIVER.pack(driver_id, points, wins, seconds, tiebreak, *strings.add(name)))
+            count += 1
+        return count
+
+    n_drivers = pack_drivers(drivers)
+
+    n_partitions = 0
+    for (series, class_name), rows in partitions:
+        record = len(body)
+        body.extend(bytes(PARTITION.size))          # Filled in once the count is known
+        count = pack_drivers(rows)
+        flags = (series is not None) | ((class_name is not None) << 1)
+        PARTITION.pack_into(
+            body, record, *strings.add(series or ""), *strings.add(class_name or ""), flags, count,
+        )
+        n_partitions += 1
+
+    n_results = 0
+    for event_id, driver_id, class_name, position, points in results:
+        body += RESULT.pack(event_id, driver_id, points, position, *strings.add(class_name))
+        n_results += 1
+
+    strings_offset = HEADER.size + len(body)
+    body += strings.data
+    header = HEADER.pack(
+        MAGIC, version, time.time(), n_events, n_drivers,
+        strings_offset, len(strings.data), zlib.crc32(body), n_partitions, n_results,
+        data_version, fingerprint,
+    )
+    return header + bytes(body)
+
+
+def read_header(buffer) -> dict:
+    if len(buffer) < HEADER.size:
+        raise SnapshotError("Snapshot is truncated")
+    (magic, version, created_at, n_events, n_drivers, s_off, s_len, crc, n_parts, n_results,
+     data_version, fingerprint) = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise SnapshotError("Not a snapshot file")
+    return {
+        "version": version, "created_at": created_at, "n_events": n_events,
+        "n_drivers": n_drivers, "strings_offset": s_off, "strings_len": s_len, "crc32": crc,
+        "n_partitions": n_parts, "n_results": n_results,
+        "data_version": data_version, "fingerprint": fingerprint,
+    }
+
+
+def decode_snapshot(buffer, verify: bool = True) -> Decoded:
+    """
+    Read a snapshot straight out of `buffer` (bytes, mmap or memoryview)
+
+    Records are unpacked in place with struct.unpack_from - nothing is
+    copied out of the buffer except the final Python values.
+    """
+    header = read_header(buffer)
+    with memoryview(buffer) as view:
+        return header, *_decode_records(header, view, verify)
+
+
+def _decode_records(header: dict, view: memoryview, verify: bool):
+    end = header["strings_offset"] + header["strings_len"]
+    if len(view) < end:
+        raise SnapshotError("Snapshot is truncated")
+    if verify and zlib.crc32(view[HEADER.size:end]) != header["crc32"]:
+        raise SnapshotError("Snapshot checksum mismatch")
+
+    base = header["strings_offset"]
+
+    def text(offset: int, length: int) -> str:
+        return str(view[base + offset:base + offset + length], "utf-8")
+
+    events = []
+    position = HEADER.size
+    for _ in range(header["n_events"]):
+        event_id, n_off, n_len, d_off, d_len, s_off, s_len = EVENT.unpack_from(view, position)
+        events.append({
+            "id": event_id, "name": text(n_off, n_len),
+            "date": text(d_off, d_len), "series": text(s_off, s_len),
+        })
+        position += EVENT.size
+
+    def unpack_drivers(count: int) -> List[DriverRow]:
+        nonlocal position
+        rows = []
+        for _ in range(count):
+            driver_id, points, wins, seconds, tiebreak, n_off, n_len = DRIVER.unpack_from(view, position)
+            rows.append((driver_id, text(n_off, n_len), points, wins, seconds, tiebreak))
+            position += DRIVER.size
+        return rows
+
+    drivers = unpack_drivers(header["n_drivers"])
+
+    partitions = []
+    for _ in range(header["n_partitions"]):
+        s_off, s_len, c_off, c_len, flags, count = PARTITION.unpack_from(view, position)
+        position += PARTITION.size
+        key = (text(s_off, s_len) if flags & 1 else None, text(c_off, c_len) if flags & 2 else None)
+        partitions.append((key, unpack_drivers(count)))
+
+    # Results are the bulk of the file: unpack them in one pass, and decode
+    # each class name once (there are only a handful)
+    end = position + header["n_results"] * RESULT.size
+    classes = {}
+    results = []
+    for event_id, driver_id, points, finish, c_off, c_len in RESULT.iter_unpack(view[position:end]):
+        class_name = classes.get((c_off, c_len))
+        if class_name is None:
+            class_name = classes[c_off, c_len] = text(c_off, c_len)
+        results.append((event_id, driver_id, class_name, finish, points))
+
+    return events, drivers, partitions, results
+
+
+# ==============================================================================
+# FILES - Atomic writes, mapped reads
+# ==============================================================================
+
+def write_snapshot_file(path: str, data: bytes, durable: bool = False) -> None:
+    """
+    Replace `path` with `data` so readers only ever see a complete file
+
+    durable=True also fsyncs, so the file survives a power cut - wanted for
+    the on-disk warm start file, pointless for /dev/shm.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_snapshot_file(path: str) -> Optional[Decoded]:
+    """Map and decode a snapshot file (None if it is missing, truncated or corrupt)"""
+    try:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return decode_snapshot(mapped)
+    except (FileNotFoundError, SnapshotError, ValueError):
+        return None                                 # ValueError: empty file can't be mapped
+
+
+# ==============================================================================
+# WRITER - Publishes new snapshot versions (one process only)
+# ==============================================================================
+
+def _snapshot_name(version: int) -> str:
+    return f"snapshot-{version:016d}.bin"
+
+
+class SnapshotWriter:
+    """Writes snapshot files and bumps the shared version counter"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        control = os.path.join(directory, CONTROL_FILE)
+        if not os.path.exists(control):
+            with open(control, "wb") as f:
+                f.write(CONTROL.pack(0))
+        self._control_file = open(control, "r+b")
+        self._control = mmap.mmap(self._control_file.fileno(), CONTROL.size)
+        self.version = CONTROL.unpack_from(self._control)[0]
+
+    def publish(
+        self,
+        events: Iterable[dict],
+        drivers: Iterable[DriverRow],
+        partitions: Iterable[PartitionRows] = (),
+        results: Iterable[ResultRow] = (),
+        data_version: int = 0,
+        fingerprint: int = 0,
+    ) -> int:
+        version = self.version + 1
+        write_snapshot_file(
+            os.path.join(self.directory, _snapshot_name(version)),
+            encode_snapshot(version, events, drivers, partitions, results, data_version, fingerprint),
+        )
+        CONTROL.pack_into(self._control, 0, version)  # One aligned 8-byte store
+        self.version = version
+        self._cleanup()
+        return version
+
+    def _cleanup(self) -> None:
+        files = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith("snapshot-") and name.endswith(".bin")
+        )
+        for name in files[:-KEEP_FILES]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> None:
+        self._control.close()
+        self._control_file.close()
+
+
+# ==============================================================================
+# READER - Used by every worker
+# ==============================================================================
+
+class SnapshotReader:
+    """Maps the control file and the current snapshot read-only"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.loaded_version = -1
+        self.loaded_at: Optional[float] = None
+        self._control: Optional[mmap.mmap] = None
+
+    def _open_control(self) -> bool:
+        path = os.path.join(self.directory, CONTROL_FILE)
+        try:
+            with open(path, "rb") as f:
+                self._control = mmap.mmap(f.fileno(), CONTROL.size, access=mmap.ACCESS_READ)
+            return True
+        except (FileNotFoundError, ValueError):
+            return False
+
+    def current_version(self) -> int:
+        """Latest published version - one read from shared memory"""
+        if self._control is None and not self._open_control():
+            return 0
+        return CONTROL.unpack_from(self._control)[0]
+
+    def has_update(self) -> bool:
+        version = self.current_version()
+        return version != 0 and version != self.loaded_version
+
+    def read_version(self, version: int) -> Optional[Decoded]:
+        """Map and decode one snapshot version (None if it vanished mid-swap)"""
+        return read_snapshot_file(os.path.join(self.directory, _snapshot_name(version)))
+
+    def mark_loaded(self, version: int) -> None:
+        """Record that the stores now hold `version`"""
+        self.loaded_version = version
+        self.loaded_at = time.time()
+
+    def read(self) -> Optional[Decoded]:
+        """Map and decode the current snapshot, counting it as loaded"""
+        version = self.current_version()
+        decoded = self.read_version(version)
+        if decoded is not None:
+            self.mark_loaded(version)
+        return decoded
+
+    async def wait_ready(self, timeout: float = 30.0) -> None:
+        """Block startup until the writer has published something"""
+        deadline = time.monotonic() + timeout
+        while self.current_version() == 0:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"No snapshot appeared in {self.directory}")
+            await asyncio.sleep(0.05)
+
+
+# ==============================================================================
+# REFRESHER - Swaps in new snapshots without holding up requests
+# ==============================================================================
+
+class SnapshotRefresher:
+    """
+    Builds fresh stores from a newer snapshot in a thread, then swaps them in
+
+    poke() is a single integer read from the mapped control file, so it is
+    called before every request (SnapshotRefreshMiddleware) and every
+    `interval` seconds by watch(). When the version changed, one refresh
+    task starts (never two): the file is decoded and turned into fresh
+    stores by `prepare` in a worker thread, then `install` swaps them in on
+    the event loop. Requests keep being answered from the current stores
+    until then - decoding 90k results takes about half a second, and no
+    request waits for it.
+    """
+
+    def __init__(self, reader: SnapshotReader, prepare, install):
+        self.reader = reader
+        self.prepare = prepare                      # decoded snapshot → new stores (any thread)
+        self.install = install                      # new stores → live (event loop, fast)
+        self._refresh: Optional[asyncio.Task] = None
+
+    def poke(self) -> None:
+        """Start a refresh if a newer snapshot is published and none is running"""
+        if self._refresh is None and self.reader.has_update():
+            self._refresh = asyncio.create_task(self._refresh_stores())
+
+    async def watch(self, interval: float) -> None:
+        """Poke forever, so idle workers are up to date before the next request"""
+        while True:
+            await asyncio.sleep(interval)
+            self.poke()
+
+    def _read_and_prepare(self, version: int):
+        decoded = self.reader.read_version(version)
+        return None if decoded is None else self.prepare(decoded)
+
+    async def _refresh_stores(self) -> None:
+        reader = self.reader
+        try:
+            # Versions published while we were building are picked up here
+            while reader.has_update():
+                version = reader.current_version()
+                prepared = await asyncio.to_thread(self._read_and_prepare, version)
+                if prepared is None:
+                    break                           # File vanished mid-swap; the next poke retries
+                self.install(prepared)
+                reader.mark_loaded(version)         # Only now: the stores really hold it
+        except Exception:
+            logger.exception("Could not apply snapshot %s", reader.current_version())
+        finally:
+            self._refresh = None
+
+
+# ==============================================================================
+# MIDDLEWARE - Notices new snapshots between requests
+# ==============================================================================
+
+class SnapshotRefreshMiddleware:
+    """Before each request, start swapping in the newest snapshot if there is one"""
+
+    def __init__(self, app, refresher: SnapshotRefresher):
+        self.app = app
+        self.refresher = refresher
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self.refresher.poke()
+        await self.app(scope, receive, send)
@@ -2,10 +2,141 @@
 # IMPORTS - Bring in the tools we need
 # ==============================================================================
 
-from fastapi import FastAPI                        # Main FastAPI class
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager         # For the app lifespan
+from typing import Optional
+from fastapi import FastAPI, Response              # Main FastAPI class
 from fastapi.middleware.cors import CORSMiddleware # Allow frontend to call API
+from fastapi.responses import PlainTextResponse    # For /metrics
+from app.core.cache import SQLiteSharedCache        # Response cache tier 2
+from app.core.compression import CompressionMiddleware, Compressor
 from app.core.config import settings               # Configuration settings
-from app.api.routes import api_router              # All our API routes
+from app.core.database import DatabaseBusyError, get_database  # Pooled async database
+from app.core.health import HealthMonitor          # /health/live, /health/ready
+from app.core.metrics import (
+    MetricsMiddleware, flush_to_directory, register_cache, render_metrics,
+)
+from app.core.rate_limit import RateLimitMiddleware, TokenBucketLimiter
+from app.api.routes import include_api_routes      # All our API routes
+from app.core.response_cache import ResponseCache, ResponseCacheMiddleware
+from app.core.responses import JSONResponseClass, json_response  # Fast JSON encoder
+from app.core.snapshot import SnapshotReader, SnapshotRefresher, SnapshotRefreshMiddleware
+from app.models.events import get_event_store      # Indexed event snapshot
+from app.models.standings import get_standings_engine, get_standings_partitions
+from app.models.repository import (
+    apply_snapshot, build_stores, data_version, install_stores, load_from_database,
+    save_snapshot, state_changed_at, state_fingerprint, state_version, warm_start,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# LIFESPAN - Startup and shutdown logic
+# ==============================================================================
+# Everything before `yield` runs once when the server starts, everything after
+# it runs once when the server stops.
+
+# In multi-worker mode (SHARED_SNAPSHOT_DIR set by app/serve.py) every worker
+# reads standings/events from the writer's shared snapshot
+snapshot_reader = (
+    SnapshotReader(settings.SHARED_SNAPSHOT_DIR) if settings.SHARED_SNAPSHOT_DIR else None
+)
+snapshot_refresher = (
+    SnapshotRefresher(snapshot_reader, prepare=build_stores, install=install_stores)
+    if snapshot_reader is not None else None
+)
+
+# Loop lag ticker + database pinger behind the health probes (see below)
+health = HealthMonitor(
+    get_database(),
+    tick_interval=settings.HEALTH_TICK_INTERVAL,
+    window=settings.HEALTH_LAG_WINDOW,
+    ping_interval=settings.HEALTH_DB_PING_INTERVAL,
+    max_loop_lag=settings.HEALTH_MAX_LOOP_LAG,
+    max_in_flight=settings.HEALTH_MAX_IN_FLIGHT,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # STARTUP: open the connection pool and load data into memory once,
+    # so requests never open their own connections
+    database = get_database()
+    await database.connect()
+    if snapshot_reader is not None:
+        # Multi-worker mode: the writer process (app/serve.py) already did
+        # the loading - just map its shared snapshot
+        await snapshot_reader.wait_ready()
+        apply_snapshot(snapshot_reader.read())
+    else:
+        # Single process: start from the snapshot the last run saved,
+        # replaying only uploads made since - or load everything
+        warm = None
+        if settings.WARM_SNAPSHOT_PATH:
+            warm = await warm_start(database, settings.WARM_SNAPSHOT_PATH)
+        if warm is None:
+            await load_from_database(database)
+    
+    # Multi-worker mode: pick up the writer's new snapshots even while idle
+    watcher = None
+    if snapshot_refresher is not None:
+        watcher = asyncio.create_task(snapshot_refresher.watch(settings.SNAPSHOT_WATCH_INTERVAL))
+    
+    # ...and keep that snapshot fresh for the next start
+    saver = None
+    if snapshot_reader is None and settings.WARM_SNAPSHOT_PATH:
+        saver = asyncio.create_task(_save_snapshot_forever(database))
+    
+    # With several workers, each one periodically writes its metrics to
+    # METRICS_MULTIPROC_DIR so /metrics can add them all up
+    flusher = None
+    if settings.METRICS_MULTIPROC_DIR:
+        flusher = asyncio.create_task(_flush_metrics_forever())
+    
+    # Data is loaded: start measuring, and let /health/ready say so
+    health.start()
+    health.ready = True
+    
+    yield
+    
+    # SHUTDOWN: stop background work, close pooled connections cleanly
+    health.ready = False
+    await health.stop()
+    if watcher is not None:
+        watcher.cancel()
+    if flusher is not None:
+        flusher.cancel()
+        flush_to_directory()
+    if saver is not None:
+        saver.cancel()
+        try:
+            await save_snapshot(database, settings.WARM_SNAPSHOT_PATH)
+        except Exception:
+            logger.exception("Could not save the warm start snapshot")
+    if shared_cache is not None:
+        shared_cache.close()
+    await database.disconnect()
+
+
+async def _flush_metrics_forever():
+    while True:
+        await asyncio.sleep(settings.METRICS_FLUSH_INTERVAL)
+        flush_to_directory()
+
+
+async def _save_snapshot_forever(database):
+    saved = None                                   # Data version last written
+    while True:
+        try:
+            if await data_version(database) != saved:
+                saved = await save_snapshot(database, settings.WARM_SNAPSHOT_PATH)
+        except Exception:
+            # A failed save only costs the next start a full load
+            logger.exception("Could not save the warm start snapshot")
+        await asyncio.sleep(settings.WARM_SNAPSHOT_INTERVAL)
 
 
 # ==============================================================================
@@ -15,8 +146,95 @@ from app.api.routes import api_router              # All our API routes
 app = FastAPI(
     title=settings.PROJECT_NAME,           # API name (shows in docs)
     version=settings.VERSION,              # API version
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"  # URL for API schema
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",  # URL for API schema
+    default_response_class=JSONResponseClass,  # orjson or stdlib (see config)
+    lifespan=lifespan,                     # Startup/shutdown (see above)
+)
+
+
+# ==============================================================================
+# RESPONSE CACHE - Serve hot GET endpoints from pre-encoded bytes
+# ==============================================================================
+# Each registered path is rebuilt once per data version and then answered
+# from memory (or with a 304 if the client's ETag is still current).
+# Added BEFORE CORS so CORS wraps it and cached replies still get CORS headers.
+# Cached bodies are also compressed once per version, not once per request.
+# With RESPONSE_CACHE_SHARED_PATH set, workers also share what they built.
+
+compressor = Compressor(
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
+
+def _state_label() -> Optional[str]:
+    """Names the stores' contents the same way in every worker and run"""
+    version = state_version()
+    if version is None:
+        return None
+    return f"{settings.VERSION}:{state_fingerprint():08x}:{version}"
+
+
+shared_cache = (
+    SQLiteSharedCache(
+        settings.RESPONSE_CACHE_SHARED_PATH,
+        max_bytes=settings.RESPONSE_CACHE_SHARED_MAX_BYTES,
+        ttl=settings.RESPONSE_CACHE_TTL,
+    )
+    if settings.RESPONSE_CACHE_SHARED_PATH else None
+)
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl=settings.RESPONSE_CACHE_TTL,
+    shared=shared_cache,
+    state_label_fn=_state_label,
 )
+register_cache("response", response_cache.stats)   # Counters at /metrics
+response_cache.register(
+    f"{settings.API_V1_STR}/standings/",
+    lambda: (get_standings_engine().version, get_standings_partitions().version),
+)
+response_cache.register(
+    f"{settings.API_V1_STR}/standings/batch",
+    lambda: get_standings_engine().version,
+)
+response_cache.register(
+    f"{settings.API_V1_STR}/events/",
+    lambda: get_event_store().version,
+)
+
+app.add_middleware(ResponseCacheMiddleware, cache=response_cache, compressor=compressor)
+
+# Multi-worker mode: notice the writer's newest snapshot before a request
+# reaches the cache (one shared-memory integer read when nothing changed);
+# fresh stores are built and swapped in in the background
+if snapshot_reader is not None:
+    app.add_middleware(SnapshotRefreshMiddleware, refresher=snapshot_refresher)
+
+# Everything the cache doesn't answer is compressed on the fly (cache hits
+# are already compressed and pass straight through)
+app.add_middleware(CompressionMiddleware, compressor=compressor)
+
+
+# ==============================================================================
+# RATE LIMITING - Per-client token buckets (RATE_LIMIT_* settings)
+# ==============================================================================
+# Added after the cache so even cache hits count against a client, and
+# before CORS so browsers can read the 429 (it gets CORS headers too).
+
+if settings.RATE_LIMIT_PER_MINUTE > 0:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=TokenBucketLimiter(
+            rate_per_minute=settings.RATE_LIMIT_PER_MINUTE,
+            burst=settings.RATE_LIMIT_BURST,
+            max_clients=settings.RATE_LIMIT_MAX_CLIENTS,
+        ),
+        exempt_paths=settings.RATE_LIMIT_EXEMPT_PATHS,
+        client_header=settings.RATE_LIMIT_CLIENT_HEADER,
+    )
 
 
 # ==============================================================================
@@ -33,16 +251,40 @@ app.add_middleware(
     allow_headers=["*"],                          # Allow all headers
 )
 
-# STUB: Add more middleware here (authentication, logging, rate limiting, etc.)
+# ==============================================================================
+# METRICS MIDDLEWARE - Latency, status, size and in-flight count per route
+# ==============================================================================
+# Added LAST so it is the outermost layer and times everything, including
+# CORS and response cache hits. Numbers are exposed at GET /metrics.
+# Cache hits skip routing, so they are labelled by their (registered) path.
+
+app.add_middleware(MetricsMiddleware, cached_path=response_cache.is_registered)
+
+# STUB: Add more middleware here (authentication, logging, etc.)
+
+
+# ==============================================================================
+# ERROR HANDLERS - Turn known failures into proper HTTP answers
+# ==============================================================================
+
+@app.exception_handler(DatabaseBusyError)
+async def database_busy(request, exc: DatabaseBusyError):
+    """Locked database, deadlock or no free connection: temporary, so 503"""
+    logger.warning("Database busy on %s %s: %s", request.method, request.url.path, exc)
+    return json_response(
+        {"detail": "Database busy, please retry"},
+        status_code=503,
+        headers={"Retry-After": "1"},
+    )
 
 
 # ==============================================================================
 # INCLUDE ROUTERS - Connect all route files
 # ==============================================================================
 # This is like app.use('/api/v1', router) in Express
-# All routes from api_router will be prefixed with /api/v1
+# All routes from app/api/routes/ will be prefixed with /api/v1
 
-app.include_router(api_router, prefix=settings.API_V1_STR)
+include_api_routes(app, prefix=settings.API_V1_STR)
 
 # STUB: Add more routers here
 # Example: app.include_router(admin_router, prefix="/admin")
@@ -72,7 +314,77 @@ async def health_check():
     Access it at: http://localhost:8000/health
     """
     return {"status": "healthy"}
-    # STUB: Add database connection check, external service checks, etc.
+    # Load, database and data checks: /health/live and /health/ready below
+
+
+def _data_status() -> dict:
+    """Which data the stores hold and how long since it last changed"""
+    changed = state_changed_at()
+    status = {
+        "version": state_version(),                 # None while an update is half-applied
+        "age_seconds": None if changed is None else round(time.time() - changed, 3),
+        "drivers": len(get_standings_engine()),
+    }
+    if snapshot_reader is not None:
+        # Multi-worker mode: a newer published snapshot is built and
+        # swapped in in the background, so "published" ahead of "loaded"
+        # is only momentary
+        status["snapshot"] = {
+            "loaded": snapshot_reader.loaded_version,
+            "published": snapshot_reader.current_version(),
+        }
+    return status
+
+
+@app.get("/health/live")
+async def health_live(response: Response):
+    """
+    Liveness probe - should this worker be restarted?
+    
+    Answers 503 only if the event loop lag ticker has stopped. Also reports
+    the current lag and the requests in flight. Reads numbers kept up to
+    date in the background, so it never waits on anything.
+    
+    Access it at: http://localhost:8000/health/live
+    """
+    report = health.live()
+    if report["status"] != "alive":
+        response.status_code = 503
+    return report
+
+
+@app.get("/health/ready")
+async def health_ready(response: Response):
+    """
+    Readiness probe - should this worker get traffic right now?
+    
+    Answers 503 (with the reasons in "problems") while the data isn't
+    loaded, the database can't be reached, or the worker is overloaded
+    (HEALTH_MAX_LOOP_LAG, HEALTH_MAX_IN_FLIGHT). Also reports pool status,
+    the last database ping, cache counters and the data version and age.
+    
+    Access it at: http://localhost:8000/health/ready
+    """
+    report = health.ready_report(
+        caches={"response": response_cache.stats()},
+        data=_data_status(),
+    )
+    if report["status"] != "ready":
+        response.status_code = 503
+    return report
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Prometheus scrape endpoint - request counts, latency and size histograms
+    
+    Access it at: http://localhost:8000/metrics
+    """
+    return PlainTextResponse(
+        render_metrics(),
+        media_type="text/plain; version=0.0.4",
+    )
 
 
 # ==============================================================================
@@ -84,23 +396,5 @@ async def health_check():
 #     return {"data": "value"}
 #
 # Option 2: Create a new file in app/api/routes/ (recommended for organization)
-# Then import and include it above with app.include_router()
-# ==============================================================================
-
-
-# ==============================================================================
-# STARTUP/SHUTDOWN EVENTS (Optional)
+# Then add it to ROUTE_MODULES in app/api/routes/__init__.py
 # ==============================================================================
-# STUB: Add startup logic here
-# @app.on_event("startup")
-# async def startup_event():
-#     # Connect to database, load cache, etc.
-#     print("API starting up...")
-#
-# STUB: Add shutdown logic here
-# @app.on_event("shutdown")
-# async def shutdown_event():
-#     # Close database connections, cleanup, etc.
-#     print("API shutting down...")
-# ==============================================================================
-
@@ -0,0 +1,10 @@
+# ==============================================================================
+# MODELS - In-memory data stores used by the API routes
+# ==============================================================================
+
+from app.models.events import EventStore, get_event_store, publish_events
+from app.models.history import DriverHistory, get_driver_history
+from app.models.search import SearchIndex, get_search_index
+from app.models.standings import (
+    StandingsEngine, StandingsPartitions, get_standings_engine, get_standings_partitions,
+)
@@ -0,0 +1,229 @@
+# ==============================================================================
+# EVENT STORE - In-memory, indexed collection of race events
+# ==============================================================================
+# This file holds every race event the API knows about, loaded ONCE and
+# indexed so lookups don't have to walk the whole list on every request.
+#
+# Think of it like the index at the back of a book:
+# - by_id:   "event #3 is on page X"       → dict lookup, O(1)
+# - by_date: "2024-09-29 is on page X"     → dict lookup, O(1)
+# - sorted dates: "everything in June"     → binary search, O(log n)
+# - keyset pages: "the 20 events before X" → binary search, O(log n + 20)
+#
+# The store is IMMUTABLE between updates. When events change we build a
+# brand-new EventStore and swap it in, so a request that already grabbed the
+# old store keeps reading a consistent snapshot (copy-on-write).
+# ==============================================================================
+
+import base64                                # Opaque pagination cursors
+from bisect import bisect_left, bisect_right  # Binary search on sorted lists
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# ==============================================================================
+# SEED DATA - Events served until a real data source is wired in
+# ==============================================================================
+# Newest first, same order the frontend has always received them in
+
+SEED_EVENTS = [
+    {"id": 1, "name": "Rallycross #73, points event #6", "date": "2024-11-24"},
+    {"id": 2, "name": "Rallycross #72, points event #5", "date": "2024-11-03"},
+    {"id": 3, "name": "Rallycross #71, points event #4", "date": "2024-09-29"},
+    {"id": 4, "name": "Rallycross #70, points event #3", "date": "2024-06-30"},
+    {"id": 5, "name": "Rallycross #69, points event #2", "date": "2024-06-09"},
+    {"id": 6, "name": "Rallycross #68, points event #1", "date": "2024-02-25"},
+]
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+EVENT_FIELDS = ("id", "name", "date", "series")
+
+
+def series_from_name(name: str) -> str:
+    """'Rallycross #73, points event #6' → 'Rallycross'"""
+    return name.split("#", 1)[0].strip() or name
+
+
+def encode_cursor(key: Tuple[str, int]) -> str:
+    """(date, id) → opaque URL-safe cursor string"""
+    return base64.urlsafe_b64encode(f"{key[0]}|{key[1]}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Inverse of encode_cursor; raises ValueError on anything malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date, event_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return date, int(event_id)
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+class _SortedIndex:
+    """Events sorted ascending by (date, id), with a parallel key list"""
+
+    __slots__ = ("keys", "events")
+
+    def __init__(self, ascending: List[dict]):
+        self.events = ascending
+        self.keys = [(e["date"], e["id"]) for e in ascending]
+
+    def bounds(self, date_from: Optional[str], date_to: Optional[str]) -> Tuple[int, int]:
+        """Slice [lo, hi) of events with date_from <= date <= date_to"""
+        keys = self.keys
+        lo = bisect_left(keys, (date_from,)) if date_from else 0
+        # (date_to, inf) sorts after every (date_to, id), so date_to is included
+        hi = bisect_right(keys, (date_to, float("inf"))) if date_to else len(keys)
+        return lo, hi
+
+
+# ==============================================================================
+# EVENT STORE CLASS
+# ==============================================================================
+
+class EventStore:
+    """
+    Immutable, indexed snapshot of all events
+
+    Everything is computed once in __init__:
+    - events:        tuple of event dicts, newest first
+    - by_id/by_date: hash indexes for O(1) lookups
+    - sorted index:  (date, id) keys for O(log n) range queries and keyset
+                     pagination, plus one sorted index per series
+
+    The event dicts are shared between requests - treat them as read-only.
+    """
+
+    def __init__(self, events: Iterable[dict], version: int = 1):
+        # Sort newest first; ISO dates (YYYY-MM-DD) sort correctly as strings
+        ordered = sorted(
+            (dict(e) for e in events),
+            key=lambda e: (e["date"], e["id"]),
+            reverse=True,
+        )
+        for event in ordered:
+            if not event.get("series"):
+                event["series"] = series_from_name(event["name"])
+
+        self.version = version
+        self.events = tuple(ordered)
+
+        # Hash indexes
+        self.by_id: Dict[int, dict] = {e["id"]: e for e in ordered}
+        self.by_date: Dict[str, dict] = {}
+        for event in ordered:
+            # setdefault keeps the first (highest id) event if two share a date
+            self.by_date.setdefault(event["date"], event)
+
+        # Sorted indexes (ascending) - one for everything, one per series
+        ascending = ordered[::-1]
+        self._all = _SortedIndex(ascending)
+        by_series: Dict[str, List[dict]] = {}
+        for event in ascending:
+            by_series.setdefault(event["series"], []).append(event)
+        self._by_series = {name: _SortedIndex(evts) for name, evts in by_series.items()}
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @property
+    def series(self) -> List[str]:
+        return sorted(self._by_series)
+
+    def get_by_id(self, event_id: int) -> Optional[dict]:
+        """Find an event by id - O(1)"""
+        return self.by_id.get(event_id)
+
+    def get_by_date(self, event_date: str) -> Optional[dict]:
+        """Find an event by ISO date (YYYY-MM-DD) - O(1)"""
+        return self.by_date.get(event_date)
+
+    def get_many_by_date(self, event_dates: Iterable[str]) -> List[Optional[dict]]:
+        """get_by_date() for several dates - O(1) each, None where unknown"""
+        by_date = self.by_date
+        return [by_date.get(event_date) for event_date in event_dates]
+
+    def in_range(
+        self,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Events with date_from <= date <= date_to, oldest first
+
+        Uses binary search on the sorted date index: O(log n + matches)
+        """
+        lo, hi = self._all.bounds(date_from, date_to)
+        return self._all.events[lo:hi]
+
+    def page(
+        self,
+        limit: int,
+        after: Optional[Tuple[str, int]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        series: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[Tuple[str, int]]]:
+        """
+        One page of events, newest first (keyset pagination)
+
+        Args:
+            limit: max events to return
+            after: (date, id) of the last event on the previous page
+            date_from/date_to: inclusive ISO date bounds
+            series: only events from this series
+
+        Returns:
+            (events, next_key) - next_key is None on the last page
+
+        Cost is O(log n + limit) no matter how deep into the archive the
+        page is, because the start point is found by binary search instead
+        of skipping over earlier rows (like OFFSET would).
+        """
+        index = self._all if series is None else self._by_series.get(series)
+        if index is None:
+            return [], None
+
+        lo, hi = index.bounds(date_from, date_to)
+        if after is not None:
+            hi = min(hi, bisect_left(index.keys, after))
+        start = max(lo, hi - limit)
+        events = index.events[start:hi][::-1]
+        next_key = index.keys[start] if start > lo and events else None
+        return events, next_key
+
+    def replace(self, events: Iterable[dict]) -> "EventStore":
+        """Build the next version of the store (this one is left untouched)"""
+        return EventStore(events, version=self.version + 1)
+
+
+# ==============================================================================
+# CURRENT STORE - The snapshot every request reads from
+# ==============================================================================
+# Routes call get_event_store() instead of importing a variable directly, so
+# publish_events() can swap in a new snapshot without restarting the app.
+
+_current_store = EventStore(SEED_EVENTS)
+
+
+def get_event_store() -> EventStore:
+    """Return the current event snapshot"""
+    return _current_store
+
+
+def publish_events(events: Iterable[dict]) -> EventStore:
+    """Replace all events with a new, re-indexed snapshot"""
+    global _current_store
+    _current_store = _current_store.replace(events)
+    return _current_store
+
+
+def publish_store(store: EventStore) -> EventStore:
+    """Swap in a store built elsewhere (e.g. in a thread); it gets the next version"""
+    global _current_store
+    store.version = _current_store.version + 1
+    _current_store = store
+    return store
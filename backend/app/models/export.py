@@ -0,0 +1,132 @@
+# ==============================================================================
+# EXPORT - The full season as CSV or NDJSON, streamed in fixed-size chunks
+# ==============================================================================
+# Organizers download the whole standings table or every result for their
+# own spreadsheets. Building that as one list of dicts (and one JSON body)
+# would cost memory per request in proportion to the season. Instead rows
+# are read from the in-memory stores one at a time, encoded, and packed
+# into chunks of `chunk_size` bytes; only the chunk being filled is held.
+#
+# - standings: StandingsEngine.pinned_ranked() - the table as of the start
+#   of the download, even if results land while it is being sent
+# - results:   one event at a time, oldest first, from the driver history;
+#   each event is read in one step, so an upload landing mid-download shows
+#   up whole in the events not written yet, or not at all
+#
+# The chunks come from an async generator: the server sends each one before
+# the next is built, so a slow client slows the export down instead of
+# piling up memory, and a client that disconnects cancels the generator.
+# ==============================================================================
+
+import asyncio
+import csv
+import json
+from typing import AsyncIterator, Iterable, Iterator, Optional, Sequence, Tuple
+
+from app.models.events import get_event_store
+from app.models.history import get_driver_history
+from app.models.standings import StandingsEngine, get_standings_engine
+
+try:
+    import orjson                                  # Optional fast encoder
+except ImportError:
+    orjson = None
+
+STANDINGS_FIELDS = ("position", "driver_id", "driver", "points", "wins")
+RESULTS_FIELDS = ("event_id", "event", "date", "driver_id", "driver", "class", "position", "points")
+
+
+# ==============================================================================
+# ROWS - Tuples straight from the stores, in export order
+# ==============================================================================
+
+def standings_rows(engine: Optional[StandingsEngine] = None) -> Iterator[tuple]:
+    """STANDINGS_FIELDS per driver, best first (overall table by default)"""
+    return (engine or get_standings_engine()).pinned_ranked()
+
+
+def results_rows() -> Iterator[tuple]:
+    """RESULTS_FIELDS per result, by event date then class and position"""
+    history = get_driver_history()
+    engine = get_standings_engine()
+    for event in reversed(get_event_store().events):    # Store is newest first
+        rows = sorted(history.event_results(event["id"]), key=lambda r: (r[1], r[2]))
+        for driver_id, class_name, position, points in rows:
+            yield (event["id"], event["name"], event["date"], driver_id,
+                   engine.name(driver_id), class_name, position, points)
+
+
+# ==============================================================================
+# ENCODING - Rows → lines → chunks
+# ==============================================================================
+
+class _LastLine:
+    """File-like target for csv.writer that keeps only the line just written"""
+
+    line = ""
+
+    def write(self, text: str) -> None:
+        self.line = text
+
+
+def csv_lines(fields: Sequence[str], rows: Iterable[tuple]) -> Iterator[bytes]:
+    """Header line, then one CSV line per row"""
+    out = _LastLine()
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(fields)
+    yield out.line.encode("utf-8")
+    for row in rows:
+        writer.writerow(row)
+        yield out.line.encode("utf-8")
+
+
+def ndjson_lines(fields: Sequence[str], rows: Iterable[tuple]) -> Iterator[bytes]:
+    """One JSON object per row and line"""
+    if orjson is not None:
+        for row in rows:
+            yield orjson.dumps(dict(zip(fields, row))) + b"\n"
+        return
+    for row in rows:
+        yield json.dumps(dict(zip(fields, row)), separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+ENCODERS = {
+    "csv": csv_lines,
+    "ndjson": ndjson_lines,
+}
+
+
+async def chunked(lines: Iterable[bytes], chunk_size: int) -> AsyncIterator[bytes]:
+    """Pack lines into chunks of at least `chunk_size` bytes (the last may be smaller)"""
+    buffer = bytearray()
+    for line in lines:
+        buffer += line
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+            # Encoding never waits on anything, and neither does sending while
+            # the socket has room: hand the event loop back once per chunk so
+            # other requests run and a client disconnect can cancel us
+            await asyncio.sleep(0)
+    if buffer:
+        yield bytes(buffer)
+
+
+def export_chunks(
+    table: str,
+    format: str,
+    chunk_size: int,
+    engine: Optional[StandingsEngine] = None,
+) -> Tuple[AsyncIterator[bytes], str]:
+    """
+    (chunks, media type) for a "standings" or "results" export
+
+    `engine` picks a series/class standings table; the overall one by
+    default. The standings are pinned here, when the export starts.
+    """
+    if table == "standings":
+        fields, rows = STANDINGS_FIELDS, standings_rows(engine)
+    else:
+        fields, rows = RESULTS_FIELDS, results_rows()
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return chunked(ENCODERS[format](fields, rows), chunk_size), media_type
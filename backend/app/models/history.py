@@ -0,0 +1,453 @@
+# ==============================================================================
+# DRIVER HISTORY - Per-driver round-by-round results and head-to-head records
+# ==============================================================================
+# The standings engine only knows each driver's season total. This module
+# keeps the results behind those totals, arranged so the detail endpoints
+# never scan the whole results table:
+#
+# - One _DriverLog per driver: that driver's results in date order, stored
+#   as typed arrays, plus PREFIX SUMS of points and finishing positions.
+#   cum_points[i] is the points from the driver's first i results, so the
+#   points (or average finish) between any two rounds is one subtraction:
+#
+#       points in rounds lo..hi-1 = cum_points[hi] - cum_points[lo]
+#
+# - A small LRU cache of head-to-head aggregates per driver PAIR (how often
+#   they met in the same event and class, who finished ahead, points
+#   scored there). The first compare of a pair merges the two logs once;
+#   after that it is a dict lookup.
+#
+# Both are maintained incrementally: an upload replaces one event's
+# results, so only the logs of drivers in that event are rebuilt, and each
+# cached pair involving them has that event's meetings subtracted and
+# re-added - nothing else is recomputed.
+#
+# Points are the points each result scored: the uploaded points, or the
+# SCORING_POINTS_TABLE value for the position when a table is configured
+# (dropped rounds still appear in the history).
+# ==============================================================================
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.models.events import get_event_store
+
+# (event_id, driver_id, class, position, points) - one stored result
+ResultRow = Tuple[int, int, str, int, int]
+Pair = Tuple[int, int]                             # (lower driver_id, higher driver_id)
+
+# Head-to-head aggregate, from the lower driver id's point of view
+MEETINGS, LOW_AHEAD, HIGH_AHEAD, LOW_POINTS, HIGH_POINTS = range(5)
+
+
+def scored_points(position: int, points: int) -> int:
+    """Points a result counts for: the points table value if one is configured"""
+    table = settings.SCORING_POINTS_TABLE
+    if not table:
+        return int(points)
+    return table[position - 1] if position <= len(table) else 0
+
+
+# ==============================================================================
+# DRIVER LOG - One driver's results as columns plus prefix sums
+# ==============================================================================
+
+class _DriverLog:
+    """
+    A driver's results sorted by (event rank, class id)
+
+    `ranks` is each event's position in the season calendar, so a date
+    range is a bisect on it. cum_points/cum_positions have one more entry
+    than there are results (cum_*[0] == 0).
+    """
+
+    __slots__ = ("ranks", "events", "classes", "positions", "points",
+                 "cum_points", "cum_positions")
+
+    def __init__(self, entries: List[Tuple[int, int, int, int, int]]):
+        """entries: (rank, event_id, class_id, position, points), any order"""
+        entries.sort()
+        ranks, events, classes, positions, points = zip(*entries) if entries else ((),) * 5
+        self.ranks = array("l", ranks)
+        self.events = array("l", events)
+        self.classes = array("l", classes)
+        self.positions = array("l", positions)
+        self.points = array("l", points)
+        self.cum_points = array("q", accumulate(points, initial=0))
+        self.cum_positions = array("q", accumulate(positions, initial=0))
+
+    def __len__(self) -> int:
+        return len(self.ranks)
+
+    def replace_rank(self, rank: int, entries: List[Tuple[int, int, int, int, int]]) -> None:
+        """
+        Swap in the results for one event (rank), entries like __init__'s
+
+        The event's slice is replaced in place and the prefix sums are
+        redone from there on - cheaper than rebuilding the log.
+        """
+        lo, hi = self.span(rank, rank + 1)
+        entries.sort()
+        values = zip(*entries) if entries else ((),) * 5
+        for column, new in zip((self.ranks, self.events, self.classes, self.positions, self.points),
+                               values):
+            column[lo:hi] = array("l", new)
+        self.cum_points[lo + 1:] = array(
+            "q", accumulate(self.points[lo:], initial=self.cum_points[lo]))[1:]
+        self.cum_positions[lo + 1:] = array(
+            "q", accumulate(self.positions[lo:], initial=self.cum_positions[lo]))[1:]
+
+    def span(self, rank_lo: int, rank_hi: int) -> Tuple[int, int]:
+        """Index slice [lo, hi) of results in events ranked rank_lo..rank_hi-1"""
+        return bisect_left(self.ranks, rank_lo), bisect_left(self.ranks, rank_hi)
+
+
+def _meetings(low: _DriverLog, high: _DriverLog, rank_lo: int, rank_hi: int) -> List[int]:
+    """
+    Head-to-head aggregate of two logs over events ranked rank_lo..rank_hi-1
+
+    Both logs are sorted by (rank, class), so this is one merge pass.
+    """
+    stats = [0, 0, 0, 0, 0]
+    i, i_end = low.span(rank_lo, rank_hi)
+    j, j_end = high.span(rank_lo, rank_hi)
+    l_ranks, l_classes, h_ranks, h_classes = low.ranks, low.classes, high.ranks, high.classes
+    while i < i_end and j < j_end:
+        key_low = (l_ranks[i], l_classes[i])
+        key_high = (h_ranks[j], h_classes[j])
+        if key_low < key_high:
+            i += 1
+        elif key_high < key_low:
+            j += 1
+        else:
+            stats[MEETINGS] += 1
+            if low.positions[i] < high.positions[j]:
+                stats[LOW_AHEAD] += 1
+            elif high.positions[j] < low.positions[i]:
+                stats[HIGH_AHEAD] += 1
+            stats[LOW_POINTS] += low.points[i]
+            stats[HIGH_POINTS] += high.points[j]
+            i += 1
+            j += 1
+    return stats
+
+
+# ==============================================================================
+# DRIVER HISTORY
+# ==============================================================================
+
+class DriverHistory:
+    """
+    Every driver's results, queryable per driver and per pair of drivers
+
+    `version` goes up on every change, like StandingsEngine.version.
+    """
+
+    def __init__(self, max_pairs: int = 4096):
+        self.version = 0
+        self.max_pairs = max_pairs
+        self._logs: Dict[int, _DriverLog] = {}
+        self._event_drivers: Dict[int, Set[int]] = {}  # event_id → drivers with results
+        self._event_classes: Dict[int, Set[str]] = {}  # event_id → classes with results
+        self._ranks: Dict[int, int] = {}               # event_id → calendar position
+        self._dates: List[str] = []                    # calendar position → date
+        self._classes: List[str] = []                  # class id → class name
+        self._class_ids: Dict[str, int] = {}           # class name → class id
+        self._pairs: "OrderedDict[Pair, List[int]]" = OrderedDict()
+        self._pairs_of: Dict[int, Set[Pair]] = {}      # driver_id → cached pairs
+
+    def __len__(self) -> int:
+        return len(self._logs)
+
+    def _class_id(self, class_name: str) -> int:
+        class_id = self._class_ids.get(class_name)
+        if class_id is None:
+            class_id = self._class_ids[class_name] = len(self._classes)
+            self._classes.append(class_name)
+        return class_id
+
+    # ------------------------------------------------------------------
+    # WRITES
+    # ------------------------------------------------------------------
+
+    def load(self, events: Iterable[dict], results: Iterable[ResultRow]) -> None:
+        """
+        Replace everything
+
+        Args:
+            events:  every event (any order); fixes the calendar order
+            results: (event_id, driver_id, class, position, points) rows,
+                     points already scored (see scored_points)
+        """
+        ascending = sorted(events, key=lambda e: (e["date"], e["id"]))
+        self._ranks = {event["id"]: rank for rank, event in enumerate(ascending)}
+        self._dates = [event["date"] for event in ascending]
+        self._classes, self._class_ids = [], {}
+
+        per_driver: Dict[int, list] = {}
+        event_drivers: Dict[int, Set[int]] = {}
+        event_classes: Dict[int, Set[str]] = {}
+        ranks, class_id = self._ranks, self._class_id
+        for event_id, driver_id, class_name, position, points in results:
+            per_driver.setdefault(driver_id, []).append(
+                (ranks[event_id], event_id, class_id(class_name), position, points)
+            )
+            event_drivers.setdefault(event_id, set()).add(driver_id)
+            event_classes.setdefault(event_id, set()).add(class_name)
+
+        self._logs = {driver_id: _DriverLog(entries) for driver_id, entries in per_driver.items()}
+        self._event_drivers = event_drivers
+        self._event_classes = event_classes
+        self._pairs.clear()
+        self._pairs_of.clear()
+        self.version += 1
+
+    def adopt(self, other: "DriverHistory") -> None:
+        """Take over `other`'s results (built off the event loop) - O(1)"""
+        self._logs, self._event_drivers = other._logs, other._event_drivers
+        self._event_classes = other._event_classes
+        self._ranks, self._dates = other._ranks, other._dates
+        self._classes, self._class_ids = other._classes, other._class_ids
+        self._pairs.clear()
+        self._pairs_of.clear()
+        self.version += 1
+
+    def replace_event(self, event_id: int, results: Iterable[Tuple[int, str, int, int]]) -> None:
+        """
+        Replace one event's results with (driver_id, class, position, points) rows
+
+        Only drivers who had or now have results in the event are touched,
+        and cached pairs are corrected by that event's meetings alone.
+        """
+        rank = self._ranks.get(event_id)
+        if rank is None:
+            return                                  # Not in the loaded calendar
+
+        incoming: Dict[int, list] = {}
+        for driver_id, class_name, position, points in results:
+            incoming.setdefault(driver_id, []).append(
+                (rank, event_id, self._class_id(class_name), position, points)
+            )
+        affected = self._event_drivers.get(event_id, set()) | incoming.keys()
+        pairs = {pair for driver_id in affected for pair in self._pairs_of.get(driver_id, ())}
+
+        # Take this event's old meetings out of every cached pair it touches
+        old: Dict[int, Dict[int, Tuple[int, int]]] = {}
+        for driver_id in affected:
+            log = self._logs.get(driver_id)
+            if log is not None:
+                lo, hi = log.span(rank, rank + 1)
+                if hi > lo:
+                    old[driver_id] = {
+                        log.classes[i]: (log.positions[i], log.points[i]) for i in range(lo, hi)
+                    }
+        self._adjust_pairs(pairs, old, -1)
+
+        # Splice the event into each affected log (O(rounds) per driver)
+        for driver_id in affected:
+            log = self._logs.get(driver_id)
+            entries = incoming.get(driver_id, [])
+            if log is None:
+                self._logs[driver_id] = _DriverLog(entries)
+                continue
+            log.replace_rank(rank, entries)
+            if not len(log):
+                del self._logs[driver_id]
+        if incoming:
+            self._event_drivers[event_id] = set(incoming)
+            self._event_classes[event_id] = {
+                self._classes[class_id] for rows in incoming.values() for _, _, class_id, _, _ in rows
+            }
+        else:
+            self._event_drivers.pop(event_id, None)
+            self._event_classes.pop(event_id, None)
+
+        # Put the event's new meetings back in
+        new = {
+            driver_id: {class_id: (position, points) for _, _, class_id, position, points in rows}
+            for driver_id, rows in incoming.items()
+        }
+        self._adjust_pairs(pairs, new, +1)
+        self.version += 1
+
+    def _adjust_pairs(
+        self,
+        pairs: Iterable[Pair],
+        finishes: Dict[int, Dict[int, Tuple[int, int]]],
+        sign: int,
+    ) -> None:
+        """Add (sign=1) or remove (sign=-1) one event's meetings, given
+        driver_id → {class_id: (position, points)} for that event"""
+        for low, high in pairs:
+            low_finishes, high_finishes = finishes.get(low), finishes.get(high)
+            if not low_finishes or not high_finishes:
+                continue
+            stats = self._pairs[low, high]
+            for class_id, (low_position, low_points) in low_finishes.items():
+                other = high_finishes.get(class_id)
+                if other is None:
+                    continue
+                high_position, high_points = other
+                stats[MEETINGS] += sign
+                if low_position < high_position:
+                    stats[LOW_AHEAD] += sign
+                elif high_position < low_position:
+                    stats[HIGH_AHEAD] += sign
+                stats[LOW_POINTS] += sign * low_points
+                stats[HIGH_POINTS] += sign * high_points
+
+    # ------------------------------------------------------------------
+    # READS
+    # ------------------------------------------------------------------
+
+    def rows(self) -> Iterator[ResultRow]:
+        """(event_id, driver_id, class, position, points) for every stored result"""
+        classes = self._classes
+        for driver_id, log in self._logs.items():
+            for event_id, class_id, position, points in zip(
+                log.events, log.classes, log.positions, log.points,
+            ):
+                yield event_id, driver_id, classes[class_id], position, points
+
+    def finishes(self, driver_id: int) -> List[Tuple[int, str, int]]:
+        """(event_id, class, position) of every result of one driver, oldest first"""
+        log = self._logs.get(driver_id)
+        if log is None:
+            return []
+        classes = self._classes
+        return [(event_id, classes[class_id], position)
+                for event_id, class_id, position in zip(log.events, log.classes, log.positions)]
+
+    def event_classes(self) -> Dict[int, Set[str]]:
+        """event_id → the classes it has results in, for every event with results"""
+        return self._event_classes
+
+    def event_results(self, event_id: int) -> List[Tuple[int, str, int, int]]:
+        """(driver_id, class, position, points) for every stored result of one event"""
+        rank = self._ranks.get(event_id)
+        if rank is None:
+            return []
+        classes, rows = self._classes, []
+        for driver_id in self._event_drivers.get(event_id, ()):
+            log = self._logs[driver_id]
+            lo, hi = log.span(rank, rank + 1)
+            rows.extend(
+                (driver_id, classes[log.classes[i]], log.positions[i], log.points[i])
+                for i in range(lo, hi)
+            )
+        return rows
+
+    def _rank_bounds(self, date_from: Optional[str], date_to: Optional[str]) -> Tuple[int, int]:
+        """Calendar ranks [lo, hi) of events with date_from <= date <= date_to"""
+        dates = self._dates
+        lo = bisect_left(dates, date_from) if date_from else 0
+        hi = bisect_right(dates, date_to) if date_to else len(dates)
+        return lo, hi
+
+    def summary(
+        self,
+        driver_id: int,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> dict:
+        """Starts, points, best and average finish - O(log n) plus the best-finish scan"""
+        log = self._logs.get(driver_id)
+        if log is None:
+            return {"starts": 0, "points": 0, "best_finish": None, "average_finish": None}
+        lo, hi = log.span(*self._rank_bounds(date_from, date_to))
+        starts = hi - lo
+        if not starts:
+            return {"starts": 0, "points": 0, "best_finish": None, "average_finish": None}
+        return {
+            "starts": starts,
+            "points": log.cum_points[hi] - log.cum_points[lo],
+            "best_finish": min(log.positions[lo:hi]),
+            "average_finish": round((log.cum_positions[hi] - log.cum_positions[lo]) / starts, 2),
+        }
+
+    def rounds(
+        self,
+        driver_id: int,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> List[dict]:
+        """One row per result in date order, with the running points total"""
+        log = self._logs.get(driver_id)
+        if log is None:
+            return []
+        lo, hi = log.span(*self._rank_bounds(date_from, date_to))
+        events, classes, cum_points = get_event_store(), self._classes, log.cum_points
+        base = cum_points[lo]
+        rows = []
+        for i in range(lo, hi):
+            event = events.get_by_id(log.events[i]) or {}
+            rows.append({
+                "event_id": log.events[i],
+                "event": event.get("name"),
+                "date": event.get("date"),
+                "class": classes[log.classes[i]],
+                "position": log.positions[i],
+                "points": log.points[i],
+                "cumulative_points": cum_points[i + 1] - base,
+            })
+        return rows
+
+    def head_to_head(self, a: int, b: int) -> dict:
+        """
+        a vs b over every event and class they both entered
+
+        Cached per pair; the first request for a pair merges the two logs.
+        """
+        pair = (a, b) if a < b else (b, a)
+        stats = self._pairs.get(pair)
+        if stats is None:
+            empty = _DriverLog([])
+            stats = _meetings(
+                self._logs.get(pair[0], empty), self._logs.get(pair[1], empty),
+                0, len(self._dates),
+            )
+            self._pairs[pair] = stats
+            for driver_id in pair:
+                self._pairs_of.setdefault(driver_id, set()).add(pair)
+            if len(self._pairs) > self.max_pairs:
+                self._evict()
+        else:
+            self._pairs.move_to_end(pair)
+
+        low_is_a = pair[0] == a
+        return {
+            "meetings": stats[MEETINGS],
+            "a_ahead": stats[LOW_AHEAD if low_is_a else HIGH_AHEAD],
+            "b_ahead": stats[HIGH_AHEAD if low_is_a else LOW_AHEAD],
+            "a_points": stats[LOW_POINTS if low_is_a else HIGH_POINTS],
+            "b_points": stats[HIGH_POINTS if low_is_a else LOW_POINTS],
+        }
+
+    def _evict(self) -> None:
+        """Forget the least recently compared pair"""
+        pair, _ = self._pairs.popitem(last=False)
+        for driver_id in pair:
+            cached = self._pairs_of.get(driver_id)
+            if cached is not None:
+                cached.discard(pair)
+                if not cached:
+                    del self._pairs_of[driver_id]
+
+
+# ==============================================================================
+# CURRENT HISTORY - One per process, filled by app/models/repository.py
+# ==============================================================================
+
+_history: Optional[DriverHistory] = None
+
+
+def get_driver_history() -> DriverHistory:
+    """Return the driver history for this process (created on first use)"""
+    global _history
+    if _history is None:
+        _history = DriverHistory(max_pairs=settings.HISTORY_PAIR_CACHE_SIZE)
+    return _history
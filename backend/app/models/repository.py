@@ -0,0 +1,492 @@
+# ==============================================================================
+# REPOSITORY - Moves data between the database and the in-memory stores
+# ==============================================================================
+# The database is the source of truth; the EventStore and StandingsEngine are
+# fast in-memory views of it. Routes read the in-memory views (no connection
+# per request) and this module keeps them filled:
+#
+# - init_schema():       create tables if they don't exist yet
+# - load_from_database(): read everything once through the pool at startup
+# - load_standings():    season totals - overall and per series/class - either
+#                        summed from uploaded points or scored from finishing
+#                        positions (app/models/scoring.py)
+# - load_history():      every driver's results round by round, for the
+#                        history and head-to-head endpoints (app/models/history.py)
+# - data_version():      a counter bumped by every write, so a separate
+#                        snapshot writer process can notice changes
+# - state_version():     the data_version the in-memory stores reflect, the
+#                        same in every process that computed from it
+# - apply_snapshot():    fill the stores from a shared binary snapshot
+#                        (build_stores() + install_stores(), so workers can
+#                        do the building in a thread)
+# - warm_start():        load the snapshot saved by the last run, then
+#                        replay only the uploads made since (catch_up())
+# - save_snapshot():     write that file (on shutdown and periodically)
+# - index_for_search():  bring the search index (app/models/search.py) in
+#                        line with the stores after either kind of load
+#
+# On an empty database the seed events/drivers are written first, so a fresh
+# install serves the same data it always has.
+# ==============================================================================
+
+import asyncio
+import json
+import time
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.database import Database
+from app.core.snapshot import encode_snapshot, read_snapshot_file, write_snapshot_file
+from app.models.events import (
+    SEED_EVENTS, EventStore, get_event_store, publish_events, publish_store,
+)
+from app.models.history import DriverHistory, get_driver_history, scored_points
+from app.models.search import SearchIndex, get_search_index, publish_search_index
+from app.models.standings import (
+    SEED_DRIVERS, PartitionKey, StandingsEngine, StandingsPartitions,
+    get_standings_engine, get_standings_partitions,
+)
+
+
+# ==============================================================================
+# SCHEMA - Plain SQL that works on both SQLite and Postgres
+# ==============================================================================
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS events (
+        id      INTEGER PRIMARY KEY,
+        name    TEXT NOT NULL,
+        date    TEXT NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS drivers (
+        id      INTEGER PRIMARY KEY,
+        name    TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS results (
+        event_id    INTEGER NOT NULL REFERENCES events(id),
+        driver_id   INTEGER NOT NULL REFERENCES drivers(id),
+        class       TEXT NOT NULL DEFAULT '',
+        position    INTEGER NOT NULL,
+        points      INTEGER NOT NULL,
+        PRIMARY KEY (event_id, driver_id, class)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS result_changes (
+        version     INTEGER PRIMARY KEY,
+        event_id    INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS meta (
+        key     TEXT PRIMARY KEY,
+        value   INTEGER NOT NULL
+    )
+    """,
+    "INSERT INTO meta (key, value) VALUES ('data_version', 0) ON CONFLICT (key) DO NOTHING",
+]
+
+# Run inside any transaction that changes events, drivers or results
+BUMP_DATA_VERSION = "UPDATE meta SET value = value + 1 WHERE key = 'data_version'"
+
+# Run right after BUMP_DATA_VERSION when a write changes an event's
+# results (parameter: event_id), so catch_up() knows what to replay
+LOG_RESULT_CHANGE = (
+    "INSERT INTO result_changes (version, event_id) "
+    "SELECT value, ? FROM meta WHERE key = 'data_version'"
+)
+
+# Held by every results write (upload or live batch) from before it reads
+# the event's current results until the in-memory stores have the new
+# ones. Always taken BEFORE the write transaction, so writes in this process
+# apply in commit order and save_snapshot() never captures half a write.
+upload_lock = asyncio.Lock()
+
+
+async def init_schema(db: Database) -> None:
+    """Create any missing tables"""
+    async with db.connection() as conn:
+        for statement in SCHEMA:
+            await conn.execute(statement)
+
+
+async def _seed_if_empty(db: Database) -> None:
+    """Write the placeholder data into a brand-new database"""
+    async with db.connection() as conn:
+        if (await conn.fetch_all("SELECT COUNT(*) FROM events"))[0][0]:
+            return
+        latest_event = SEED_EVENTS[0]["id"]
+        async with conn.transaction():
+            await conn.execute_many(
+                "INSERT INTO events (id, name, date) VALUES (?, ?, ?)",
+                [(e["id"], e["name"], e["date"]) for e in SEED_EVENTS],
+            )
+            await conn.execute_many(
+                "INSERT INTO drivers (id, name) VALUES (?, ?)",
+                [(driver_id, name) for driver_id, name, _ in SEED_DRIVERS],
+            )
+            # Seed points are recorded as one result row each, so the
+            # standings are always derived from results
+            await conn.execute_many(
+                "INSERT INTO results (event_id, driver_id, class, position, points) "
+                "VALUES (?, ?, '', ?, ?)",
+                [
+                    (latest_event, driver_id, position, points)
+                    for position, (driver_id, _, points) in enumerate(SEED_DRIVERS, start=1)
+                ],
+            )
+
+
+# ==============================================================================
+# LOADING - Database → in-memory stores
+# ==============================================================================
+
+async def load_events(db: Database) -> list:
+    rows = await db.fetch_all("SELECT id, name, date FROM events")
+    return [{"id": i, "name": n, "date": d} for i, n, d in rows]
+
+
+async def load_driver_totals(db: Database) -> list:
+    """(driver_id, name, season points, wins, second places) for every driver"""
+    return await db.fetch_all(
+        """
+        SELECT d.id, d.name,
+               COALESCE(SUM(r.points), 0),
+               COALESCE(SUM(CASE WHEN r.position = 1 THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN r.position = 2 THEN 1 ELSE 0 END), 0)
+        FROM drivers d
+        LEFT JOIN results r ON r.driver_id = d.id
+        GROUP BY d.id, d.name
+        """
+    )
+
+
+async def load_results(db: Database) -> list:
+    """(driver_id, event_id, class, points, position) for every result"""
+    return await db.fetch_all("SELECT driver_id, event_id, class, points, position FROM results")
+
+
+async def load_standings(db: Database, results: Optional[list] = None) -> None:
+    """
+    Recompute every driver's season (global and per partition) from results
+
+    Pass `results` (load_results() rows) when they have already been read.
+    """
+    drivers = await db.fetch_all("SELECT id, name FROM drivers")
+    if results is None:
+        results = await load_results(db)
+
+    # Group results by the series/class partitions they count towards
+    names = dict(drivers)
+    series_of = {event["id"]: event["series"] for event in get_event_store().events}
+    partitioned: Dict[PartitionKey, list] = {}
+    for row in results:
+        for key in StandingsPartitions.keys_for(series_of[row[1]], row[2]):
+            partitioned.setdefault(key, []).append(row)
+
+    if not settings.SCORING_POINTS_TABLE:
+        get_standings_engine().load(
+            (driver_id, name, int(points), int(wins), int(seconds), 0)
+            for driver_id, name, points, wins, seconds in await load_driver_totals(db)
+        )
+        get_standings_partitions().load(
+            (key, _summed_rows(rows, names)) for key, rows in partitioned.items()
+        )
+        return
+
+    # Points table configured: score positions in one vectorized pass.
+    # Imported here so numpy is only loaded when scoring is switched on.
+    from app.models.scoring import ScoringRules, season_rows
+
+    rules = ScoringRules(settings.SCORING_POINTS_TABLE, settings.SCORING_DROP_WORST)
+
+    def scored(rows: list) -> list:
+        entrants = sorted({row[0] for row in rows})
+        return season_rows(
+            [(driver_id, names[driver_id]) for driver_id in entrants],
+            [(driver_id, event_id, position) for driver_id, event_id, _, _, position in rows],
+            rules,
+        )
+
+    get_standings_engine().load(season_rows(drivers, [
+        (driver_id, event_id, position) for driver_id, event_id, _, _, position in results
+    ], rules))
+    get_standings_partitions().load((key, scored(rows)) for key, rows in partitioned.items())
+
+
+def _summed_rows(results: list, names: Dict[int, str]) -> list:
+    """Engine rows from (driver_id, event_id, class, points, position) results"""
+    totals: Dict[int, List[int]] = {}
+    for driver_id, _, _, points, position in results:
+        total = totals.setdefault(driver_id, [0, 0, 0])
+        total[0] += points
+        total[1] += position == 1
+        total[2] += position == 2
+    return [
+        (driver_id, names[driver_id], points, wins, seconds, 0)
+        for driver_id, (points, wins, seconds) in totals.items()
+    ]
+
+
+def load_history(results: list) -> None:
+    """Rebuild the driver history from load_results() rows"""
+    get_driver_history().load(get_event_store().events, (
+        (event_id, driver_id, class_name, position, scored_points(position, points))
+        for driver_id, event_id, class_name, points, position in results
+    ))
+
+
+async def load_from_database(db: Database) -> int:
+    """
+    Create/seed the schema, then publish fresh in-memory snapshots
+
+    Everything is read in one consistent read on one connection, so a
+    write landing mid-load can't leave the stores half old, half new.
+    Returns the data version the stores now reflect.
+    """
+    await init_schema(db)
+    await _seed_if_empty(db)
+    set_state_version(None)
+    async with db.connection() as conn:
+        async with conn.consistent_read():
+            # The load_* functions only call fetch_all(), which a
+            # connection has too
+            version = await data_version(conn)
+            publish_events(await load_events(conn))
+            results = await load_results(conn)     # Read once, used twice
+            await load_standings(conn, results)
+    load_history(results)
+    index_for_search()
+    set_state_version(version)
+    return version
+
+
+async def data_version(db: Database) -> int:
+    """Counter that goes up with every committed write"""
+    rows = await db.fetch_all("SELECT value FROM meta WHERE key = 'data_version'")
+    return rows[0][0] if rows else 0
+
+
+# ==============================================================================
+# STATE VERSION - Which data_version the in-memory stores reflect
+# ==============================================================================
+# The stores' own version counters are per process. Any process that
+# computed its stores from data version N holds the same state, though, so
+# N can name things shared between workers or kept across restarts (e.g.
+# the shared response cache tier). None means "not known": a load raced a
+# write, an upload from another worker hasn't reached this one yet, or an
+# update is half-applied.
+
+_state_version: Optional[int] = None
+_state_changed_at: Optional[float] = None      # time.time() of the last change
+
+
+def state_version() -> Optional[int]:
+    return _state_version
+
+
+def state_changed_at() -> Optional[float]:
+    """When the stores last changed (every change goes through set_state_version)"""
+    return _state_changed_at
+
+
+def set_state_version(version: Optional[int]) -> None:
+    global _state_version, _state_changed_at
+    _state_version = version
+    _state_changed_at = time.time()
+
+
+# ==============================================================================
+# SHARED SNAPSHOTS - In-memory stores ↔ binary snapshot (app/core/snapshot.py)
+# ==============================================================================
+
+def snapshot_rows():
+    """(events, drivers, partitions, results) of the current in-memory state, ready to encode"""
+    partitions = [(key, engine.rows()) for key, engine in get_standings_partitions().items()]
+    return (
+        get_event_store().events, get_standings_engine().rows(), partitions,
+        get_driver_history().rows(),
+    )
+
+
+# Applying a snapshot means rebuilding every store - about half a second
+# of Python for a season with 90k results. Workers do that while serving,
+# so it is split in two:
+#
+#   build_stores()    builds brand new stores from the decoded snapshot and
+#                     touches nothing a request can see - safe to run in a
+#                     thread (SnapshotRefreshMiddleware does)
+#   install_stores()  swaps them in on the event loop: a handful of
+#                     reference assignments, so a request sees the old data
+#                     or the new, never a mix
+
+def build_stores(decoded) -> tuple:
+    """Fresh stores for a decoded snapshot, ready for install_stores()"""
+    header, events, drivers, partitions, results = decoded
+    store = EventStore(events)
+    engine = StandingsEngine()
+    engine.load(drivers)
+    engine.ranking()                                # Sort here, not in the first request
+    split = StandingsPartitions()
+    split.load(partitions)
+    for _, partition in split.items():
+        partition.ranking()
+    history = DriverHistory(max_pairs=settings.HISTORY_PAIR_CACHE_SIZE)
+    history.load(store.events, results)             # Points already scored
+    index = SearchIndex()
+    index.sync_events(store.events)
+    index.sync_drivers((row[0], row[1]) for row in drivers)
+    return header["data_version"], store, engine, split, history, index
+
+
+def install_stores(built: tuple) -> bool:
+    """
+    Swap in build_stores() output; False if the stores are already newer
+
+    (This worker may have applied an upload of its own while the snapshot
+    was being built - the writer's next snapshot will include it.)
+    """
+    version, store, engine, split, history, index = built
+    current = state_version()
+    if current is not None and current > version:
+        return False
+    publish_store(store)
+    get_standings_engine().adopt(engine)            # Same object: listeners stay attached
+    get_standings_partitions().adopt(split)
+    get_driver_history().adopt(history)
+    publish_search_index(index)
+    set_state_version(version)
+    return True
+
+
+def apply_snapshot(decoded) -> None:
+    """Replace the in-memory stores with a decoded snapshot"""
+    header, events, drivers, partitions, results = decoded
+    store = publish_events(events)
+    get_standings_engine().load(drivers)
+    get_standings_partitions().load(partitions)
+    get_driver_history().load(store.events, results)   # Points already scored
+    index_for_search()
+    set_state_version(header["data_version"])
+
+
+def index_for_search() -> None:
+    """Index every event and driver name (only new or renamed ones are re-indexed)"""
+    index = get_search_index()
+    index.sync_events(get_event_store().events)
+    index.sync_drivers((row[0], row[1]) for row in get_standings_engine().rows())
+
+
+# ==============================================================================
+# WARM START - Save the computed state, reload it instead of recomputing
+# ==============================================================================
+# The snapshot file records the data_version it reflects. Every upload
+# logs (data_version, event_id) in result_changes, so at the next start:
+#
+#   versions since the snapshot == uploads logged since the snapshot
+#       → map the file, re-read just those events' results (catch_up)
+#   anything else (other writes, another database, new settings)
+#       → warm_start() returns False and the caller loads everything
+
+def state_fingerprint() -> int:
+    """Changes whenever a setting that shapes the computed standings changes"""
+    scoring = [settings.SCORING_POINTS_TABLE, settings.SCORING_DROP_WORST]
+    return zlib.crc32(json.dumps(scoring).encode("utf-8"))
+
+
+def encode_state(version: int) -> bytes:
+    """The current in-memory state, reflecting data version `version`, as snapshot bytes"""
+    return encode_snapshot(
+        version, *snapshot_rows(), data_version=version, fingerprint=state_fingerprint(),
+    )
+
+
+async def save_snapshot(db: Database, path: str, version: Optional[int] = None) -> int:
+    """
+    Write the in-memory state to `path` for the next warm start
+
+    `version` is the data version the stores reflect; by default it is read
+    while no upload is half-applied. Returns the version written.
+    """
+    if version is None:
+        async with upload_lock:
+            version = await data_version(db)
+            data = encode_state(version)
+    else:
+        data = encode_state(version)
+    await asyncio.to_thread(write_snapshot_file, path, data, True)
+    return version
+
+
+async def _uploads_since(db: Database, since: int) -> Optional[Tuple[int, Set[int]]]:
+    """
+    (current data version, events re-uploaded after `since`)
+
+    None if the log can't account for every change since then - the
+    database was replaced, or something other than an upload wrote to it.
+    """
+    current = await data_version(db)
+    if current < since:
+        return None
+    logged = await db.fetch_all(
+        "SELECT event_id FROM result_changes WHERE version > ? AND version <= ?",
+        (since, current),
+    )
+    if len(logged) != current - since:
+        return None
+    return current, {event_id for (event_id,) in logged}
+
+
+async def catch_up(db: Database, since: int) -> Optional[int]:
+    """
+    Bring stores that reflect data version `since` up to date by replaying
+    only the uploads made after it
+
+    Returns the version now reflected, or None if a full load is needed.
+    """
+    # Imported here: app/models/results.py imports this module
+    from app.models.results import replay_events
+
+    while True:
+        found = await _uploads_since(db, since)
+        if found is None:
+            return None
+        current, event_ids = found
+        if not event_ids:
+            break
+        set_state_version(None)
+        await replay_events(db, sorted(event_ids))
+        if await data_version(db) == current:
+            break
+        since = current                         # More uploads landed mid-replay
+    set_state_version(current)
+    return current
+
+
+async def warm_start(db: Database, path: str) -> Optional[int]:
+    """
+    Fill the stores from the snapshot at `path` plus later uploads
+
+    Returns the data version now reflected, or None if the snapshot is
+    missing/unusable (nothing is changed then; do a full load).
+    """
+    decoded = read_snapshot_file(path)              # mmap + CRC check
+    if decoded is None:
+        return None
+    header = decoded[0]
+    if header["fingerprint"] != state_fingerprint():
+        return None                                 # Scoring settings changed
+
+    await init_schema(db)
+    n_events = (await db.fetch_all("SELECT COUNT(*) FROM events"))[0][0]
+    if n_events != header["n_events"] or await _uploads_since(db, header["data_version"]) is None:
+        return None
+
+    apply_snapshot(decoded)
+    return await catch_up(db, header["data_version"])
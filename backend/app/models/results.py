@@ -0,0 +1,632 @@
+# ==============================================================================
+# RESULTS - Streaming parsing, validation and storage of race results
+# ==============================================================================
+# An uploaded results file can be tens of thousands of rows (a season
+# backfill), so nothing here holds the whole upload in memory:
+#
+# 1. The request body arrives in chunks; complete lines are split off as
+#    they arrive (iter_lines)
+# 2. Lines are parsed as CSV or NDJSON and grouped into batches
+# 3. Each batch is validated in one pydantic call and kept as compact
+#    (driver_id, class, position, points) tuples
+# 4. Only once the whole upload is valid are the tuples bulk-inserted, in
+#    ONE short database transaction - the upload is all-or-nothing
+# 5. The in-memory stores (standings, driver history, search) are updated
+#    ONCE at the end, not once per row (apply_event_results)
+#
+# Live timing (ingest_live_results) upserts a micro-batch of results into an
+# event instead of replacing it, with the same one-transaction, one-update
+# shape per batch.
+#
+# Accepted columns / keys (one row per line):
+#   driver_id, driver, class, position, points
+# ==============================================================================
+
+import csv
+import json
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+
+from app.core.config import settings
+from app.core.database import Database
+from app.models.events import get_event_store
+from app.models.history import get_driver_history, scored_points
+from app.models.repository import (
+    BUMP_DATA_VERSION, LOG_RESULT_CHANGE, data_version,
+    set_state_version, state_version, upload_lock,
+)
+from app.models.search import get_search_index
+from app.models.standings import (
+    PartitionKey, StandingsPartitions, get_standings_engine, get_standings_partitions,
+)
+
+
+class IngestError(ValueError):
+    """The upload is malformed; `line` is the 1-based line that failed"""
+
+    def __init__(self, line: int, message: str):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+        self.reason = message
+
+
+# ==============================================================================
+# ROW MODEL - What one result must look like
+# ==============================================================================
+
+class ResultRow(BaseModel):
+    """One driver's finish in one class of an event"""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    driver_id: int = Field(ge=1, le=2**63 - 1)    # Must fit a database integer
+    driver: str = Field(min_length=1, max_length=200)
+    class_name: str = Field("", alias="class", max_length=50)
+    position: int = Field(ge=1, le=settings.RESULT_MAX_POSITION)
+    points: int = Field(0, ge=0, le=settings.RESULT_MAX_POINTS)
+
+
+_batch_adapter = TypeAdapter(List[ResultRow])
+
+# (driver_id, class, position, points) - one event result, as stored
+ResultTuple = Tuple[int, str, int, int]
+
+
+# ==============================================================================
+# STREAM PARSING - Bytes → lines → row dicts, without buffering the upload
+# ==============================================================================
+
+def _decode_line(line_no: int, raw: bytes) -> str:
+    """UTF-8 text of one line (a BOM is allowed on the first)"""
+    try:
+        return raw.decode("utf-8-sig" if line_no == 1 else "utf-8")
+    except UnicodeDecodeError as exc:
+        raise IngestError(line_no, f"not valid UTF-8 (byte {exc.start + 1})") from None
+
+
+async def iter_raw_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Yield (line_number, text) for every line as chunks arrive, unstripped
+
+    Only each new chunk is searched for newlines; a line still waiting for
+    its end is kept as a list of pieces, so a long line costs O(length),
+    and one longer than INGEST_MAX_LINE_BYTES is rejected right away.
+    """
+    limit = settings.INGEST_MAX_LINE_BYTES
+    partial: List[bytes] = []                      # Pieces of the unfinished line
+    partial_size = 0
+    line_no = 0
+    async for chunk in chunks:
+        lines = chunk.split(b"\n")
+        if len(lines) == 1:                        # No line ends in this chunk
+            partial.append(chunk)
+            partial_size += len(chunk)
+            if partial_size > limit:
+                raise IngestError(line_no + 1, "line too long")
+            continue
+        if partial:
+            partial.append(lines[0])
+            lines[0] = b"".join(partial)
+        tail = lines.pop()
+        for raw in lines:
+            line_no += 1
+            if len(raw) > limit:
+                raise IngestError(line_no, "line too long")
+            yield line_no, _decode_line(line_no, raw)
+        partial, partial_size = [tail], len(tail)
+        if partial_size > limit:
+            raise IngestError(line_no + 1, "line too long")
+    if partial_size:
+        yield line_no + 1, _decode_line(line_no + 1, b"".join(partial))
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """Yield (line_number, text) for each non-blank line, stripped"""
+    async for line_no, text in iter_raw_lines(chunks):
+        text = text.strip()
+        if text:
+            yield line_no, text
+
+
+def _ends_quoted(text: str, quoted: bool) -> bool:
+    """
+    True if a CSV line ends inside a quoted field, i.e. the row goes on
+    over the next line
+
+    `quoted` says whether the line starts inside one. Follows the csv
+    module: a quote only opens a field when it is the field's first
+    character, and "" inside quotes is an escaped quote.
+    """
+    i, at_field_start = 0, not quoted
+    while True:
+        quote = text.find('"', i)
+        if quoted:
+            if quote < 0:
+                return True
+            if text.startswith('"', quote + 1):
+                i = quote + 2                      # "" - an escaped quote
+                continue
+            quoted = False
+        elif quote < 0:
+            return False
+        elif (quote == i and at_field_start) or (quote > i and text[quote - 1] == ","):
+            quoted = True
+        i, at_field_start = quote + 1, False
+
+
+async def iter_csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, dict]]:
+    """
+    CSV with a header line naming the columns
+
+    Lines are joined while a quoted field (e.g. a driver name) carries a
+    newline; errors point at the row's first line.
+    """
+    limit = settings.INGEST_MAX_LINE_BYTES
+    header = None
+    record: List[str] = []                         # Lines of a row still inside quotes
+    first_line = record_size = 0
+    async for line_no, text in iter_raw_lines(chunks):
+        if record:
+            text = text.rstrip("\r")
+            record.append(text)
+            record_size += len(text) + 1
+            if record_size > limit:
+                raise IngestError(first_line, "row too long")
+            if _ends_quoted(text, quoted=True):
+                continue
+            text, line_no, record = "\n".join(record), first_line, []
+        elif '"' in text and _ends_quoted(text, quoted=False):
+            record, first_line, record_size = [text.rstrip("\r")], line_no, len(text)
+            continue
+        text = text.strip()
+        if not text:
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            raise IngestError(line_no, f"expected {len(header)} columns, got {len(values)}")
+        yield line_no, dict(zip(header, values))
+    if record:
+        raise IngestError(first_line, "quoted field is never closed")
+
+
+async def iter_ndjson_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, dict]]:
+    """One JSON object per line"""
+    async for line_no, text in iter_lines(chunks):
+        try:
+            row = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise IngestError(line_no, f"invalid JSON ({exc.msg})") from None
+        if not isinstance(row, dict):
+            raise IngestError(line_no, "expected a JSON object")
+        yield line_no, row
+
+
+PARSERS = {
+    "csv": iter_csv_rows,
+    "ndjson": iter_ndjson_rows,
+}
+
+
+def validate_batch(batch: List[Tuple[int, dict]]) -> List[ResultRow]:
+    """Validate a whole batch in one call, reporting the first bad line"""
+    try:
+        return _batch_adapter.validate_python([row for _, row in batch])
+    except ValidationError as exc:
+        error = exc.errors()[0]
+        index = error["loc"][0]
+        field = ".".join(str(part) for part in error["loc"][1:])
+        raise IngestError(batch[index][0], f"{field}: {error['msg']}") from None
+
+
+# ==============================================================================
+# INGEST - Parse, validate and store one event's results
+# ==============================================================================
+
+async def ingest_results(
+    db: Database,
+    event_id: int,
+    rows: AsyncIterator[Tuple[int, dict]],
+    batch_size: int,
+    max_rows: int,
+) -> dict:
+    """
+    Replace all results for `event_id` with the uploaded rows
+
+    Returns a summary dict. Raises IngestError on any bad row, in which
+    case nothing is written.
+    """
+    names: Dict[int, str] = {}                     # driver_id → latest name
+    uploaded: List[ResultTuple] = []               # (driver_id, class, position, points)
+    seen: Set[Tuple[int, str]] = set()             # (driver_id, class) already in upload
+
+    def collect(batch: List[Tuple[int, dict]]) -> None:
+        validated = validate_batch(batch)
+        for (line_no, _), row in zip(batch, validated):
+            key = (row.driver_id, row.class_name)
+            if key in seen:
+                raise IngestError(line_no, "duplicate driver_id/class in upload")
+            seen.add(key)
+            uploaded.append((row.driver_id, row.class_name, row.position, row.points))
+            names[row.driver_id] = row.driver
+
+    # Parse and validate everything BEFORE touching the database: a slow
+    # client then never keeps the lock or a write transaction open, and a
+    # bad row costs no write at all
+    total = 0
+    batch: List[Tuple[int, dict]] = []
+    async for line_no, row in rows:
+        total += 1
+        if total > max_rows:
+            raise IngestError(line_no, f"upload exceeds {max_rows} rows")
+        batch.append((line_no, row))
+        if len(batch) >= batch_size:
+            collect(batch)
+            batch = []
+    if batch:
+        collect(batch)
+
+    # Same order as ingest_live_results: lock, then write transaction
+    async with upload_lock:
+        async with db.connection() as conn:
+            async with conn.transaction():
+                version = await _bump_version(conn, event_id)
+                # What this event already had (re-uploads replace)
+                previous = await conn.fetch_all(
+                    "SELECT driver_id, class, position, points FROM results WHERE event_id = ?",
+                    (event_id,),
+                )
+                await conn.execute("DELETE FROM results WHERE event_id = ?", (event_id,))
+                drivers = list(names.items())
+                for i in range(0, len(drivers), batch_size):
+                    await conn.execute_many(
+                        "INSERT INTO drivers (id, name) VALUES (?, ?) "
+                        "ON CONFLICT (id) DO UPDATE SET name = excluded.name",
+                        drivers[i:i + batch_size],
+                    )
+                for i in range(0, len(uploaded), batch_size):
+                    await conn.execute_many(
+                        "INSERT INTO results (event_id, driver_id, class, position, points) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        [(event_id, *result) for result in uploaded[i:i + batch_size]],
+                    )
+
+        # ONE in-memory update for the whole upload (after the commit)
+        await _apply_committed(db, version, event_id, previous, uploaded, names)
+    return {"event_id": event_id, "rows": total, "drivers": len(names)}
+
+
+# ==============================================================================
+# LIVE INGEST - Add/update a few results of an event that is still running
+# ==============================================================================
+
+async def ingest_live_results(db: Database, event_id: int, rows: Iterable[ResultRow]) -> dict:
+    """
+    Store one micro-batch of live timing results for `event_id`
+
+    Unlike ingest_results nothing is replaced wholesale: each row sets one
+    driver/class result and the rest of the event stays as it was. If a
+    driver/class appears more than once, the last row wins. The batch is
+    one transaction and one in-memory update, so readers see all of it or
+    none of it.
+    """
+    latest = {(row.driver_id, row.class_name): row for row in rows}
+    names = {row.driver_id: row.driver for row in latest.values()}
+
+    # Same order as ingest_results: lock, then write transaction. Batches
+    # (and uploads) of the same event reach the stores in commit order
+    async with upload_lock:
+        async with db.connection() as conn:
+            async with conn.transaction():
+                version = await _bump_version(conn, event_id)
+                previous = await conn.fetch_all(
+                    "SELECT driver_id, class, position, points FROM results WHERE event_id = ?",
+                    (event_id,),
+                )
+                await conn.execute_many(
+                    "INSERT INTO drivers (id, name) VALUES (?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET name = excluded.name",
+                    list(names.items()),
+                )
+                await conn.execute_many(
+                    "INSERT INTO results (event_id, driver_id, class, position, points) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT (event_id, driver_id, class) "
+                    "DO UPDATE SET position = excluded.position, points = excluded.points",
+                    [
+                        (event_id, row.driver_id, row.class_name, row.position, row.points)
+                        for row in latest.values()
+                    ],
+                )
+
+        # The event's full result list after the batch, for the stores
+        results = {(driver_id, class_name): (driver_id, class_name, position, points)
+                   for driver_id, class_name, position, points in previous}
+        results.update(
+            (key, (row.driver_id, row.class_name, row.position, row.points))
+            for key, row in latest.items()
+        )
+        await _apply_committed(db, version, event_id, previous, list(results.values()), names)
+    return {"event_id": event_id, "rows": len(latest), "drivers": len(names)}
+
+
+# ==============================================================================
+# COMMIT HELPERS - Shared by uploads and live batches (under upload_lock)
+# ==============================================================================
+
+async def _bump_version(conn, event_id: int) -> int:
+    """
+    Count the write and log the event it touched; returns the new data version
+
+    Run it FIRST in the write transaction, before reading anything: the
+    meta row it updates stays locked until commit, so writers in other
+    processes wait here too and never read an event's results mid-write.
+    """
+    await conn.execute(BUMP_DATA_VERSION)
+    await conn.execute(LOG_RESULT_CHANGE, (event_id,))
+    return await data_version(conn)
+
+
+async def _apply_committed(
+    db: Database,
+    version: int,
+    event_id: int,
+    previous: Iterable[ResultTuple],
+    results: Iterable[ResultTuple],
+    names: Dict[int, str],
+) -> None:
+    """apply_event_results() for a write committed as `version`, keeping state_version() true"""
+    # The stores reflect `version` afterwards only if they reflected the one
+    # just before it - otherwise another process wrote in between
+    reflected = state_version()
+    set_state_version(None)                        # Half-applied until done
+    await apply_event_results(db, event_id, previous, results, names)
+    set_state_version(version if reflected == version - 1 else None)
+
+
+# ==============================================================================
+# IN-MEMORY UPDATE - One event's new results → standings, history, search
+# ==============================================================================
+
+async def apply_event_results(
+    db: Database,
+    event_id: int,
+    previous: Iterable[ResultTuple],
+    results: Iterable[ResultTuple],
+    names: Dict[int, str],
+    batch: bool = False,
+) -> Set[Tuple[int, str]]:
+    """
+    Update every in-memory store after an event's results were replaced
+
+    Args:
+        previous: the event's (driver_id, class, position, points) rows before
+        results:  the same for its rows now
+        names:    driver_id → name for drivers in `results`
+        batch:    part of several events applied in a row: leave partition
+                  pruning to the caller, to do once the database and the
+                  stores agree again
+
+    Returns the (driver_id, class) pairs the event no longer has.
+    """
+    old = {(driver_id, class_name): _contribution(points, position)
+           for driver_id, class_name, position, points in previous}
+    new = {(driver_id, class_name): _contribution(points, position)
+           for driver_id, class_name, position, points in results}
+
+    get_search_index().set_drivers(names.items())  # New drivers + renames only
+    get_standings_partitions().rename(names)       # Also tables this event isn't in
+    get_driver_history().replace_event(event_id, [  # This event's drivers only
+        (driver_id, class_name, position, scored_points(position, points))
+        for driver_id, class_name, position, points in results
+    ])
+    dropped = old.keys() - new.keys()
+    series = get_event_store().get_by_id(event_id)["series"]
+    if settings.SCORING_POINTS_TABLE:
+        # Dropped rounds and countback can't be applied as deltas: rescore
+        # the drivers in this event from their (just updated) history
+        rescore_event(series, previous, results, names)
+        return dropped
+
+    zero = (0, 0, 0)
+    changes = {
+        key: tuple(n - o for n, o in zip(new.get(key, zero), old.get(key, zero)))
+        for key in new.keys() | old.keys()
+    }
+
+    # Global table: one (points, wins, seconds) change per driver
+    per_driver: Dict[int, List[int]] = {}
+    for (driver_id, _), delta in changes.items():
+        total_delta = per_driver.setdefault(driver_id, [0, 0, 0])
+        for i in range(3):
+            total_delta[i] += delta[i]
+    get_standings_engine().apply_results(
+        ((driver_id, points) for driver_id, (points, _, _) in per_driver.items()),
+        names=names,
+        finishes={driver_id: (wins, seconds) for driver_id, (_, wins, seconds) in per_driver.items()
+                  if wins or seconds},
+    )
+
+    # Per-series / per-class tables: the same changes, split by class
+    partitions = get_standings_partitions()
+    partitions.apply_event(series, changes, names)
+
+    # A re-upload can take a driver out of a class entirely; they then
+    # leave that class's tables unless another event still has them there
+    if dropped and not batch:
+        partitions.remove_entrants(await _departed_entrants(db, series, dropped))
+    return dropped
+
+
+async def replay_events(db: Database, event_ids: List[int]) -> None:
+    """
+    Re-read events whose results changed after the stores were filled
+    (a warm start or the snapshot writer catching up) and apply them
+    """
+    history = get_driver_history()
+    dropped: Dict[str, Set[Tuple[int, str]]] = {}  # series → (driver_id, class)
+    for event_id in event_ids:
+        results = await db.fetch_all(
+            "SELECT driver_id, class, position, points FROM results WHERE event_id = ?",
+            (event_id,),
+        )
+        driver_ids = sorted({row[0] for row in results})
+        names = dict(await db.fetch_all(
+            f"SELECT id, name FROM drivers WHERE id IN ({', '.join('?' * len(driver_ids))})",
+            driver_ids,
+        )) if driver_ids else {}
+        series = get_event_store().get_by_id(event_id)["series"]
+        dropped.setdefault(series, set()).update(await apply_event_results(
+            db, event_id, history.event_results(event_id), results, names, batch=True,
+        ))
+
+    # Only now does the database describe the stores' state (scored
+    # seasons were already redone per event, from the history)
+    for series, entrants in dropped.items():
+        if entrants:
+            get_standings_partitions().remove_entrants(
+                await _departed_entrants(db, series, entrants)
+            )
+
+
+# ==============================================================================
+# RESCORE - Points table seasons, patched for the drivers one event touches
+# ==============================================================================
+# With SCORING_POINTS_TABLE set, a driver's season is scored from all their
+# finishes (dropped rounds, countback), so an upload's effect can't be added
+# as a delta. Re-running the whole season (load_standings) would cost a
+# database read and a full computation per upload or live batch. Instead,
+# for every table the event counts towards:
+#
+# 1. the drivers in the event's old and new results are rescored from the
+#    driver history (app/models/scoring.py: driver_season)
+# 2. only the points totals they left or joined get new countback
+#    positions; drivers staying on those totals keep their relative order
+#    (countback_positions)
+#
+# With SCORING_DROP_WORST, every driver's dropped rounds depend on how
+# many events the table has - so a table the event joins or leaves is
+# rescored for all its drivers.
+
+def rescore_event(
+    series: str,
+    previous: Iterable[ResultTuple],
+    results: Iterable[ResultTuple],
+    names: Dict[int, str],
+) -> None:
+    """Rescore the drivers of one event's old and new results, in every table it counts towards"""
+    # Imported here so numpy is only loaded when scoring is switched on
+    from app.models.scoring import ScoringRules
+
+    rules = ScoringRules(settings.SCORING_POINTS_TABLE, settings.SCORING_DROP_WORST)
+    before = {tuple(row) for row in previous}
+    after = {tuple(row) for row in results}
+
+    # Table → drivers to rescore there (only rows that changed - a live
+    # batch passes the whole event); None is the overall table
+    touched: Dict[Optional[PartitionKey], Set[int]] = {}
+    for driver_id, class_name, _, _ in before ^ after:
+        for key in (None, *StandingsPartitions.keys_for(series, class_name)):
+            touched.setdefault(key, set()).add(driver_id)
+
+    def tables(rows: Set[tuple]) -> Set[Optional[PartitionKey]]:
+        return {key for _, class_name, _, _ in rows
+                for key in (None, *StandingsPartitions.keys_for(series, class_name))}
+
+    joined_or_left = tables(before) ^ tables(after)
+
+    partitions = get_standings_partitions()
+    for key, driver_ids in touched.items():
+        engine = get_standings_engine() if key is None else partitions.get(*key)
+        if rules.drop_worst and key in joined_or_left and engine is not None:
+            driver_ids = driver_ids | set(engine.driver_ids())
+        scores, tiebreaks, removed = _rescore_table(engine, key, driver_ids, rules)
+        if key is None:
+            get_standings_engine().set_scores(scores, tiebreaks, names)
+        else:
+            partitions.set_scores(key, scores, tiebreaks, names, removed)
+
+
+def _rescore_table(engine, key, driver_ids: Set[int], rules) -> tuple:
+    """(scores, tiebreaks, removed) for StandingsEngine.set_scores() on one table"""
+    import numpy as np                              # Scoring mode only - see app/models/scoring.py
+    from app.models.scoring import countback_positions, driver_season
+
+    history, store = get_driver_history(), get_event_store()
+    series, class_name = key if key is not None else (None, None)
+
+    def in_table(event_id: int, event_class: str) -> bool:
+        return ((series is None or store.get_by_id(event_id)["series"] == series)
+                and (class_name is None or event_class == class_name))
+
+    n_events = 0
+    if rules.drop_worst:
+        n_events = sum(
+            any(in_table(event_id, event_class) for event_class in classes)
+            for event_id, classes in history.event_classes().items()
+        )
+
+    def season(driver_id: int) -> Optional[tuple]:
+        finishes = [(event_id, position) for event_id, event_class, position
+                    in history.finishes(driver_id) if in_table(event_id, event_class)]
+        if not finishes and key is not None:
+            return None                             # Not an entrant of this table (any more)
+        return driver_season(finishes, n_events, rules)
+
+    rescored = {driver_id: season(driver_id) for driver_id in driver_ids}
+    old = engine.scores(driver_ids) if engine is not None else {}
+    removed = [driver_id for driver_id, found in rescored.items()
+               if found is None and driver_id in old]
+    rescored = {driver_id: found for driver_id, found in rescored.items() if found is not None}
+
+    # Countback positions on every total a rescored driver left or joined -
+    # one vectorized pass over the table's columns, not a loop per driver
+    totals = {points for points, _ in old.values()} | {found[0] for found in rescored.values()}
+    if engine is not None:
+        ids, points, positions = (np.frombuffer(column, dtype="l") for column in engine.columns())
+    else:
+        ids = points = positions = np.zeros(0, dtype="l")   # New partition table
+    staying = ~np.isin(ids, np.fromiter(driver_ids, dtype="l", count=len(driver_ids)))
+    tiebreaks: Dict[int, int] = {}
+    for total in totals:
+        on_total = staying & (points == total)
+        incoming = {driver_id: found[3] for driver_id, found in rescored.items() if found[0] == total}
+        tiebreaks.update(countback_positions(
+            ids[on_total], positions[on_total], incoming, lambda driver_id: season(driver_id)[3],
+        ))
+
+    scores = {driver_id: found[:3] for driver_id, found in rescored.items()}
+    return scores, tiebreaks, removed
+
+
+async def _departed_entrants(
+    db: Database,
+    series: str,
+    dropped: Set[Tuple[int, str]],
+) -> List[Tuple[PartitionKey, int]]:
+    """(partition key, driver_id) pairs with no results left in that partition"""
+    driver_ids = sorted({driver_id for driver_id, _ in dropped})
+    remaining = await db.fetch_all(
+        "SELECT driver_id, event_id, class FROM results "
+        f"WHERE driver_id IN ({', '.join('?' * len(driver_ids))})",
+        driver_ids,
+    )
+    store = get_event_store()
+    still_in = {
+        (key, driver_id)
+        for driver_id, other_event, class_name in remaining
+        for key in StandingsPartitions.keys_for(store.get_by_id(other_event)["series"], class_name)
+    }
+    return [
+        (key, driver_id)
+        for driver_id, class_name in dropped
+        for key in StandingsPartitions.keys_for(series, class_name)
+        if (key, driver_id) not in still_in
+    ]
+
+
+def _contribution(points: int, position: int) -> Tuple[int, int, int]:
+    """(points, wins, seconds) one result adds to a driver's season"""
+    return int(points), int(position == 1), int(position == 2)
@@ -0,0 +1,282 @@
+# ==============================================================================
+# SCORING - Season points from finishing positions, in one NumPy pass
+# ==============================================================================
+# Championships award points by finishing position (a "points table"), can
+# drop each driver's worst N rounds, and break ties by countback: most wins,
+# then most second places, then most thirds, and so on.
+#
+# Everything is computed on a results matrix - one row per driver, one
+# column per event, each cell the driver's finishing position (0 = did not
+# score). No Python loop runs per result:
+#
+#   points per cell   table lookup:      lut[positions]
+#   drop worst N      partial sort:      np.partition(points, N)
+#   countback         each row's finishes sorted best-first
+#   final order       one argsort over (total, sorted finishes) packed into
+#                     a single bytes key per driver
+#
+# A season of 1,000 drivers × 20 rounds takes a few milliseconds
+# (benchmarks/bench_season_points.py).
+#
+# After a single upload only a few drivers' seasons change, so the
+# standings are patched with the per-driver versions at the bottom of
+# this file (driver_season, countback_positions) instead of recomputing
+# the whole matrix - see app/models/results.py.
+# ==============================================================================
+
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+
+class ScoringRules(NamedTuple):
+    """How finishing positions turn into season points"""
+
+    points_table: Sequence[int]                    # Points for P1, P2, ...
+    drop_worst: int = 0                            # Worst rounds not counted
+
+
+class SeasonResult(NamedTuple):
+    """Per-driver columns (same order as the matrix rows) plus the ranking"""
+
+    totals: np.ndarray                             # Season points after drops
+    wins: np.ndarray                               # Finishes in P1
+    seconds: np.ndarray                            # Finishes in P2
+    order: np.ndarray                              # Row indices, champion first
+    positions: np.ndarray                          # [rank] = championship position
+
+
+# ==============================================================================
+# RESULTS MATRIX
+# ==============================================================================
+
+def build_results_matrix(
+    driver_ids: Sequence[int],
+    results: Iterable[Tuple[int, int, int]],
+) -> np.ndarray:
+    """
+    Positions matrix of shape (len(driver_ids), number of events)
+
+    Args:
+        driver_ids: every driver in the championship; row i is driver_ids[i]
+        results:    (driver_id, event_id, position) rows. A driver entered in
+                    several classes of one event keeps their best finish.
+    """
+    data = np.fromiter(chain.from_iterable(results), dtype=np.int64).reshape(-1, 3)
+    ids = np.asarray(driver_ids, dtype=np.int64)
+    events = np.unique(data[:, 1])
+    rows = _index_of(ids, data[:, 0])
+    columns = _index_of(events, data[:, 1])
+
+    sentinel = np.iinfo(np.int32).max
+    matrix = np.full((len(ids), len(events)), sentinel, dtype=np.int32)
+    np.minimum.at(matrix, (rows, columns), data[:, 2])
+    matrix[matrix == sentinel] = 0
+    return matrix
+
+
+def _index_of(keys: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Position of each of `values` in `keys` (every value must be present)"""
+    if len(keys) and keys.min() >= 0 and keys.max() < 4 * len(keys) + 1024:
+        # Database ids are small and dense: a direct lookup table
+        table = np.empty(keys.max() + 1, dtype=np.int64)
+        table[keys] = np.arange(len(keys))
+        return table[values]
+    order = np.argsort(keys)
+    return order[np.searchsorted(keys, values, sorter=order)]
+
+
+# ==============================================================================
+# SEASON COMPUTATION
+# ==============================================================================
+
+def compute_season(positions: np.ndarray, rules: ScoringRules) -> SeasonResult:
+    """Season totals, countback counts and final order for a positions matrix"""
+    n_drivers, n_events = positions.shape
+    deepest = max(int(positions.max(initial=0)), len(rules.points_table))
+
+    # Points per cell: lut[0] = 0 (did not score), lut[k] = points for Pk
+    lut = np.zeros(deepest + 1, dtype=np.int64)
+    lut[1:len(rules.points_table) + 1] = rules.points_table
+    points = lut[positions]
+
+    totals = points.sum(axis=1)
+    drop = min(rules.drop_worst, n_events)
+    if drop:
+        # Only the `drop` smallest per row are needed, not a full sort
+        worst = np.partition(points, drop - 1, axis=1)[:, :drop]
+        totals -= worst.sum(axis=1)
+
+    # Countback ("most wins, then most seconds, ...") is the same as
+    # comparing each driver's finishes sorted best-first, with non-scores
+    # last: [1, 2, 9] beats [1, 3, 5] because it has more second places
+    finishes = np.where(positions > 0, positions, np.iinfo(np.int32).max)
+    finishes.sort(axis=1)
+
+    # One sortable key per driver, then ONE sort for the whole field
+    keys = _ranking_keys(totals, finishes)
+    order = np.argsort(keys, kind="stable")
+
+    # Drivers level on points AND on countback share a position
+    ranked = keys[order]
+    differs = np.ones(n_drivers, dtype=bool)
+    differs[1:] = ranked[1:] != ranked[:-1]
+    standing = np.maximum.accumulate(np.where(differs, np.arange(1, n_drivers + 1), 0))
+
+    return SeasonResult(
+        totals=totals,
+        wins=(positions == 1).sum(axis=1),
+        seconds=(positions == 2).sum(axis=1),
+        order=order,
+        positions=standing,
+    )
+
+
+def _ranking_keys(totals: np.ndarray, finishes: np.ndarray) -> np.ndarray:
+    """
+    Pack (total, sorted finishes) into one fixed-width bytes key per driver
+
+    The total is flipped (max - total, so more points sorts first) and
+    every column is stored as a big-endian unsigned int, so comparing the
+    raw bytes compares the columns in order - the whole countback becomes
+    a single sort.
+    """
+    packed = np.empty((len(totals), 1 + finishes.shape[1]), dtype=">u4")
+    packed[:, 0] = totals.max(initial=0) - totals
+    packed[:, 1:] = finishes
+    return packed.view(np.dtype((np.void, packed.shape[1] * packed.itemsize))).ravel()
+
+
+def season_rows(
+    drivers: Sequence[Tuple[int, str]],
+    results: Iterable[Tuple[int, int, int]],
+    rules: ScoringRules,
+) -> List[Tuple[int, str, int, int, int, int]]:
+    """
+    (driver_id, name, points, wins, seconds, tiebreak) rows for the
+    standings engine, where tiebreak is the driver's countback position
+    among the drivers on the same points (1 = best of them)
+    """
+    season = compute_season(
+        build_results_matrix([driver_id for driver_id, _ in drivers], results), rules,
+    )
+    # Championship position minus the drivers with more points
+    standing = np.empty(len(drivers), dtype=np.int64)
+    standing[season.order] = season.positions
+    totals = np.sort(season.totals)
+    ahead = len(drivers) - np.searchsorted(totals, season.totals, side="right")
+    tiebreak = standing - ahead
+    return [
+        (driver_id, name, points, wins, seconds, rank)
+        for (driver_id, name), points, wins, seconds, rank in zip(
+            drivers, season.totals.tolist(), season.wins.tolist(),
+            season.seconds.tolist(), tiebreak.tolist(),
+        )
+    ]
+
+
+# ==============================================================================
+# INCREMENTAL RESCORE - One driver at a time, same rules as compute_season()
+# ==============================================================================
+# A driver's countback key is their best finish per event, sorted, then
+# COUNTBACK_END. Python compares tuples item by item, so comparing two keys
+# is the matrix's row comparison: [1, 3] + END loses to [1, 3, 5] + END
+# just as [1, 3, MAX] loses to [1, 3, 5].
+
+COUNTBACK_END = np.iinfo(np.int32).max
+
+
+def driver_season(
+    finishes: Iterable[Tuple[int, int]],
+    n_events: int,
+    rules: ScoringRules,
+) -> Tuple[int, int, int, tuple]:
+    """
+    (points, wins, seconds, countback key) of one driver
+
+    Args:
+        finishes: (event_id, position) of the driver's results in the table
+        n_events: events with results in the table (for dropped rounds)
+    """
+    best: Dict[int, int] = {}
+    for event_id, position in finishes:
+        if position < best.get(event_id, COUNTBACK_END):
+            best[event_id] = position
+    table = rules.points_table
+    scored = [table[position - 1] if position <= len(table) else 0 for position in best.values()]
+    total = sum(scored)
+    drop = min(rules.drop_worst, n_events)
+    if drop:
+        # Rounds the driver missed count as 0 and are dropped first
+        missed = min(drop, n_events - len(scored))
+        total -= sum(sorted(scored)[:drop - missed])
+    positions = sorted(best.values())
+    return total, positions.count(1), positions.count(2), (*positions, COUNTBACK_END)
+
+
+def countback_positions(
+    staying_ids: np.ndarray,
+    staying_positions: np.ndarray,
+    incoming: Dict[int, tuple],
+    key_of: Callable[[int], tuple],
+) -> Dict[int, int]:
+    """
+    New countback positions (1 = best) of the drivers on one points total
+
+    Args:
+        staying_ids, staying_positions: drivers already on the total whose
+                  results didn't change, and their current countback
+                  positions - their order among themselves is known
+        incoming: driver_id → countback key of drivers new to the total or
+                  rescored
+        key_of:   driver_id → countback key, for staying drivers; only
+                  called O(log n) times per incoming driver
+
+    Returns the position of every incoming driver and of every staying
+    driver whose position changed. Apart from the key lookups everything
+    is vectorized - the total can hold most of the field (e.g. 0 points).
+    """
+    order = np.argsort(staying_positions, kind="stable")
+    ids, current = staying_ids[order], staying_positions[order]
+    # Levels: runs of staying drivers level on countback, best first
+    level_positions, level_starts, level_of = np.unique(
+        current, return_index=True, return_inverse=True,
+    )
+    keys: Dict[int, tuple] = {}
+
+    def level_key(level: int) -> tuple:
+        found = keys.get(level)
+        if found is None:
+            found = keys[level] = key_of(int(ids[level_starts[level]]))
+        return found
+
+    # Place each incoming driver: `lo` = first level not better than it
+    n_levels = len(level_positions)
+    placed = []                                     # (driver_id, key, staying ahead, first level behind)
+    lo = 0
+    for driver_id, key in sorted(incoming.items(), key=lambda entry: entry[1]):
+        hi = n_levels
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if level_key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        level_equal = lo < n_levels and level_key(lo) == key
+        ahead = int(level_starts[lo]) if lo < n_levels else len(ids)
+        placed.append((driver_id, key, ahead, lo + level_equal))
+
+    positions: Dict[int, int] = {}
+    incoming_ahead, previous_key = 0, None
+    for rank, (driver_id, key, ahead, _) in enumerate(placed):
+        if key != previous_key:
+            incoming_ahead, previous_key = rank, key
+        positions[driver_id] = 1 + ahead + incoming_ahead
+
+    # Staying drivers: staying ahead of their level + incoming ahead of it
+    behind = np.sort(np.array([first for *_, first in placed], dtype=np.intp))
+    new = level_starts[level_of] + 1 + np.searchsorted(behind, level_of, side="right")
+    changed = np.flatnonzero(new != current)
+    positions.update(zip(ids[changed].tolist(), new[changed].tolist()))
+    return positions
@@ -0,0 +1,424 @@
+# ==============================================================================
+# SEARCH INDEX - Typeahead over driver and event names
+# ==============================================================================
+# Finds drivers and events by (part of) their name, fast enough to run on
+# every keystroke. Two indexes over the same names:
+#
+# - Prefix trie:   every word of every name, one letter per level. Typing
+#                  "jan" walks 3 levels and finds "jane", "janssen", ...
+#                  Cost: the length of what was typed, not the number of names.
+# - Trigram index: every 3-letter chunk ("ral", "all", "lly"...) of every
+#                  distinct word → the words containing it. Catches what a
+#                  prefix can't: the middle of a word ("cross" → "rallycross")
+#                  and typos ("ralycross"), ranked by how many chunks are
+#                  shared.
+#
+# Both index WORDS, and each word points at the names that contain it.
+# Thousands of drivers share a few hundred first and last names, so the
+# indexes stay small and a lookup touches few entries.
+#
+# Prefix matches come first; trigram matches fill any remaining slots.
+#
+# The index is built once when data is loaded (load_from_database /
+# apply_snapshot) and updated incrementally afterwards: an upload only
+# re-indexes the drivers whose names it added or changed.
+# ==============================================================================
+
+import math
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+_WORD = re.compile(r"\w+")
+
+# Trigram matches must share at least this fraction of their trigrams with
+# the query (same default as PostgreSQL's pg_trgm similarity threshold)
+SIMILARITY_THRESHOLD = 0.3
+
+# Upper bound on candidate names examined per query, so a very common
+# prefix or trigram can't make one keystroke expensive
+MAX_CANDIDATES = 512
+
+DRIVER, EVENT = "driver", "event"
+
+
+def words(text: str) -> List[str]:
+    """'Rallycross #71, points event #4' → ['rallycross', '71', 'points', 'event', '4']"""
+    return _WORD.findall(text.casefold())
+
+
+def trigrams(text: str) -> Set[str]:
+    """3-letter chunks of each word, padded so word starts and ends count"""
+    grams: Set[str] = set()
+    for word in words(text):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+# Documents are small ints: driver ids are even, event ids odd, so one
+# set can hold both kinds
+def _doc(kind: str, item_id: int) -> int:
+    return item_id * 2 + (kind == EVENT)
+
+
+def _kind(doc: int) -> str:
+    return EVENT if doc & 1 else DRIVER
+
+
+# ==============================================================================
+# PREFIX TRIE - Words, one letter per level
+# ==============================================================================
+
+class _TrieNode:
+    __slots__ = ("children", "docs")
+
+    def __init__(self):
+        self.children: Optional[Dict[str, "_TrieNode"]] = None  # Only when needed
+        self.docs: Optional[Set[int]] = None       # Docs with the word ending here
+
+
+class PrefixTrie:
+    """Words → documents, searchable by any prefix of the word"""
+
+    def __init__(self):
+        self.root = _TrieNode()
+
+    def add(self, word: str, doc: int) -> bool:
+        """Index `word` for `doc`; True if the word is new to the trie"""
+        node = self.root
+        for char in word:
+            if node.children is None:
+                node.children = {}
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            node = child
+        new_word = not node.docs
+        if node.docs is None:
+            node.docs = set()
+        node.docs.add(doc)
+        return new_word
+
+    def remove(self, word: str, doc: int) -> bool:
+        """Un-index `word` for `doc`; True if no document has the word any more"""
+        path = [self.root]
+        for char in word:
+            children = path[-1].children
+            if children is None or char not in children:
+                return False
+            path.append(children[char])
+        end = path[-1]
+        if not end.docs or doc not in end.docs:
+            return False
+        end.docs.discard(doc)
+        if end.docs:
+            return False
+        end.docs = None
+        # Prune branches that no longer lead to any word
+        for depth in range(len(word), 0, -1):
+            node = path[depth]
+            if node.docs or node.children:
+                break
+            parent = path[depth - 1]
+            del parent.children[word[depth - 1]]
+            if not parent.children:
+                parent.children = None
+        return True
+
+    def find(self, prefix: str) -> Optional[_TrieNode]:
+        node = self.root
+        for char in prefix:
+            if node.children is None:
+                return None
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    @staticmethod
+    def collect(node: _TrieNode, limit: int, wanted: Callable[[int], bool]) -> List[Tuple[int, int]]:
+        """
+        Up to `limit` (depth, doc) pairs below `node`, shortest words first
+
+        Breadth-first, so an exact word ("ann", depth 0) is found before
+        longer completions ("annika", depth 3). The walk stops once `limit`
+        docs are found or MAX_CANDIDATES docs have been looked at.
+        """
+        found: List[Tuple[int, int]] = []
+        seen: Set[int] = set()
+        level, depth = [node], 0
+        while level:
+            next_level = []
+            for current in level:
+                for doc in current.docs or ():
+                    if doc in seen:
+                        continue
+                    seen.add(doc)
+                    if wanted(doc):
+                        found.append((depth, doc))
+                        if len(found) == limit:
+                            return found
+                    if len(seen) == MAX_CANDIDATES:
+                        return found
+                if current.children:
+                    next_level.extend(current.children.values())
+            level, depth = next_level, depth + 1
+        return found
+
+
+# ==============================================================================
+# SEARCH INDEX
+# ==============================================================================
+
+class SearchIndex:
+    """
+    Driver and event names, indexed for prefix and trigram search
+
+    Build it with sync_drivers() / sync_events(); they only re-index names
+    that are new or changed, so calling them again after a reload is cheap.
+    """
+
+    def __init__(self):
+        self._names: Dict[int, str] = {}           # doc → display name
+        self._words: Dict[int, Tuple[str, ...]] = {}  # doc → its distinct words
+        self._dates: Dict[int, str] = {}           # event doc → ISO date
+        self._trie = PrefixTrie()
+        self._trigrams: Dict[str, Set[str]] = {}   # trigram → words containing it
+        self._gram_counts: Dict[str, int] = {}     # word → its number of trigrams
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    # ------------------------------------------------------------------
+    # UPDATES
+    # ------------------------------------------------------------------
+
+    def _add(self, doc: int, name: str) -> None:
+        self._names[doc] = name
+        self._words[doc] = doc_words = tuple(dict.fromkeys(words(name)))
+        for word in doc_words:
+            if self._trie.add(word, doc):
+                grams = trigrams(word)
+                self._gram_counts[word] = len(grams)
+                for gram in grams:
+                    self._trigrams.setdefault(gram, set()).add(word)
+
+    def _remove(self, doc: int) -> None:
+        name = self._names.pop(doc, None)
+        if name is None:
+            return
+        self._dates.pop(doc, None)
+        for word in self._words.pop(doc):
+            if self._trie.remove(word, doc):
+                del self._gram_counts[word]
+                for gram in trigrams(word):
+                    vocabulary = self._trigrams[gram]
+                    vocabulary.discard(word)
+                    if not vocabulary:
+                        del self._trigrams[gram]
+
+    def _set(self, doc: int, name: str) -> None:
+        if self._names.get(doc) != name:
+            self._remove(doc)
+            self._add(doc, name)
+
+    def set_drivers(self, drivers: Iterable[Tuple[int, str]]) -> None:
+        """Add or rename drivers: (driver_id, name) pairs"""
+        for driver_id, name in drivers:
+            self._set(_doc(DRIVER, driver_id), name)
+
+    def _sync(self, kind: str, items: Dict[int, str]) -> None:
+        """Make this kind's documents exactly `items` (doc → name)"""
+        stale = [doc for doc in self._names if _kind(doc) == kind and doc not in items]
+        for doc in stale:
+            self._remove(doc)
+        for doc, name in items.items():
+            self._set(doc, name)
+
+    def sync_drivers(self, drivers: Iterable[Tuple[int, str]]) -> None:
+        """Index exactly these (driver_id, name) drivers"""
+        self._sync(DRIVER, {_doc(DRIVER, driver_id): name for driver_id, name in drivers})
+
+    def sync_events(self, events: Iterable[dict]) -> None:
+        """Index exactly these events (dicts with id, name, date)"""
+        events = list(events)
+        self._sync(EVENT, {_doc(EVENT, e["id"]): e["name"] for e in events})
+        for event in events:
+            self._dates[_doc(EVENT, event["id"])] = event["date"]
+
+    # ------------------------------------------------------------------
+    # QUERIES
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 10, kind: Optional[str] = None) -> List[dict]:
+        """
+        Best matches for `query`, prefix matches first
+
+        Args:
+            query: what the user has typed so far
+            limit: most results to return
+            kind:  "driver" or "event" to search only one kind
+        """
+        terms = words(query)
+        if not terms or limit <= 0:
+            return []
+        wanted = (lambda doc: True) if kind is None else (lambda doc: _kind(doc) == kind)
+
+        # A few more candidates than needed, so whole-name matches can be
+        # ranked above names that merely contain a matching word
+        typed = query.casefold().strip()
+        names = self._names
+
+        def rank(match: Tuple[int, int]) -> tuple:
+            depth, doc = match
+            name = names[doc].casefold()
+            starts = 0 if name == typed else 1 if name.startswith(typed) else 2
+            return starts, depth, len(name), name
+
+        matches = self._prefix_matches(terms, min(limit * 2, MAX_CANDIDATES), wanted)
+        results = [doc for _, doc in sorted(matches, key=rank)[:limit]]
+
+        if len(results) < limit and sum(map(len, terms)) >= 3:
+            taken = set(results)
+            for doc in self._fuzzy_matches(terms, limit, wanted):
+                if doc not in taken:
+                    results.append(doc)
+                    if len(results) == limit:
+                        break
+
+        return [self._result(doc) for doc in results]
+
+    def _prefix_matches(
+        self, terms: List[str], limit: int, wanted: Callable[[int], bool],
+    ) -> List[Tuple[int, int]]:
+        """(depth, doc) where every term starts one of the name's words"""
+        nodes = [self._trie.find(term) for term in terms]
+        if any(node is None for node in nodes):
+            return []
+        # Walk the longest (usually the most specific) term; check the
+        # other terms on each candidate
+        lead = max(range(len(terms)), key=lambda i: len(terms[i]))
+        if len(terms) == 1:
+            return self._trie.collect(nodes[lead], limit, wanted)
+        others = terms[:lead] + terms[lead + 1:]
+
+        def covers(doc: int) -> bool:
+            if not wanted(doc):
+                return False
+            name_words = self._words[doc]
+            for term in others:
+                for word in name_words:
+                    if word.startswith(term):
+                        break
+                else:
+                    return False
+            return True
+
+        return self._trie.collect(nodes[lead], limit, covers)
+
+    def _similar_words(self, term: str) -> List[Tuple[float, str]]:
+        """(similarity, word) for indexed words like `term`, most similar first"""
+        postings = self._trigrams
+        grams = sorted(trigrams(term), key=lambda g: len(postings.get(g, ())))
+        # A word sharing `needed` of the term's trigrams must contain at
+        # least one of the (len - needed + 1) RAREST ones, so only those
+        # posting lists are scanned for candidates
+        needed = max(1, math.ceil(SIMILARITY_THRESHOLD * len(grams)))
+        candidates: Set[str] = set()
+        for gram in grams[:len(grams) - needed + 1]:
+            candidates.update(postings.get(gram, ()))
+
+        similar = []
+        for word in candidates:
+            shared = sum(1 for gram in grams if word in postings.get(gram, ()))
+            similarity = shared / (len(grams) + self._gram_counts[word] - shared)
+            if similarity >= SIMILARITY_THRESHOLD:
+                similar.append((similarity, word))
+        similar.sort(reverse=True)
+        return similar
+
+    def _fuzzy_matches(
+        self, terms: List[str], limit: int, wanted: Callable[[int], bool],
+    ) -> List[int]:
+        """Up to `limit` docs matching every term by similarity, best first"""
+        # term → {similar word: similarity}; terms too short for trigrams
+        # are matched as word prefixes instead (empty dict)
+        similar: List[Dict[str, float]] = []
+        for term in terms:
+            if len(term) < 3:
+                similar.append({})
+                continue
+            words_like = dict((word, sim) for sim, word in self._similar_words(term))
+            if not words_like:
+                return []
+            similar.append(words_like)
+        if all(word.startswith(term) for term, words_like in zip(terms, similar) for word in words_like):
+            return []                               # Nothing the prefix search didn't try
+
+        def score(doc: int) -> float:
+            """Sum of each term's best word similarity; 0 if a term is missing"""
+            name_words = self._words[doc]
+            total = 0.0
+            for term, words_like in zip(terms, similar):
+                best = 0.0
+                for word in name_words:
+                    if words_like:
+                        best = max(best, words_like.get(word, 0.0))
+                    elif word.startswith(term):
+                        best = 1.0
+                if not best:
+                    return 0.0
+                total += best
+            return total
+
+        # Walk the docs of the term with the fewest candidates, most similar
+        # word first, and stop once enough matches are found
+        def candidates(i: int) -> int:
+            return sum(len(self._trie.find(word).docs) for word in similar[i])
+
+        fuzzy_terms = [i for i in range(len(terms)) if similar[i]]
+        if not fuzzy_terms:
+            return []
+        lead = min(fuzzy_terms, key=candidates)
+        wanted_count = min(limit * 2, MAX_CANDIDATES)
+        scored = []
+        seen: Set[int] = set()
+        for similarity, word in sorted(((sim, w) for w, sim in similar[lead].items()), reverse=True):
+            for doc in self._trie.find(word).docs:
+                if doc in seen or not wanted(doc):
+                    continue
+                seen.add(doc)
+                total = score(doc)
+                if total:
+                    name = self._names[doc]
+                    scored.append((-total, len(name), name, doc))
+                if len(scored) >= wanted_count or len(seen) >= 4 * MAX_CANDIDATES:
+                    break
+            else:
+                continue
+            break                                   # Inner loop stopped early
+        scored.sort()
+        return [doc for *_, doc in scored[:limit]]
+
+    def _result(self, doc: int) -> dict:
+        if _kind(doc) == DRIVER:
+            return {"type": DRIVER, "id": doc // 2, "name": self._names[doc]}
+        return {"type": EVENT, "id": doc // 2, "name": self._names[doc], "date": self._dates[doc]}
+
+
+# ==============================================================================
+# CURRENT INDEX - Shared by every request in this process
+# ==============================================================================
+
+_index = SearchIndex()
+
+
+def get_search_index() -> SearchIndex:
+    """Return the search index for this process"""
+    return _index
+
+
+def publish_search_index(index: SearchIndex) -> None:
+    """Swap in an index built elsewhere (e.g. in a thread)"""
+    global _index
+    _index = index
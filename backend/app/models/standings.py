@@ -0,0 +1,737 @@
+# ==============================================================================
+# STANDINGS ENGINE - Incrementally maintained championship standings
+# ==============================================================================
+# This file keeps every driver's season points and answers "what position is
+# driver X in?" without re-sorting the whole field.
+#
+# How it works:
+# - Point totals, wins and names live in compact typed arrays (one slot per
+#   driver) - no dict per driver, rows are only built for a response
+# - A Fenwick tree (a.k.a. binary indexed tree) counts how many drivers
+#   have each points total, so "how many drivers are ahead of me?" is a
+#   prefix sum - O(log n) instead of sorting everyone
+# - Posting an event's results touches only the k drivers who scored:
+#   O(k log n) per event instead of O(n log n)
+# ==============================================================================
+
+from array import array                            # Compact typed arrays
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# ==============================================================================
+# SEED DATA - Standings served until real results are posted
+# ==============================================================================
+
+SEED_DRIVERS = [
+    # (driver_id, name, points)
+    (1, "Placeholder Driver 1", 100),
+    (2, "Placeholder Driver 2", 85),
+    (3, "Placeholder Driver 3", 70),
+    (4, "Placeholder Driver 4", 60),
+    (5, "Placeholder Driver 5", 50),
+]
+
+
+# ==============================================================================
+# FENWICK TREE - Counts drivers per points total
+# ==============================================================================
+
+class FenwickTree:
+    """
+    Binary indexed tree over points values 0..size-1
+
+    add(points, +1) registers a driver with that total, and
+    count_at_most(points) returns how many drivers have <= points.
+    Both are O(log size). The tree doubles in size when a total outgrows it;
+    totals are bounded by the number of events times RESULT_MAX_POINTS.
+    """
+
+    def __init__(self, size: int = 1024):
+        # Always a power of two, so _grow() can keep the existing nodes
+        self._size = 1 << max(0, size - 1).bit_length()
+        self._tree = array("l", [0]) * (self._size + 1)   # 1-based internally
+        self.total = 0                              # Number of entries
+
+    def _grow(self, needed: int) -> None:
+        """
+        Double until `needed` fits - O(new size), no re-adding
+
+        Node i counts the values in (i - lowbit(i), i], which doesn't depend
+        on the tree size: every old node stays valid. Of the new nodes,
+        the power-of-two ones cover all old values and the rest cover none.
+        """
+        old_size, new_size = self._size, self._size
+        while new_size <= needed:
+            new_size *= 2
+        tree = self._tree
+        tree.frombytes(bytes(tree.itemsize * (new_size - old_size)))
+        node = old_size * 2
+        while node <= new_size:
+            tree[node] = self.total
+            node *= 2
+        self._size = new_size
+
+    def add(self, value: int, delta: int) -> None:
+        """Add `delta` drivers at points total `value`"""
+        if value < 0:
+            raise ValueError("Points totals cannot be negative")
+        if value >= self._size:
+            self._grow(value)
+        self.total += delta
+        i = value + 1
+        tree, size = self._tree, self._size
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def count_at_most(self, value: int) -> int:
+        """How many drivers have a points total <= value"""
+        if value < 0:
+            return 0
+        i = min(value, self._size - 1) + 1
+        tree, result = self._tree, 0
+        while i > 0:
+            result += tree[i]
+            i -= i & -i
+        return result
+
+
+# ==============================================================================
+# SLOT INDEX - driver_id → array slot without a dict entry per driver
+# ==============================================================================
+
+class SlotIndex:
+    """
+    Maps driver ids to array slots
+
+    Driver ids are database keys, so they are small and mostly dense: they
+    are stored in a flat typed array indexed by the id itself (4 bytes per
+    id). Ids too large for that fall back to an ordinary dict.
+    """
+
+    DENSE_LIMIT = 1 << 20                          # Ids below this use the array
+
+    def __init__(self):
+        self._dense = array("i")                   # driver_id → slot + 1 (0 = absent)
+        self._sparse: Dict[int, int] = {}
+
+    def get(self, driver_id: int, default: Optional[int] = None) -> Optional[int]:
+        if 0 <= driver_id < len(self._dense):
+            slot = self._dense[driver_id] - 1
+            return default if slot < 0 else slot
+        return self._sparse.get(driver_id, default)
+
+    def __getitem__(self, driver_id: int) -> int:
+        slot = self.get(driver_id)
+        if slot is None:
+            raise KeyError(driver_id)
+        return slot
+
+    def __setitem__(self, driver_id: int, slot: int) -> None:
+        if 0 <= driver_id < self.DENSE_LIMIT:
+            dense = self._dense
+            if driver_id >= len(dense):
+                # Grow by doubling (zero-filled) - amortized O(1) per id
+                new_size = min(self.DENSE_LIMIT, max(driver_id + 1, 2 * len(dense)))
+                dense.frombytes(bytes(dense.itemsize * (new_size - len(dense))))
+            dense[driver_id] = slot + 1
+        else:
+            self._sparse[driver_id] = slot
+
+    def __contains__(self, driver_id: int) -> bool:
+        return self.get(driver_id) is not None
+
+    def __delitem__(self, driver_id: int) -> None:
+        if 0 <= driver_id < len(self._dense):
+            self._dense[driver_id] = 0
+        else:
+            self._sparse.pop(driver_id, None)
+
+
+# ==============================================================================
+# NAME TABLE - Driver names packed into one buffer
+# ==============================================================================
+
+class NameTable:
+    """
+    slot → driver name, stored as UTF-8 in one shared bytearray
+
+    A Python str costs ~50 bytes of overhead before its first character;
+    here a name costs its UTF-8 bytes plus 12 bytes of (offset, length).
+    The str is only created when a row is serialized.
+    """
+
+    def __init__(self):
+        self._data = bytearray()
+        self._offsets = array("l")                 # slot → start in _data
+        self._lengths = array("i")                 # slot → byte length
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, slot: int) -> str:
+        start = self._offsets[slot]
+        return self._data[start:start + self._lengths[slot]].decode("utf-8")
+
+    def _store(self, name: str) -> Tuple[int, int]:
+        raw = name.encode("utf-8")
+        start = len(self._data)
+        self._data += raw
+        return start, len(raw)
+
+    def append(self, name: str) -> None:
+        start, length = self._store(name)
+        self._offsets.append(start)
+        self._lengths.append(length)
+
+    def move(self, source: int, target: int) -> None:
+        """Copy slot `source`'s name to slot `target`"""
+        self._offsets[target] = self._offsets[source]
+        self._lengths[target] = self._lengths[source]
+
+    def pop(self) -> None:
+        """Forget the last slot"""
+        self._offsets.pop()
+        self._lengths.pop()
+
+    def pinned(self) -> "NameTable":
+        """A copy frozen as of now: shares the append-only bytes, copies the slot arrays"""
+        view = NameTable.__new__(NameTable)
+        view._data = self._data
+        view._offsets = self._offsets[:]
+        view._lengths = self._lengths[:]
+        return view
+
+    def rename(self, slot: int, name: str) -> None:
+        # The old bytes stay behind until the next load(); renames are rare
+        if self[slot] != name:
+            self._offsets[slot], self._lengths[slot] = self._store(name)
+
+
+# ==============================================================================
+# STANDINGS ENGINE
+# ==============================================================================
+
+class StandingsEngine:
+    """
+    Season standings with O(log n) position lookups
+
+    Drivers tied on points are split by their `tiebreak`: the countback
+    position among the drivers on the same points (1 = best; set when a
+    points table scores the season, see app/models/scoring.py). Drivers
+    level on both share a position (1, 2, 2, 4 ...); without countback
+    (tiebreak 0) a points tie is a shared position. Within a shared
+    position the table lists drivers by wins, then second places, then
+    name.
+    `version` goes up every time the standings change, so callers can tell
+    whether anything they cached is stale.
+
+    Storage is columnar: one typed array per field, indexed by "slot", and
+    driver names packed into a separate NameTable. A row dict is only
+    built when a response is serialized - nothing per-driver is kept as a
+    Python object.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._slot = SlotIndex()                   # driver_id → array slot
+        self._ids = array("l")                     # slot → driver_id
+        self._points = array("l")                  # slot → season points
+        self._wins = array("l")                    # slot → first places
+        self._seconds = array("l")                 # slot → second places (tie-break)
+        self._tiebreak = array("l")                # slot → countback position on equal points (0 = none)
+        self._names = NameTable()                  # slot → driver name
+        self._tree = FenwickTree()
+        # (version, order, positions): slots best-first + their positions
+        self._ranking: Optional[Tuple[int, array, array]] = None
+        # (version, ids, points, wins, names): columns frozen for pinned_ranked()
+        self._pinned: Optional[tuple] = None
+        self._listeners: List[Callable[[], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, driver_id: int) -> bool:
+        return driver_id in self._slot
+
+    # ------------------------------------------------------------------
+    # CHANGE NOTIFICATIONS
+    # ------------------------------------------------------------------
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """Call `listener()` after every change (e.g. the SSE broadcaster)"""
+        self._listeners.append(listener)
+
+    def _changed(self) -> None:
+        self.version += 1
+        for listener in self._listeners:
+            listener()
+
+    # ------------------------------------------------------------------
+    # WRITES
+    # ------------------------------------------------------------------
+
+    def _append(
+        self, driver_id: int, name: str, points: int, wins: int, seconds: int, tiebreak: int,
+    ) -> None:
+        self._slot[driver_id] = len(self._ids)
+        self._ids.append(driver_id)
+        self._points.append(points)
+        self._wins.append(wins)
+        self._seconds.append(seconds)
+        self._tiebreak.append(tiebreak)
+        self._names.append(name)
+        self._tree.add(points, 1)
+
+    def add_driver(self, driver_id: int, name: str, points: int = 0) -> None:
+        """Register a driver (or rename an existing one)"""
+        slot = self._slot.get(driver_id)
+        if slot is not None:
+            self._names.rename(slot, name)
+        else:
+            self._append(driver_id, name, points, 0, 0, 0)
+        self._changed()
+
+    def load(self, drivers: Iterable[Tuple[int, str, int, int, int, int]]) -> None:
+        """
+        Replace everything with (driver_id, name, points, wins, seconds,
+        tiebreak) rows - one change
+        """
+        self._slot = SlotIndex()
+        self._ids = array("l")
+        self._points = array("l")
+        self._wins = array("l")
+        self._seconds = array("l")
+        self._tiebreak = array("l")
+        self._names = NameTable()
+        self._tree = FenwickTree()
+        for row in drivers:
+            self._append(*row)
+        self._changed()
+
+    def adopt(self, other: "StandingsEngine") -> None:
+        """
+        Take over `other`'s drivers - one change, O(1)
+
+        For an engine built somewhere requests can't see it (e.g. in a
+        thread, see app/models/repository.py): the columns are swapped in
+        by reference, so readers see the old table or the new one, never a
+        mix. A ranking already sorted on `other` is kept.
+        """
+        self._slot, self._ids, self._names, self._tree = other._slot, other._ids, other._names, other._tree
+        self._points, self._wins = other._points, other._wins
+        self._seconds, self._tiebreak = other._seconds, other._tiebreak
+        ranking = other._ranking
+        self._changed()
+        if ranking is not None and ranking[0] == other.version:
+            self._ranking = (self.version, ranking[1], ranking[2])
+
+    def apply_results(
+        self,
+        results: Iterable[Tuple[int, int]],
+        names: Optional[Dict[int, str]] = None,
+        finishes: Optional[Dict[int, Tuple[int, int]]] = None,
+    ) -> None:
+        """
+        Add points from one event's results
+
+        Args:
+            results:  (driver_id, points_earned) pairs; earned may be negative
+                      when a re-upload replaces earlier results
+            names:    optional driver_id → name; unknown drivers in here are
+                      registered, known ones renamed
+            finishes: optional driver_id → (wins, seconds) change, same
+                      sign rules as points
+
+        Only the drivers in `results` are touched: O(k log n), and listeners
+        are notified once for the whole batch.
+        """
+        slots, tree = self._slot, self._tree
+        for driver_id, name in (names or {}).items():
+            slot = slots.get(driver_id)
+            if slot is None:
+                self._append(driver_id, name, 0, 0, 0, 0)
+            else:
+                self._names.rename(slot, name)
+
+        wins, seconds = self._wins, self._seconds
+        for driver_id, (won, second) in (finishes or {}).items():
+            slot = slots[driver_id]
+            wins[slot] += won
+            seconds[slot] += second
+
+        points = self._points
+        for driver_id, earned in results:
+            slot = slots[driver_id]
+            old = points[slot]
+            new = old + earned
+            if new == old:
+                continue
+            tree.add(old, -1)
+            tree.add(new, 1)
+            points[slot] = new
+        self._changed()
+
+    def set_scores(
+        self,
+        scores: Dict[int, Tuple[int, int, int]],
+        tiebreaks: Optional[Dict[int, int]] = None,
+        names: Optional[Dict[int, str]] = None,
+    ) -> None:
+        """
+        Overwrite season figures computed elsewhere (app/models/scoring.py)
+
+        Args:
+            scores:    driver_id → (points, wins, seconds); unknown drivers
+                       are registered under their name from `names`
+            tiebreaks: driver_id → countback position on equal points
+            names:     optional driver_id → name; known drivers are renamed
+
+        O(k log n) for k drivers, and listeners are notified once.
+        """
+        slots, tree, points = self._slot, self._tree, self._points
+        names = names or {}
+        for driver_id, (total, wins, seconds) in scores.items():
+            slot = slots.get(driver_id)
+            if slot is None:
+                self._append(driver_id, names[driver_id], total, wins, seconds, 0)
+                continue
+            if driver_id in names:
+                self._names.rename(slot, names[driver_id])
+            old = points[slot]
+            if old != total:
+                tree.add(old, -1)
+                tree.add(total, 1)
+                points[slot] = total
+            self._wins[slot], self._seconds[slot] = wins, seconds
+        # Can be most of a points total (everyone behind a newcomer moves down)
+        slot_of, column = slots.get, self._tiebreak
+        for driver_id, tiebreak in (tiebreaks or {}).items():
+            column[slot_of(driver_id)] = tiebreak
+        self._changed()
+
+    def rename(self, names: Dict[int, str]) -> bool:
+        """Rename the known drivers in driver_id → name - one change, if any name differed"""
+        renamed = False
+        for driver_id, name in names.items():
+            slot = self._slot.get(driver_id)
+            if slot is not None and self._names[slot] != name:
+                self._names.rename(slot, name)
+                renamed = True
+        if renamed:
+            self._changed()
+        return renamed
+
+    def remove_drivers(self, driver_ids: Iterable[int]) -> None:
+        """
+        Drop drivers entirely - one change
+
+        The last slot moves into each freed slot, so the arrays stay dense.
+        """
+        columns = (self._ids, self._points, self._wins, self._seconds, self._tiebreak)
+        for driver_id in driver_ids:
+            slot = self._slot.get(driver_id)
+            if slot is None:
+                continue
+            self._tree.add(self._points[slot], -1)
+            last = len(self._ids) - 1
+            if slot != last:
+                for column in columns:
+                    column[slot] = column[last]
+                self._names.move(last, slot)
+                self._slot[self._ids[slot]] = slot
+            for column in columns:
+                column.pop()
+            self._names.pop()
+            del self._slot[driver_id]
+        self._changed()
+
+    # ------------------------------------------------------------------
+    # READS
+    # ------------------------------------------------------------------
+
+    def get(self, driver_id: int) -> Optional[dict]:
+        """Position and points for one driver - O(log n), None if unknown"""
+        slot = self._slot.get(driver_id)
+        if slot is None:
+            return None
+        points = self._points[slot]
+        return {
+            "driver_id": driver_id,
+            "position": self._position(points, self._tiebreak[slot]),
+            "points": points,
+        }
+
+    def get_many(self, driver_ids: Iterable[int]) -> List[Optional[dict]]:
+        """get() for several drivers in one pass - one O(log n) lookup each"""
+        slots, points, tiebreak, position = self._slot, self._points, self._tiebreak, self._position
+        found: List[Optional[dict]] = []
+        for driver_id in driver_ids:
+            slot = slots.get(driver_id)
+            if slot is None:
+                found.append(None)
+                continue
+            driver_points = points[slot]
+            found.append({
+                "driver_id": driver_id,
+                "position": position(driver_points, tiebreak[slot]),
+                "points": driver_points,
+            })
+        return found
+
+    def driver_ids(self) -> List[int]:
+        """Every driver in the table, in slot order"""
+        return self._ids.tolist()
+
+    def scores(self, driver_ids: Iterable[int]) -> Dict[int, Tuple[int, int]]:
+        """driver_id → (points, tiebreak) for the known ones of `driver_ids`"""
+        slots, found = self._slot, {}
+        for driver_id in driver_ids:
+            slot = slots.get(driver_id)
+            if slot is not None:
+                found[driver_id] = (self._points[slot], self._tiebreak[slot])
+        return found
+
+    def columns(self) -> Tuple[array, array, array]:
+        """
+        Copies of the (driver_id, points, tiebreak) columns, in slot order
+
+        For bulk work such as countback rescoring (vectorized with numpy in
+        app/models/scoring.py). Copies, so the engine can keep growing.
+        """
+        return array("l", self._ids), array("l", self._points), array("l", self._tiebreak)
+
+    def name(self, driver_id: int) -> Optional[str]:
+        """A driver's name - O(1), None if unknown"""
+        slot = self._slot.get(driver_id)
+        return None if slot is None else self._names[slot]
+
+    def rows(self) -> Iterable[Tuple[int, str, int, int, int, int]]:
+        """(driver_id, name, points, wins, seconds, tiebreak) per driver, in slot order"""
+        names = self._names
+        return zip(
+            self._ids, (names[slot] for slot in range(len(names))),
+            self._points, self._wins, self._seconds, self._tiebreak,
+        )
+
+    def _position(self, points: int, tiebreak: int = 0) -> int:
+        """Number of drivers with strictly more points + countback position among the rest"""
+        tree = self._tree
+        return tree.total - tree.count_at_most(points) + max(tiebreak, 1)
+
+    def ranking(self) -> Tuple[array, array]:
+        """
+        (order, positions): slots best-first and the position of each
+
+        Two typed arrays, sorted once per version - this is all the state
+        kept between requests for the full table.
+        """
+        cache = self._ranking
+        if cache is not None and cache[0] == self.version:
+            return cache[1], cache[2]
+
+        points, wins, seconds = self._points, self._wins, self._seconds
+        tiebreak, names = self._tiebreak, self._names
+        order = array("l", sorted(
+            range(len(self._ids)),
+            key=lambda s: (-points[s], tiebreak[s] or 1, -wins[s], -seconds[s], names[s]),
+        ))
+        # Same as _position(): where the points group starts + countback
+        positions = array("l", bytes(order.itemsize * len(order)))
+        start, previous = 0, None
+        for index, slot in enumerate(order):
+            if points[slot] != previous:
+                start, previous = index, points[slot]
+            positions[index] = start + max(tiebreak[slot], 1)
+
+        self._ranking = (self.version, order, positions)
+        return order, positions
+
+    def iter_ranked(self) -> Iterator[dict]:
+        """Full standings table, best first, one row dict at a time"""
+        order, positions = self.ranking()
+        ids, names, points, wins = self._ids, self._names, self._points, self._wins
+        for slot, position in zip(order, positions):
+            yield {
+                "position": position,
+                "driver_id": ids[slot],
+                "driver": names[slot],
+                "points": points[slot],
+                "wins": wins[slot],
+            }
+
+    def pinned_ranked(self) -> Iterator[Tuple[int, int, str, int, int]]:
+        """
+        (position, driver_id, name, points, wins) best first, as of this call
+
+        For iterating across awaits (e.g. a streamed export): changes made
+        while the rows are consumed don't show up half way through. The
+        columns are frozen once per version - one memcpy each, no per-row
+        objects - and shared by every iteration of that version, so
+        concurrent downloads cost no extra memory.
+        """
+        order, positions = self.ranking()           # New arrays per version
+        pinned = self._pinned
+        if pinned is None or pinned[0] != self.version:
+            pinned = (self.version, self._ids[:], self._points[:], self._wins[:],
+                      self._names.pinned())
+            self._pinned = pinned
+        _, ids, points, wins, names = pinned
+        return (
+            (position, ids[slot], names[slot], points[slot], wins[slot])
+            for slot, position in zip(order, positions)
+        )
+
+    def ranked(self) -> List[dict]:
+        """
+        Full standings table as a list, ready to serialize
+
+        Built fresh from the columns on each call; the sort itself is
+        cached per version (see ranking()).
+        """
+        return list(self.iter_ranked())
+
+
+# ==============================================================================
+# PARTITIONS - Separate standings per series and per class
+# ==============================================================================
+
+PartitionKey = Tuple[Optional[str], Optional[str]]    # (series, class); None = all
+
+
+class StandingsPartitions:
+    """
+    One StandingsEngine per (series, class) combination
+
+    Every result lands in three partitions: (series, class), (series, all
+    classes) and (all series, class). The fully unfiltered table is the
+    main engine, so it is not repeated here. A filtered request is one dict
+    lookup; no request ever filters the global table.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._engines: Dict[PartitionKey, StandingsEngine] = {}
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    @staticmethod
+    def keys_for(series: str, class_name: str) -> Tuple[PartitionKey, ...]:
+        """The partitions a result in this series and class counts towards"""
+        return (series, class_name), (series, None), (None, class_name)
+
+    def get(self, series: Optional[str], class_name: Optional[str]) -> Optional[StandingsEngine]:
+        return self._engines.get((series, class_name))
+
+    def items(self) -> Iterable[Tuple[PartitionKey, StandingsEngine]]:
+        return self._engines.items()
+
+    def load(self, partitions: Iterable[Tuple[PartitionKey, Iterable[tuple]]]) -> None:
+        """Replace everything with (key, StandingsEngine.load() rows) pairs"""
+        engines = {}
+        for key, rows in partitions:
+            engine = engines[key] = StandingsEngine()
+            engine.load(rows)
+        self._engines = engines
+        self.version += 1
+
+    def adopt(self, other: "StandingsPartitions") -> None:
+        """Take over `other`'s engines (see StandingsEngine.adopt) - O(1)"""
+        self._engines = other._engines
+        self.version += 1
+
+    def apply_event(
+        self,
+        series: str,
+        changes: Dict[Tuple[int, str], Tuple[int, int, int]],
+        names: Dict[int, str],
+    ) -> None:
+        """
+        Apply one event's result changes
+
+        Args:
+            series:  the event's series
+            changes: (driver_id, class) → (points, wins, seconds) change
+            names:   driver_id → name for drivers in the upload
+        """
+        per_partition: Dict[PartitionKey, Dict[int, List[int]]] = {}
+        for (driver_id, class_name), delta in changes.items():
+            for key in self.keys_for(series, class_name):
+                total = per_partition.setdefault(key, {}).setdefault(driver_id, [0, 0, 0])
+                for i in range(3):
+                    total[i] += delta[i]
+
+        for key, drivers in per_partition.items():
+            engine = self._engines.get(key)
+            if engine is None:
+                engine = self._engines[key] = StandingsEngine()
+            engine.apply_results(
+                ((driver_id, points) for driver_id, (points, _, _) in drivers.items()),
+                names={driver_id: names[driver_id] for driver_id in drivers if driver_id in names},
+                finishes={driver_id: (wins, seconds)
+                          for driver_id, (_, wins, seconds) in drivers.items()},
+            )
+        self.version += 1
+
+    def set_scores(
+        self,
+        key: PartitionKey,
+        scores: Dict[int, Tuple[int, int, int]],
+        tiebreaks: Dict[int, int],
+        names: Dict[int, str],
+        removed: Iterable[int] = (),
+    ) -> None:
+        """StandingsEngine.set_scores() on one partition (created if new), after dropping `removed`"""
+        engine = self._engines.get(key)
+        if engine is None:
+            engine = self._engines[key] = StandingsEngine()
+        removed = list(removed)
+        if removed:
+            engine.remove_drivers(removed)
+        engine.set_scores(scores, tiebreaks, names)
+        self.version += 1
+
+    def rename(self, names: Dict[int, str]) -> None:
+        """Rename drivers in every table they are in"""
+        renamed = [engine.rename(names) for engine in self._engines.values()]
+        if any(renamed):
+            self.version += 1
+
+    def remove_entrants(self, departed: Iterable[Tuple[PartitionKey, int]]) -> None:
+        """Drop (key, driver_id) pairs - drivers with no results left there"""
+        per_partition: Dict[PartitionKey, List[int]] = {}
+        for key, driver_id in departed:
+            per_partition.setdefault(key, []).append(driver_id)
+        for key, driver_ids in per_partition.items():
+            engine = self._engines.get(key)
+            if engine is not None:
+                engine.remove_drivers(driver_ids)
+        self.version += 1
+
+
+# ==============================================================================
+# CURRENT ENGINE - Shared by every request in this process
+# ==============================================================================
+
+def _build_seed_engine() -> StandingsEngine:
+    engine = StandingsEngine()
+    for driver_id, name, points in SEED_DRIVERS:
+        engine.add_driver(driver_id, name, points)
+    return engine
+
+
+_engine = _build_seed_engine()
+
+
+_partitions = StandingsPartitions()
+
+
+def get_standings_engine() -> StandingsEngine:
+    """Return the standings engine for this process"""
+    return _engine
+
+
+def get_standings_partitions() -> StandingsPartitions:
+    """Return the per-series/per-class standings for this process"""
+    return _partitions
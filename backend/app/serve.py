@@ -0,0 +1,145 @@
+# ==============================================================================
+# SERVE - Production server: N uvicorn workers + one snapshot writer
+# ==============================================================================
+# `uvicorn app.main:app` runs ONE process, so one CPU core serves everything.
+# Adding --workers alone would make every worker load and recompute its own
+# copy of the standings. This entry point instead starts:
+#
+#   1 snapshot writer  - loads the database, builds the standings, publishes
+#                        a compact binary snapshot into shared memory, and
+#                        republishes whenever the data changes
+#   N uvicorn workers  - map that snapshot read-only, decode it into their
+#                        own stores and serve requests; they notice new
+#                        versions by reading one shared integer (see
+#                        app/core/snapshot.py)
+#
+# Each worker still holds its own decoded stores (memory grows with N -
+# see "Multiple workers" in the README); what they share is the loading
+# and computing, done once by the writer.
+#
+# Run it (from backend/):
+#   python -m app.serve
+#
+# Settings: SERVER_HOST, SERVER_PORT, SERVER_WORKERS (0 = one per CPU),
+#           SHARED_SNAPSHOT_DIR, SNAPSHOT_POLL_INTERVAL,
+#           WARM_SNAPSHOT_PATH, WARM_SNAPSHOT_INTERVAL (the writer also saves
+#           and warm-starts from the on-disk snapshot, see app/models/repository.py)
+# ==============================================================================
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+
+import uvicorn
+
+from app.core.config import settings
+
+
+def default_snapshot_dir() -> str:
+    """/dev/shm is RAM-backed on Linux; fall back to the temp dir elsewhere"""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "race-standings")
+
+
+# ==============================================================================
+# WRITER PROCESS
+# ==============================================================================
+
+async def _writer_loop(directory: str, ready) -> None:
+    # Imported here so the parent process stays light
+    from app.core.database import get_database
+    from app.core.snapshot import SnapshotWriter
+    from app.models.repository import (
+        catch_up, data_version, load_from_database, save_snapshot,
+        snapshot_rows, state_fingerprint, warm_start,
+    )
+
+    # app.serve stops the writer with SIGTERM: finish up (save the warm
+    # start snapshot) instead of dying on the spot
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+
+    database = get_database()
+    await database.connect()
+    writer = SnapshotWriter(directory)
+    path = settings.WARM_SNAPSHOT_PATH
+    seen = saved = None
+    try:
+        # Start from the snapshot the last run saved, if it is usable
+        if path:
+            seen = await warm_start(database, path)
+        if seen is None:
+            seen = await load_from_database(database)
+        writer.publish(*snapshot_rows(), data_version=seen, fingerprint=state_fingerprint())
+        ready.set()
+
+        # Poll the database's change counter; on change replay just the new
+        # uploads (or rebuild everything if something else changed), then
+        # republish. Save for the next start every WARM_SNAPSHOT_INTERVAL.
+        next_save = 0.0
+        while True:
+            if path and seen != saved and time.monotonic() >= next_save:
+                saved = await save_snapshot(database, path, seen)
+                next_save = time.monotonic() + settings.WARM_SNAPSHOT_INTERVAL
+            await asyncio.sleep(settings.SNAPSHOT_POLL_INTERVAL)
+            current = await data_version(database)
+            if current != seen:
+                caught_up = await catch_up(database, seen)
+                if caught_up is None:
+                    caught_up = await load_from_database(database)
+                seen = caught_up
+                writer.publish(*snapshot_rows(), data_version=seen, fingerprint=state_fingerprint())
+    finally:
+        if path and seen is not None and seen != saved:
+            await save_snapshot(database, path, seen)
+        writer.close()
+        await database.disconnect()
+
+
+def run_writer(directory: str, ready) -> None:
+    try:
+        asyncio.run(_writer_loop(directory, ready))
+    except (asyncio.CancelledError, KeyboardInterrupt):
+        pass                                        # Stopped by app.serve / Ctrl+C
+
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+
+def main() -> None:
+    workers = settings.SERVER_WORKERS or os.cpu_count() or 1
+    directory = settings.SHARED_SNAPSHOT_DIR or default_snapshot_dir()
+
+    # Workers are fresh processes that read settings from the environment
+    os.environ["SHARED_SNAPSHOT_DIR"] = directory
+    os.environ.setdefault("METRICS_MULTIPROC_DIR", os.path.join(directory, "metrics"))
+
+    context = multiprocessing.get_context("spawn")
+    ready = context.Event()
+    writer = context.Process(
+        target=run_writer, args=(directory, ready), name="snapshot-writer", daemon=True,
+    )
+    writer.start()
+    if not ready.wait(timeout=60):
+        writer.terminate()
+        raise SystemExit("Snapshot writer did not publish a snapshot within 60s")
+
+    try:
+        uvicorn.run(
+            "app.main:app",
+            host=settings.SERVER_HOST,
+            port=settings.SERVER_PORT,
+            workers=workers,
+            proxy_headers=True,            # Trust X-Forwarded-* ...
+            forwarded_allow_ips=settings.FORWARDED_ALLOW_IPS,  # ...from these proxies only
+        )
+    finally:
+        writer.terminate()
+        writer.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
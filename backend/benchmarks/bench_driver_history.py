@@ -0,0 +1,98 @@
+# ==============================================================================
+# BENCHMARK - Driver history and head-to-head lookups
+# ==============================================================================
+# Builds a DriverHistory (app/models/history.py) for a synthetic season and
+# compares the endpoints' work with the naive alternative of scanning every
+# result per request:
+#
+#   summary         starts/points/best/average finish from the prefix sums
+#   rounds          the full per-round progression for one driver
+#   h2h cold/warm   first compare of a pair (merge of two logs) vs cached
+#   replace event   an upload re-scoring one event, pair cache included
+#   naive scan      the same summary + head-to-head by scanning all results
+#
+# Run from the backend/ directory:
+#   python -m benchmarks.bench_driver_history
+#   python -m benchmarks.bench_driver_history --drivers 1000,50000 --rounds 24
+# ==============================================================================
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from app.models.history import DriverHistory
+
+
+def season(drivers: int, rounds: int, field: int, seed: int = 1):
+    """Events plus (event_id, driver_id, class, position, points) results"""
+    rng = random.Random(seed)
+    events = [{"id": i, "name": f"Round {i}", "date": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}"}
+              for i in range(1, rounds + 1)]
+    results = []
+    for event in events:
+        entrants = rng.sample(range(1, drivers + 1), min(field, drivers))
+        for position, driver_id in enumerate(entrants, start=1):
+            class_name = "Stock" if driver_id % 3 else "Super"
+            results.append((event["id"], driver_id, class_name, position, max(0, 26 - position)))
+    return events, results
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    """Mean milliseconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def naive(results: List[tuple], a: int, b: int) -> tuple:
+    """What a request would cost without the precomputed structures"""
+    mine = [r for r in results if r[1] == a]
+    theirs = {(r[0], r[2]): r[3] for r in results if r[1] == b}
+    ahead = sum(1 for r in mine if (r[0], r[2]) in theirs and r[3] < theirs[r[0], r[2]])
+    return sum(r[4] for r in mine), min((r[3] for r in mine), default=None), ahead
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Driver history benchmark")
+    parser.add_argument("--drivers", default="1000,20000", help="comma-separated driver counts")
+    parser.add_argument("--rounds", type=int, default=24, help="events in the season")
+    parser.add_argument("--field", type=int, default=2000, help="entrants per event")
+    parser.add_argument("--repeat", type=int, default=2000, help="calls per timing")
+    args = parser.parse_args()
+
+    for count in (int(part) for part in args.drivers.split(",") if part):
+        events, results = season(count, args.rounds, args.field)
+        rng = random.Random(count)
+
+        start = time.perf_counter()
+        history = DriverHistory(max_pairs=4096)
+        history.load(events, results)
+        build = time.perf_counter() - start
+
+        busy = [r[1] for r in results[: args.field]]   # Drivers with results
+        pairs = [tuple(rng.sample(busy, 2)) for _ in range(args.repeat)]
+        pair_iter = iter(pairs)
+
+        summary = timed(lambda: history.summary(rng.choice(busy)), args.repeat)
+        rounds = timed(lambda: history.rounds(rng.choice(busy)), args.repeat)
+        cold = timed(lambda: history.head_to_head(*next(pair_iter)), args.repeat)
+        warm = timed(lambda: history.head_to_head(*pairs[0]), args.repeat)
+
+        event_rows = [(d, c, p, pts) for e, d, c, p, pts in results if e == events[0]["id"]]
+        replace = timed(lambda: history.replace_event(events[0]["id"], event_rows), 20)
+        scan = timed(lambda: naive(results, *pairs[0]), 5)
+
+        print(f"\n{count} drivers, {len(results)} results: load {build * 1000:.0f}ms")
+        print(f"  summary          {summary:>9.4f} ms")
+        print(f"  rounds           {rounds:>9.4f} ms")
+        print(f"  h2h cold         {cold:>9.4f} ms")
+        print(f"  h2h warm         {warm:>9.4f} ms")
+        print(f"  replace event    {replace:>9.4f} ms  ({len(event_rows)} rows, "
+              f"{len(history._pairs)} cached pairs)")
+        print(f"  naive scan       {scan:>9.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
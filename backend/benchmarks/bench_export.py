@@ -0,0 +1,109 @@
+# ==============================================================================
+# BENCHMARK - Streamed export vs one JSON body: time and peak memory
+# ==============================================================================
+# For N drivers, drains GET /api/v1/standings/export (CSV and NDJSON) the
+# way a client would - chunk by chunk, nothing kept - and compares it with
+# building the same table as the one-piece JSON body of GET /standings/.
+# Requests go straight to the ASGI app and every chunk is dropped on
+# arrival, so only the server side is measured.
+# Peak memory is traced with tracemalloc while each request runs. The
+# export's first download of a version also freezes the standings columns
+# (~36 bytes per driver, shared with every later download of that version),
+# so it is measured twice: first and repeat download.
+#
+# Run from the backend/ directory:
+#   python -m benchmarks.bench_export
+#   python -m benchmarks.bench_export --drivers 10000,100000,500000
+# ==============================================================================
+
+import os
+
+# Benchmarks never touch a real database file; no rate limit on ourselves
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "0")
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from app.main import app, response_cache
+from app.models.standings import get_standings_engine
+
+
+async def drain(path: str) -> int:
+    """Call the app directly like a server would; count body bytes, keep none"""
+    route, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": route, "raw_path": route.encode(),
+        "query_string": query.encode(), "root_path": "",
+        "headers": [(b"host", b"bench"), (b"accept-encoding", b"identity")],
+        "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    received = 0
+    done = asyncio.Event()
+
+    async def receive():
+        if done.is_set():
+            return {"type": "http.disconnect"}
+        await done.wait()                   # The client never sends a body
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal received
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message["status"]
+        else:
+            received += len(message.get("body", b""))
+            if not message.get("more_body"):
+                done.set()
+
+    await app(scope, receive, send)
+    return received
+
+
+async def traced(path: str) -> float:
+    """Peak traced MB while serving one request"""
+    response_cache.clear()                  # Build the JSON body every time
+    tracemalloc.start()
+    await drain(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+async def measure(path: str) -> tuple:
+    """(ms, bytes sent, first peak MB, repeat peak MB) - timed untraced"""
+    first = await traced(path)
+    repeat = await traced(path)
+    response_cache.clear()
+    start = time.perf_counter()
+    size = await drain(path)
+    return (time.perf_counter() - start) * 1000, size, first, repeat
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Export streaming benchmark")
+    parser.add_argument("--drivers", default="10000,100000", help="comma-separated driver counts")
+    args = parser.parse_args()
+
+    async with app.router.lifespan_context(app):
+        for count in (int(part) for part in args.drivers.split(",") if part):
+            engine = get_standings_engine()
+            engine.load((i, f"Driver {i}", (i * 7919) % 1000, i % 3, i % 5, 0)
+                        for i in range(1, count + 1))
+            engine.ranking()                # The sort is shared, not per request
+            print(f"\n{count} drivers{'':<12}time      sent   peak: first  repeat")
+            for label, path in (
+                ("export csv", "/api/v1/standings/export?format=csv"),
+                ("export ndjson", "/api/v1/standings/export?format=ndjson"),
+                ("json body", "/api/v1/standings/"),
+            ):
+                ms, size, first, repeat = await measure(path)
+                print(f"  {label:<14} {ms:>8.1f} ms {size / 1e6:>7.2f} MB "
+                      f"{first:>9.2f} MB {repeat:>6.2f} MB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+# ==============================================================================
+# BENCHMARK - JSON response encoding throughput
+# ==============================================================================
+# Compares how fast a standings payload turns into response bytes:
+#
+#   default  - what FastAPI does when a route returns a dict:
+#              jsonable_encoder() + stdlib JSONResponse
+#   stdlib   - json_response() with the stdlib encoder (skips jsonable_encoder)
+#   orjson   - json_response() with orjson (skips jsonable_encoder)
+#
+# Run from the backend/ directory:
+#   python -m benchmarks.bench_json_response
+#   python -m benchmarks.bench_json_response --drivers 500 --seconds 2
+# ==============================================================================
+
+import argparse
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import ORJSONResponse, StdlibJSONResponse, orjson
+
+
+def build_payload(drivers: int) -> dict:
+    """A standings body shaped exactly like GET /api/v1/standings/"""
+    return {
+        "standings": [
+            {
+                "position": i,
+                "driver_id": i,
+                "driver": f"Driver {i}",
+                "points": max(0, 1000 - i),
+            }
+            for i in range(1, drivers + 1)
+        ]
+    }
+
+
+def default_fastapi(payload: dict) -> bytes:
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def fast_stdlib(payload: dict) -> bytes:
+    return StdlibJSONResponse(payload).body
+
+
+def fast_orjson(payload: dict) -> bytes:
+    return ORJSONResponse(payload).body
+
+
+def measure(encode, payload: dict, seconds: float) -> dict:
+    """Encode repeatedly for `seconds`, return throughput numbers"""
+    encode(payload)                                 # Warm up
+    calls, total_bytes = 0, 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        total_bytes += len(encode(payload))
+        calls += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "calls_per_sec": calls / elapsed,
+        "mb_per_sec": total_bytes / elapsed / 1e6,
+        "us_per_call": elapsed / calls * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON response encoding benchmark")
+    parser.add_argument("--drivers", type=int, default=500, help="rows in the payload")
+    parser.add_argument("--seconds", type=float, default=1.0, help="time per encoder")
+    args = parser.parse_args()
+
+    payload = build_payload(args.drivers)
+    encoders = [("default", default_fastapi), ("stdlib", fast_stdlib)]
+    if orjson is not None:
+        encoders.append(("orjson", fast_orjson))
+    else:
+        print("orjson not installed - skipping")
+
+    print(f"{args.drivers} drivers, {len(fast_stdlib(payload))} bytes per body\n")
+    print(f"{'encoder':<10}{'calls/s':>12}{'MB/s':>10}{'us/call':>10}{'speedup':>10}")
+    baseline = None
+    for name, encode in encoders:
+        result = measure(encode, payload, args.seconds)
+        baseline = baseline or result["mb_per_sec"]
+        print(
+            f"{name:<10}{result['calls_per_sec']:>12.0f}{result['mb_per_sec']:>10.1f}"
+            f"{result['us_per_call']:>10.1f}{result['mb_per_sec'] / baseline:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
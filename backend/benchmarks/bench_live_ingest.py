@@ -0,0 +1,94 @@
+# ==============================================================================
+# BENCHMARK - Live timing ingest: one write per result vs micro-batches
+# ==============================================================================
+# Builds a season in SQLite, loads the in-memory stores, then streams
+# --results live results into the latest event through ingest_live_results()
+# (what the /events/{event_date}/live WebSocket calls per batch):
+#
+#   per result    one transaction + standings update per result (batch of 1)
+#   batch of N    the results grouped N at a time, as the micro-batcher does
+#
+# Run from the backend/ directory:
+#   python -m benchmarks.bench_live_ingest
+#   python -m benchmarks.bench_live_ingest --results 2000 --batches 1,25,250
+# ==============================================================================
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from app.core.database import Database
+from app.models.repository import SCHEMA, load_from_database
+from app.models.results import ResultRow, ingest_live_results
+
+
+def build_archive(path: str, events: int, drivers: int, field: int) -> None:
+    """Plain sqlite3 bulk load - the pool isn't what's being measured"""
+    rng = random.Random(events)
+    conn = sqlite3.connect(path)
+    for statement in SCHEMA:
+        conn.execute(statement)
+    conn.executemany(
+        "INSERT INTO events (id, name, date) VALUES (?, ?, ?)",
+        [(i, f"Rallycross #{i}", f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}")
+         for i in range(1, events + 1)],
+    )
+    conn.executemany("INSERT INTO drivers (id, name) VALUES (?, ?)",
+                     [(i, f"Driver {i}") for i in range(1, drivers + 1)])
+    for event_id in range(1, events + 1):
+        conn.executemany(
+            "INSERT INTO results (event_id, driver_id, class, position, points) "
+            "VALUES (?, ?, 'Stock', ?, ?)",
+            [(event_id, d, p, max(0, 30 - p))
+             for p, d in enumerate(rng.sample(range(1, drivers + 1), field), 1)],
+        )
+    conn.commit()
+    conn.close()
+
+
+def live_results(count: int, drivers: int) -> list:
+    rng = random.Random(count)
+    return [
+        ResultRow(driver_id=d, driver=f"Driver {d}", class_name="Stock",
+                  position=rng.randint(1, 40), points=rng.randint(0, 30))
+        for d in (rng.randint(1, drivers) for _ in range(count))
+    ]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Live ingest benchmark")
+    parser.add_argument("--events", type=int, default=24)
+    parser.add_argument("--drivers", type=int, default=2000)
+    parser.add_argument("--field", type=int, default=300, help="results per event")
+    parser.add_argument("--results", type=int, default=500, help="live results streamed")
+    parser.add_argument("--batches", default="1,50,500", help="comma-separated batch sizes")
+    args = parser.parse_args()
+
+    rows = live_results(args.results, args.drivers)
+    print(f"{args.results} live results into a {args.field}-entrant event "
+          f"({args.events} events, {args.drivers} drivers)")
+    for size in (int(part) for part in args.batches.split(",") if part):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "archive.db")
+            build_archive(path, args.events, args.drivers, args.field)
+            db = Database(f"sqlite:///{path}")
+            await db.connect()
+            await load_from_database(db)
+
+            start = time.perf_counter()
+            for i in range(0, len(rows), size):
+                await ingest_live_results(db, args.events, rows[i:i + size])
+            elapsed = time.perf_counter() - start
+            await db.disconnect()
+
+        batches = -(-len(rows) // size)
+        print(f"  batch of {size:<5} {elapsed * 1000:>9.1f} ms total, "
+              f"{elapsed / batches * 1000:>7.2f} ms/batch, {len(rows) / elapsed:>8.0f} results/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+# ==============================================================================
+# BENCHMARK - Response cache tiers: rebuild vs shared-tier hit vs memory hit
+# ==============================================================================
+# Times GET /api/v1/standings/ in-process (no network) for N drivers when the
+# response comes from:
+#
+#   rebuild        neither tier has it: route + JSON encoding + both puts
+#   shared hit     another worker already built it (in-process tier cleared)
+#   memory hit     this worker has it (the steady state between uploads)
+#
+# plus the size of the entry each tier holds.
+#
+# Needs httpx. Run from the backend/ directory:
+#   python -m benchmarks.bench_response_cache
+#   python -m benchmarks.bench_response_cache --drivers 1000,100000
+# ==============================================================================
+
+import os
+import tempfile
+
+# Benchmarks never touch a real database file; no rate limit on ourselves
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "0")
+_cache_dir = tempfile.mkdtemp()
+os.environ["RESPONSE_CACHE_SHARED_PATH"] = os.path.join(_cache_dir, "cache.db")
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.main import app, response_cache
+from app.models.repository import set_state_version
+from app.models.standings import get_standings_engine
+
+PATH = "/api/v1/standings/"
+
+
+async def timed(client: httpx.AsyncClient, repeat: int, before=None) -> float:
+    """Mean milliseconds per request (time spent in `before` excluded)"""
+    total = 0.0
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        response = await client.get(PATH)
+        total += time.perf_counter() - start
+        assert response.status_code == 200
+    return total / repeat * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Response cache tier benchmark")
+    parser.add_argument("--drivers", default="1000,20000", help="comma-separated driver counts")
+    parser.add_argument("--repeat", type=int, default=50, help="requests per timing")
+    args = parser.parse_args()
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for count in (int(part) for part in args.drivers.split(",") if part):
+                engine = get_standings_engine()
+                label = count
+
+                def new_data():
+                    # A fresh data version nobody has cached yet
+                    nonlocal label
+                    label += 1_000_000
+                    engine.load((i, f"Driver {i}", (i * 7919) % 1000, i % 3, i % 5, 0)
+                                for i in range(1, count + 1))
+                    set_state_version(label)        # Synthetic data: label it ourselves
+
+                new_data()
+                rebuild = await timed(client, args.repeat, before=new_data)
+                await client.get(PATH)              # Both tiers have it now
+                shared = await timed(client, args.repeat, before=response_cache.memory.clear)
+                await client.get(PATH)
+                memory = await timed(client, args.repeat)
+
+                stats = response_cache.stats()
+                print(f"\n{count} drivers ({response_cache.memory.bytes / 1e6:.2f} MB in memory)")
+                print(f"  rebuild      {rebuild:>8.3f} ms")
+                print(f"  shared hit   {shared:>8.3f} ms")
+                print(f"  memory hit   {memory:>8.3f} ms")
+                print(f"  counters     {stats}")
+                response_cache.clear()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
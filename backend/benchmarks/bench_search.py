@@ -0,0 +1,94 @@
+# ==============================================================================
+# BENCHMARK - Typeahead search latency and index size
+# ==============================================================================
+# Builds the SearchIndex (app/models/search.py) for N synthetic drivers plus
+# a season of events, then times typical typeahead queries:
+#
+#   single prefix   "j", "jan", "solb"       - trie walk only
+#   multi-word      "jane d", "annika l"     - trie walk + per-name check
+#   fuzzy           "ralycross", "cross"     - trigram fallback (typo / infix)
+#
+# Also reports the build time, the cost of re-syncing an unchanged driver
+# list (what every reload pays) and the memory held by the index.
+#
+# Run from the backend/ directory:
+#   python -m benchmarks.bench_search
+#   python -m benchmarks.bench_search --drivers 1000,10000,100000
+# ==============================================================================
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from typing import List, Tuple
+
+from app.models.search import SearchIndex
+
+FIRST = ["Jane", "John", "Anna", "Annika", "Mikko", "Sebastien", "Petter", "Kalle",
+         "Timmy", "Ole", "Johan", "Andreas", "Liam", "Emma", "Oliver", "Sophie"]
+LAST = ["Doe", "Smith", "Solberg", "Kristoffersson", "Loeb", "Hansen", "Rovanpera",
+        "Ogier", "Bakkerud", "Larsson", "Nitiss", "Scheider", "Ekstrom", "Heikkinen"]
+
+QUERIES = ["j", "jan", "solb", "71", "jane d", "annika l", "rallycross #71",
+           "ralycross", "cross", "kristofersson", "jane dooe", "zzzz"]
+
+
+def drivers(count: int) -> List[Tuple[int, str]]:
+    """(driver_id, name) with realistic repetition of first/last names"""
+    rng = random.Random(count)
+    return [
+        (i, f"{rng.choice(FIRST)} {rng.choice(LAST)}" + ("" if i % 3 else f" {i}"))
+        for i in range(1, count + 1)
+    ]
+
+
+EVENTS = [
+    {"id": i, "name": f"Rallycross #{i}, points event #{i % 8 + 1}", "date": "2024-01-01"}
+    for i in range(1, 301)
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Search index benchmark")
+    parser.add_argument("--drivers", default="1000,100000", help="comma-separated driver counts")
+    parser.add_argument("--repeat", type=int, default=200, help="runs per query")
+    args = parser.parse_args()
+
+    for count in (int(part) for part in args.drivers.split(",") if part):
+        rows = drivers(count)
+
+        gc.collect()
+        start = time.perf_counter()
+        index = SearchIndex()
+        index.sync_drivers(rows)
+        index.sync_events(EVENTS)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.sync_drivers(rows)                    # Nothing changed
+        resync = time.perf_counter() - start
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        sized = SearchIndex()
+        sized.sync_drivers(rows)
+        size = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        del sized
+
+        print(f"\n{count} drivers: build {build * 1000:.0f}ms, unchanged re-sync "
+              f"{resync * 1000:.0f}ms, {size / 1e6:.1f} MB ({size / count:.0f} B/driver)")
+        print(f"  {'query':<16} {'ms/query':>9}  top result")
+        for query in QUERIES:
+            results = index.search(query)
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                index.search(query)
+            per_query = (time.perf_counter() - start) / args.repeat * 1000
+            top = results[0]["name"] if results else "-"
+            print(f"  {query!r:<16} {per_query:>9.3f}  {top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# ==============================================================================
+# BENCHMARK - Season points: vectorized NumPy pass vs a Python loop
+# ==============================================================================
+# Scores a synthetic championship (drivers × rounds, random finishing order
+# per round) with a points table, drop-worst-N and countback ordering:
+#
+#   python  - the straightforward loop: one dict update per result, then a
+#             sort with a countback key
+#   numpy   - app/models/scoring.py: table lookup, partition, bincount and
+#             lexsort over the whole results matrix
+#
+# Both must produce the same totals and order; the script checks that.
+#
+# Run from the backend/ directory:
+#   python -m benchmarks.bench_season_points
+#   python -m benchmarks.bench_season_points --drivers 5000 --rounds 40 --drop 2
+# ==============================================================================
+
+import argparse
+import time
+
+import numpy as np
+
+from app.models.scoring import ScoringRules, build_results_matrix, compute_season
+
+POINTS_TABLE = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
+
+
+def synthetic_results(drivers: int, rounds: int, seed: int = 7) -> list:
+    """(driver_id, event_id, position) - every driver starts every round"""
+    rng = np.random.default_rng(seed)
+    results = []
+    for event_id in range(1, rounds + 1):
+        finishing_order = rng.permutation(drivers) + 1
+        results.extend(
+            (int(driver_id), event_id, position)
+            for position, driver_id in enumerate(finishing_order, start=1)
+        )
+    return results
+
+
+def python_season(driver_ids, results, rules: ScoringRules):
+    """Reference implementation - one Python step per result"""
+    per_round = {driver_id: [] for driver_id in driver_ids}
+    finishes = {driver_id: {} for driver_id in driver_ids}
+    for driver_id, _, position in results:
+        points = rules.points_table[position - 1] if position <= len(rules.points_table) else 0
+        per_round[driver_id].append(points)
+        finishes[driver_id][position] = finishes[driver_id].get(position, 0) + 1
+    totals = {
+        driver_id: sum(sorted(points)[rules.drop_worst:])
+        for driver_id, points in per_round.items()
+    }
+    deepest = max((p for _, _, p in results), default=0)
+    order = sorted(
+        driver_ids,
+        key=lambda d: (-totals[d], *(-finishes[d].get(k, 0) for k in range(1, deepest + 1))),
+    )
+    return totals, order
+
+
+def timed(fn, repeat: int):
+    fn()                                            # Warm up
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Season points benchmark")
+    parser.add_argument("--drivers", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--drop", type=int, default=2, help="worst rounds dropped")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    driver_ids = list(range(1, args.drivers + 1))
+    results = synthetic_results(args.drivers, args.rounds)
+    rules = ScoringRules(POINTS_TABLE, args.drop)
+
+    def vectorized():
+        matrix = build_results_matrix(driver_ids, results)
+        return compute_season(matrix, rules)
+
+    py_time, (py_totals, py_order) = timed(lambda: python_season(driver_ids, results, rules), args.repeat)
+    np_time, season = timed(vectorized, args.repeat)
+
+    assert [py_totals[d] for d in driver_ids] == season.totals.tolist(), "totals differ"
+    assert py_order == [driver_ids[i] for i in season.order], "order differs"
+
+    print(f"{args.drivers} drivers × {args.rounds} rounds ({len(results)} results), "
+          f"drop worst {args.drop}")
+    print(f"  python loop  {py_time * 1000:8.2f} ms")
+    print(f"  numpy        {np_time * 1000:8.2f} ms   ({py_time / np_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# ==============================================================================
+# BENCHMARK - Memory held by the standings table between requests
+# ==============================================================================
+# Compares what stays in memory for a season of N drivers:
+#
+#   rows     - the previous representation: a list with one dict per driver
+#              ({"position", "driver_id", "driver", "points", "wins"}),
+#              cached between requests
+#   columnar - the StandingsEngine: typed arrays per field, names packed in
+#              a NameTable and the cached (order, positions) ranking arrays
+#
+# Each build starts from freshly generated rows (like a load from the
+# database), so both pay for their own copy of the names. Sizes are
+# measured with tracemalloc, so they are what Python actually allocated,
+# not an estimate.
+#
+# Run from the backend/ directory:
+#   python -m benchmarks.bench_standings_memory
+#   python -m benchmarks.bench_standings_memory --drivers 10000,100000,1000000
+# ==============================================================================
+
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, List
+
+from app.models.standings import StandingsEngine
+
+
+def driver_rows(count: int) -> List[tuple]:
+    """(driver_id, name, points, wins, seconds, tiebreak) rows with realistic ties"""
+    return [
+        (i, f"Driver {i}", (i * 7919) % 2000, i % 4, i % 7, 0)
+        for i in range(1, count + 1)
+    ]
+
+
+def build_row_dicts(count: int) -> list:
+    ordered = sorted(driver_rows(count), key=lambda r: (-r[2], -r[3], -r[4], r[1]))
+    table, position, previous = [], 0, None
+    for index, (driver_id, name, points, wins, *_) in enumerate(ordered, start=1):
+        if points != previous:
+            position, previous = index, points
+        table.append({
+            "position": position, "driver_id": driver_id,
+            "driver": name, "points": points, "wins": wins,
+        })
+    return table
+
+
+def build_columnar(count: int) -> StandingsEngine:
+    engine = StandingsEngine()
+    engine.load(driver_rows(count))
+    engine.ranking()                                # Cache the sort, like a warm server
+    return engine
+
+
+def retained_bytes(build: Callable[[], object]) -> int:
+    """Bytes still allocated after `build()` returns (its result kept alive)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Standings memory benchmark")
+    parser.add_argument("--drivers", default="10000,100000",
+                        help="comma-separated driver counts")
+    args = parser.parse_args()
+
+    print(f"{'drivers':>10}  {'rows (MB)':>10}  {'columnar (MB)':>14}  "
+          f"{'B/driver':>17}  {'saving':>7}")
+    for count in (int(part) for part in args.drivers.split(",") if part):
+        as_dicts = retained_bytes(lambda: build_row_dicts(count))
+        as_columns = retained_bytes(lambda: build_columnar(count))
+        print(
+            f"{count:>10}  {as_dicts / 1e6:>10.2f}  {as_columns / 1e6:>14.2f}  "
+            f"{as_dicts / count:>7.0f} → {as_columns / count:>6.0f}  "
+            f"{as_dicts / as_columns:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
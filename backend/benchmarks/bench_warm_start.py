@@ -0,0 +1,124 @@
+# ==============================================================================
+# BENCHMARK - Cold load vs warm start from the saved snapshot
+# ==============================================================================
+# Builds a SQLite archive (events × entrants per event), then times:
+#
+#   cold load     load_from_database(): read every result, compute standings,
+#                 partitions, driver history and the search index
+#   save          save_snapshot(): encode + fsync the snapshot file
+#   warm start    warm_start(): mmap + CRC check + decode, nothing recomputed
+#   warm + replay warm_start() after --replay uploads landed since the save
+#
+# and checks that the warm and cold standings are identical.
+#
+# Run from the backend/ directory:
+#   python -m benchmarks.bench_warm_start
+#   python -m benchmarks.bench_warm_start --events 500 --field 400 --drivers 20000
+# ==============================================================================
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from app.core.database import Database
+from app.models.repository import (
+    BUMP_DATA_VERSION, LOG_RESULT_CHANGE, init_schema, load_from_database,
+    save_snapshot, warm_start,
+)
+from app.models.standings import get_standings_engine, get_standings_partitions
+
+
+async def build_archive(db: Database, events: int, drivers: int, field: int) -> None:
+    rng = random.Random(events)
+    await init_schema(db)
+    async with db.connection() as conn:
+        async with conn.transaction():
+            await conn.execute_many(
+                "INSERT INTO events (id, name, date) VALUES (?, ?, ?)",
+                [(i, f"Rallycross #{i}", f"{2000 + i // 300}-{i % 12 + 1:02d}-{i % 25 + 1:02d}")
+                 for i in range(1, events + 1)],
+            )
+            await conn.execute_many(
+                "INSERT INTO drivers (id, name) VALUES (?, ?)",
+                [(i, f"Driver {i}") for i in range(1, drivers + 1)],
+            )
+            for event_id in range(1, events + 1):
+                entrants = rng.sample(range(1, drivers + 1), field)
+                await conn.execute_many(
+                    "INSERT INTO results (event_id, driver_id, class, position, points) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(event_id, driver_id, "Stock" if position % 2 else "Super", position,
+                      max(0, 30 - position)) for position, driver_id in enumerate(entrants, 1)],
+                )
+
+
+async def reupload(db: Database, event_id: int, drivers: int, field: int) -> None:
+    """What an upload does to the database: replace one event's results"""
+    entrants = random.Random(-event_id).sample(range(1, drivers + 1), field)
+    async with db.connection() as conn:
+        async with conn.transaction():
+            await conn.execute("DELETE FROM results WHERE event_id = ?", (event_id,))
+            await conn.execute_many(
+                "INSERT INTO results (event_id, driver_id, class, position, points) "
+                "VALUES (?, ?, 'Stock', ?, ?)",
+                [(event_id, d, p, max(0, 30 - p)) for p, d in enumerate(entrants, 1)],
+            )
+            await conn.execute(BUMP_DATA_VERSION)
+            await conn.execute(LOG_RESULT_CHANGE, (event_id,))
+
+
+def tables() -> tuple:
+    partitions = sorted(
+        ((key, engine.ranked()) for key, engine in get_standings_partitions().items()),
+        key=lambda item: str(item[0]),
+    )
+    return get_standings_engine().ranked(), partitions
+
+
+async def timed(coro) -> tuple:
+    start = time.perf_counter()
+    result = await coro
+    return (time.perf_counter() - start) * 1000, result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Warm start benchmark")
+    parser.add_argument("--events", type=int, default=300)
+    parser.add_argument("--drivers", type=int, default=10_000)
+    parser.add_argument("--field", type=int, default=300, help="results per event")
+    parser.add_argument("--replay", type=int, default=5, help="uploads made after the save")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db = Database(f"sqlite:///{os.path.join(directory, 'archive.db')}")
+        snapshot = os.path.join(directory, "archive.snapshot")
+        await db.connect()
+        await build_archive(db, args.events, args.drivers, args.field)
+        print(f"{args.events} events × {args.field} results, {args.drivers} drivers")
+
+        cold_ms, _ = await timed(load_from_database(db))
+        cold = tables()
+        save_ms, _ = await timed(save_snapshot(db, snapshot))
+        size = os.path.getsize(snapshot)
+        warm_ms, version = await timed(warm_start(db, snapshot))
+        assert version is not None and tables() == cold, "warm start differs from cold load"
+
+        for event_id in range(1, min(args.replay, args.events) + 1):
+            await reupload(db, event_id, args.drivers, args.field)
+        replay_ms, version = await timed(warm_start(db, snapshot))
+        replayed = tables()
+        await load_from_database(db)
+        assert version is not None and replayed == tables(), "replay differs from cold load"
+        await db.disconnect()
+
+    print(f"  cold load          {cold_ms:>9.1f} ms")
+    print(f"  save snapshot      {save_ms:>9.1f} ms  ({size / 1e6:.1f} MB)")
+    print(f"  warm start         {warm_ms:>9.1f} ms")
+    print(f"  warm + {args.replay} replays   {replay_ms:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,303 @@
+# ==============================================================================
+# BENCHMARK - API load test: cold start, throughput and tail latency
+# ==============================================================================
+# Measures requests/sec and p50/p99/p999 latency for the main endpoints at
+# several concurrency levels and dataset sizes, in two modes:
+#
+#   inprocess - requests go straight into the ASGI app (no network); shows
+#               the cost of our own code: routing, middleware, handlers
+#   socket    - a real uvicorn server on 127.0.0.1; adds HTTP parsing and
+#               the TCP loopback, closer to production
+#
+# Plus a cold-start check: a fresh Python process importing the app, running
+# the lifespan and answering its first request.
+#
+# Results are written to a JSON file. Pass --baseline to compare against an
+# earlier run; the exit code is 1 if anything regressed beyond --tolerance.
+#
+# Needs httpx (pip install httpx). Run from the backend/ directory:
+#   python -m benchmarks.load_test --output bench.json
+#   python -m benchmarks.load_test --sizes 10,1000 --concurrency 1,32 --duration 1
+#   python -m benchmarks.load_test --baseline bench.json --output new.json
+# ==============================================================================
+
+import os
+
+# Benchmarks never touch a real database file
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+# All load comes from one client address - don't rate-limit ourselves
+os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "0")
+
+import argparse
+import asyncio
+import json
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+
+import httpx
+
+from app.main import app
+from app.models.events import publish_events
+from app.models.standings import get_standings_engine
+
+
+# ==============================================================================
+# DATASETS - Synthetic events and drivers of a given size
+# ==============================================================================
+
+def populate(size: int) -> Dict[str, str]:
+    """Load `size` events and `size` drivers; return sample path values"""
+    start = date(2000, 1, 1)
+    publish_events(
+        {
+            "id": i,
+            "name": f"Rallycross #{i}, points event #{i % 8 + 1}",
+            "date": (start + timedelta(days=i)).isoformat(),
+        }
+        for i in range(1, size + 1)
+    )
+    get_standings_engine().load(
+        (i, f"Driver {i}", (i * 7919) % 1000, i % 3, i % 5, 0) for i in range(1, size + 1)
+    )
+    middle = size // 2 + 1
+    grid = range(max(1, middle - 50), min(size, middle + 49) + 1)   # Up to 100 drivers
+    return {
+        "driver_id": str(middle),
+        "driver_ids": ",".join(map(str, grid)),
+        "event_date": (start + timedelta(days=middle)).isoformat(),
+    }
+
+
+def endpoints(sample: Dict[str, str]) -> Dict[str, str]:
+    return {
+        "/": "/",
+        "/health": "/health",
+        "/standings/": "/api/v1/standings/",
+        "/standings/{driver_id}": f"/api/v1/standings/{sample['driver_id']}",
+        "/standings/batch": f"/api/v1/standings/batch?ids={sample['driver_ids']}",
+        "/events/": "/api/v1/events/",
+        "/events/{event_date}": f"/api/v1/events/{sample['event_date']}",
+    }
+
+
+# ==============================================================================
+# LOAD GENERATOR
+# ==============================================================================
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_load(client: httpx.AsyncClient, path: str, concurrency: int, duration: float) -> dict:
+    """`concurrency` tasks hammer `path` for `duration` seconds"""
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - t0)
+            if response.status_code >= 400:
+                errors += 1
+
+    await client.get(path)                          # Warm caches first
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "p999_ms": percentile(latencies, 0.999) * 1000,
+    }
+
+
+async def bench_matrix(client, mode, sizes, concurrencies, duration, results) -> None:
+    for size in sizes:
+        sample = populate(size)
+        for name, path in endpoints(sample).items():
+            for concurrency in concurrencies:
+                row = await run_load(client, path, concurrency, duration)
+                row.update(mode=mode, dataset=size, endpoint=name, concurrency=concurrency)
+                results.append(row)
+                print(
+                    f"{mode:<10}{size:>8}  {name:<24}c={concurrency:<4}"
+                    f"{row['rps']:>9.0f} rps  p50 {row['p50_ms']:7.2f}ms  "
+                    f"p99 {row['p99_ms']:7.2f}ms  p999 {row['p999_ms']:7.2f}ms"
+                    + (f"  errors={row['errors']}" if row["errors"] else "")
+                )
+
+
+# ==============================================================================
+# MODES
+# ==============================================================================
+
+async def bench_inprocess(sizes, concurrencies, duration, results) -> None:
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await bench_matrix(client, "inprocess", sizes, concurrencies, duration, results)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def bench_socket(sizes, concurrencies, duration, results) -> None:
+    import uvicorn
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        await asyncio.sleep(0.05)
+    try:
+        limits = httpx.Limits(max_connections=max(concurrencies))
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits) as client:
+            await bench_matrix(client, "socket", sizes, concurrencies, duration, results)
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+COLD_START_SCRIPT = """
+import json, time
+t0 = time.perf_counter()
+from app.main import app
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    t2 = time.perf_counter()
+    client.get("/health")
+    t3 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "startup_ms": (t2 - t1) * 1000,
+                  "first_request_ms": (t3 - t2) * 1000, "total_ms": (t3 - t0) * 1000}))
+"""
+
+
+def bench_cold_start(runs: int) -> dict:
+    """Median of `runs` fresh interpreters importing and serving once"""
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", COLD_START_SCRIPT],
+            cwd=backend_dir, capture_output=True, text=True, check=True,
+        )
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    result = {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+    print(
+        f"cold start (median of {runs}): import {result['import_ms']:.0f}ms, "
+        f"startup {result['startup_ms']:.0f}ms, first request {result['first_request_ms']:.1f}ms"
+    )
+    return result
+
+
+# ==============================================================================
+# BASELINE COMPARISON
+# ==============================================================================
+
+def compare(baseline: dict, current: dict, tolerance: float) -> bool:
+    """Print regressions; True if everything is within tolerance"""
+    def key(row):
+        return (row["mode"], row["dataset"], row["endpoint"], row["concurrency"])
+
+    old = {key(r): r for r in baseline.get("results", [])}
+    ok = True
+    for row in current["results"]:
+        before = old.get(key(row))
+        if before is None:
+            continue
+        rps_change = row["rps"] / before["rps"] - 1 if before["rps"] else 0.0
+        p99_change = row["p99_ms"] / before["p99_ms"] - 1 if before["p99_ms"] else 0.0
+        if rps_change < -tolerance or p99_change > tolerance:
+            ok = False
+            print(
+                f"REGRESSION {key(row)}: rps {before['rps']:.0f} → {row['rps']:.0f} "
+                f"({rps_change:+.0%}), p99 {before['p99_ms']:.2f} → {row['p99_ms']:.2f}ms "
+                f"({p99_change:+.0%})"
+            )
+
+    cold_old, cold_new = baseline.get("cold_start"), current.get("cold_start")
+    if cold_old and cold_new and cold_new["total_ms"] > cold_old["total_ms"] * (1 + tolerance):
+        ok = False
+        print(f"REGRESSION cold start: {cold_old['total_ms']:.0f} → {cold_new['total_ms']:.0f}ms")
+    print("No regressions." if ok else "Regressions found.")
+    return ok
+
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+
+def _int_list(text: str) -> List[int]:
+    return [int(part) for part in text.split(",") if part]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Race Standings API load test")
+    parser.add_argument("--modes", default="inprocess,socket", help="inprocess,socket")
+    parser.add_argument("--sizes", type=_int_list, default=[10, 1000, 100_000],
+                        help="dataset sizes (events and drivers)")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 16, 64],
+                        help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds per measurement")
+    parser.add_argument("--cold-start-runs", type=int, default=3, help="0 to skip")
+    parser.add_argument("--output", default="bench_results.json", help="where to write results")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="allowed fractional slowdown before failing")
+    args = parser.parse_args()
+
+    results: List[dict] = []
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    if "inprocess" in modes:
+        asyncio.run(bench_inprocess(args.sizes, args.concurrency, args.duration, results))
+    if "socket" in modes:
+        asyncio.run(bench_socket(args.sizes, args.concurrency, args.duration, results))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "duration": args.duration,
+        },
+        "results": results,
+    }
+    if args.cold_start_runs:
+        report["cold_start"] = bench_cold_start(args.cold_start_runs)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if not compare(baseline, report, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# ==============================================================================
+# BENCHMARK - Startup time: import profile and time to first request
+# ==============================================================================
+# Every container start (and every --reload) pays for importing app.main and
+# running the lifespan before the first request can be answered. This script
+# shows where that time goes:
+#
+#   import profile      - `python -X importtime -c "import app.main"` in a
+#                         fresh interpreter, summed per top-level package,
+#                         plus the slowest single modules and our own app.*
+#                         modules
+#   app import          - importing app.main AFTER the framework (fastapi,
+#                         pydantic-settings) is already loaded: the part of
+#                         the import that is our own code
+#   time to first req   - wall time from launching `uvicorn app.main:app` to
+#                         its first 200 from /health, i.e. what an autoscaler
+#                         waits for
+#
+# Timings are medians of --runs fresh processes. With --budget-ms and/or
+# --app-budget-ms the exit code is 1 when a median goes over budget. CI runs
+# the second command below before building images
+# (.github/workflows/deploy.yml, job startup-budget).
+#
+# Run from the backend/ directory:
+#   python -m benchmarks.startup_profile
+#   python -m benchmarks.startup_profile --runs 7 --budget-ms 3000 --app-budget-ms 150
+# ==============================================================================
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _env(database_dir: str) -> Dict[str, str]:
+    """Environment for child processes: a throwaway database file"""
+    env = dict(os.environ)
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(database_dir, 'startup.db')}"
+    env["PYTHONPATH"] = BACKEND_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+# ==============================================================================
+# IMPORT PROFILE - Parse `python -X importtime` output
+# ==============================================================================
+
+class ImportRow(NamedTuple):
+    module: str
+    self_us: int                                   # Time in this module alone
+    cumulative_us: int                             # Including what it imported
+
+
+def importtime_rows(env: Dict[str, str]) -> List[ImportRow]:
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        # "import time:       self |  cumulative | <indent>package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append(ImportRow(module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def print_import_profile(rows: List[ImportRow], top: int) -> None:
+    total = next(row.cumulative_us for row in rows if row.module == "app.main")
+    print(f"import app.main: {total / 1000:.0f}ms total\n")
+
+    per_package: Dict[str, int] = defaultdict(int)
+    for row in rows:
+        per_package[row.module.split(".")[0]] += row.self_us
+    print("by top-level package (self time):")
+    for package, self_us in sorted(per_package.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"  {self_us / 1000:>8.1f}ms  {self_us / total:>5.1%}  {package}")
+
+    print("\nslowest modules (self time):")
+    for row in sorted(rows, key=lambda r: -r.self_us)[:top]:
+        print(f"  {row.self_us / 1000:>8.1f}ms  {row.module}")
+
+    print("\napp modules (cumulative, includes what each one imports first):")
+    for row in rows:
+        if row.module == "app" or row.module.startswith("app."):
+            print(f"  {row.cumulative_us / 1000:>8.1f}ms  {row.module}")
+
+
+# ==============================================================================
+# TIMINGS - Fresh processes, median of several runs
+# ==============================================================================
+
+APP_IMPORT_SCRIPT = """
+import json, time
+import fastapi, fastapi.middleware.cors, fastapi.responses, pydantic_settings
+t0 = time.perf_counter()
+import app.main
+print(json.dumps({"app_import_ms": (time.perf_counter() - t0) * 1000}))
+"""
+
+
+def app_import_ms(env: Dict[str, str]) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", APP_IMPORT_SCRIPT],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])["app_import_ms"]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_request_ms(env: Dict[str, str], timeout: float = 60.0) -> float:
+    """Launch uvicorn and poll /health until it answers"""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited:\n{server.stderr.read().decode()}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except OSError:
+                time.sleep(0.005)                   # Not listening yet
+        raise RuntimeError(f"no response from {url} within {timeout:.0f}s")
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Race Standings API startup profile")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per timing")
+    parser.add_argument("--top", type=int, default=10, help="rows in each import table")
+    parser.add_argument("--budget-ms", type=float,
+                        help="fail if median time to first request is above this")
+    parser.add_argument("--app-budget-ms", type=float,
+                        help="fail if median app-only import time is above this")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as database_dir:
+        env = _env(database_dir)
+        print_import_profile(importtime_rows(env), args.top)
+
+        app_ms = statistics.median(app_import_ms(env) for _ in range(args.runs))
+        first_ms = statistics.median(time_to_first_request_ms(env) for _ in range(args.runs))
+
+    print(f"\nmedian of {args.runs} runs:")
+    print(f"  app import (framework preloaded): {app_ms:>7.1f}ms")
+    print(f"  time to first request (uvicorn):  {first_ms:>7.1f}ms")
+
+    over = []
+    if args.app_budget_ms is not None and app_ms > args.app_budget_ms:
+        over.append(f"app import {app_ms:.0f}ms > budget {args.app_budget_ms:.0f}ms")
+    if args.budget_ms is not None and first_ms > args.budget_ms:
+        over.append(f"time to first request {first_ms:.0f}ms > budget {args.budget_ms:.0f}ms")
+    for message in over:
+        print(f"OVER BUDGET: {message}")
+    if over:
+        sys.exit(1)
+    if args.budget_ms is not None or args.app_budget_ms is not None:
+        print("Within budget.")
+
+
+if __name__ == "__main__":
+    main()